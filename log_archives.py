@@ -0,0 +1,169 @@
+import io
+import os
+import re
+import bz2
+import gzip
+import lzma
+import threading
+from contextlib import contextmanager
+
+
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Αναγνώριση συμπίεσης από τα πρώτα bytes (όχι από το όνομα, π.χ. για uploads χωρίς κατάληξη)
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd"
+}
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+
+# Τα virtual logs ανά thread: κάθε parse τρέχει ολόκληρο σε ένα thread (worker του JobQueue ή CLI), οπότε
+# ένα job δεν βλέπει τα virtual logs άλλων sessions και δεν μένει τίποτα μετά το τέλος του
+_virtual = threading.local()
+
+
+def _virtual_logs():
+    if not hasattr(_virtual, "logs"):
+        _virtual.logs = {}
+    return _virtual.logs
+
+
+def detect_compression(fileobj):
+    """Ο τύπος συμπίεσης ("gzip", "bz2", "xz", "zstd") ή None για απλό κείμενο"""
+    position = fileobj.tell()
+    head = fileobj.read(6)
+    fileobj.seek(position)
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_decompressed(fileobj, compression):
+    """Binary stream που αποσυμπιέζει το fileobj κατά την ανάγνωση"""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+    if compression == "bz2":
+        return bz2.BZ2File(fileobj, mode="rb")
+    if compression == "xz":
+        return lzma.LZMAFile(fileobj, mode="rb")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("Για αρχεία .zst χρειάζεται το πακέτο zstandard (pip install zstandard)")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False))
+    return fileobj
+
+
+def strip_compression_suffix(name):
+    root, suffix = os.path.splitext(name)
+    return root if suffix.lower() in COMPRESSION_SUFFIXES else name
+
+
+def rotation_key(name):
+    """Κλειδί ταξινόμησης από το παλαιότερο στο νεότερο για ονόματα του logrotate
+
+    syslog.3.gz < syslog.2.gz < syslog.1 < syslog, και syslog-20240101.gz < syslog-20240102.gz < syslog.
+    """
+    base = strip_compression_suffix(os.path.basename(name))
+    dated = re.search(r"[-_.](\d{8})$", base)
+    if dated:
+        return (0, int(dated.group(1)), base)
+    numbered = re.search(r"\.(\d+)$", base)
+    if numbered:
+        return (1, -int(numbered.group(1)), base)
+    return (2, 0, base)
+
+
+def order_segments(files):
+    """Τα αρχεία (uploads ή διαδρομές) με χρονολογική σειρά βάσει του ονόματος rotation"""
+    return sorted(files, key=lambda f: rotation_key(getattr(f, "name", f)))
+
+
+def merged_log_name(files):
+    """Το όνομα του ενιαίου log (π.χ. syslog για syslog.2.gz, syslog.1 και syslog)"""
+    newest = order_segments(files)[-1]
+    base = strip_compression_suffix(os.path.basename(getattr(newest, "name", newest)))
+    return re.sub(r"([-_.]\d{8}|\.\d+)$", "", base) or base
+
+
+@contextmanager
+def virtual_log(path, segments):
+    """Context manager: το path διαβάζεται μέσω του open_log ως τα segments (συμπιεσμένα ή όχι) στη σειρά
+
+    Έτσι δεν γράφεται ποτέ αποσυμπιεσμένο αντίγραφο στο δίσκο για όσους διαβάζουν μέσω open_log.
+    Το virtual log υπάρχει μόνο για το thread που το δημιούργησε και μόνο μέσα στο with.
+    """
+    path = os.path.abspath(path)
+    logs = _virtual_logs()
+    previous = logs.get(path)
+    logs[path] = list(segments)
+    try:
+        yield path
+    finally:
+        if previous is None:
+            logs.pop(path, None)
+        else:
+            logs[path] = previous
+
+
+def is_virtual_log(path):
+    return os.path.abspath(path) in _virtual_logs()
+
+
+def open_log(path, buffer_size=READ_BUFFER_SIZE):
+    """Άνοιγμα log για ανάγνωση γραμμών: απλό αρχείο ή virtual log από segments"""
+    segments = _virtual_logs().get(os.path.abspath(path))
+    if segments is None:
+        return open(path, "r", buffering=buffer_size)
+    return SegmentReader(segments, buffer_size)
+
+
+class SegmentReader:
+    """Οι γραμμές πολλών αρχείων (με αποσυμπίεση όπου χρειάζεται) ως ένα text stream"""
+
+    def __init__(self, segments, buffer_size=READ_BUFFER_SIZE):
+        self.segments = list(segments)
+        self.buffer_size = buffer_size
+        self._current = None
+
+    def __iter__(self):
+        for segment in self.segments:
+            raw = open(segment, "rb", buffering=self.buffer_size)
+            compression = detect_compression(raw)
+            # Ίδιο encoding και newlines με το open(path, "r") των parsers
+            text = io.TextIOWrapper(open_decompressed(raw, compression) if compression else raw)
+            self._current = (text, raw)
+            try:
+                for line in text:
+                    # Η τελευταία γραμμή ενός segment χωρίς newline δεν ενώνεται με την πρώτη του επόμενου
+                    yield line if line.endswith("\n") else line + "\n"
+            finally:
+                self.close()
+
+    def close(self):
+        if self._current is not None:
+            for stream in self._current:
+                stream.close()  # Τα GzipFile/BZ2File/LZMAFile δεν κλείνουν το αρχείο που τους δόθηκε
+            self._current = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def materialize_log(path, buffer_size=READ_BUFFER_SIZE):
+    """Γράφει το virtual log ως κανονικό αρχείο στο path (για όσους χρειάζονται πραγματικό αρχείο, π.χ. shards)"""
+    if not is_virtual_log(path):
+        return False
+    with open_log(path, buffer_size) as src, open(path + ".partial", "w", buffering=buffer_size) as dst:
+        for line in src:
+            dst.write(line)
+    os.replace(path + ".partial", path)
+    _virtual_logs().pop(os.path.abspath(path), None)
+    return True
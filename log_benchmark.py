@@ -0,0 +1,468 @@
+"""Benchmark των parsers πάνω σε συνθετικά logs για κάθε τύπο log
+
+Παράδειγμα:
+    python log_benchmark.py --log-types Linux Suricata --parsers Drain Spell --lines 10000 100000 --output bench.json
+    python log_benchmark.py --baseline bench.json --max-regression 0.2
+    python log_benchmark.py --dashboard --lines 200000 --output dashboard_bench.json   (backends του dashboard)
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing as mp
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from log_types import LOG_MODULES, log_module
+
+
+LOG_TYPES = list(LOG_MODULES)
+PARSERS = ["Drain", "Spell", "LogCluster", "IPLoM", "MoLFI"]
+DEFAULT_LINES = [10000]
+DEFAULT_TEMPLATES = 50
+DEFAULT_SEED = 42
+DEFAULT_TIMEOUT = 1800  # Δευτερόλεπτα ανά περίπτωση
+DEFAULT_MAX_REGRESSION = 0.2  # Μέγιστη αποδεκτή πτώση lines/sec σε σχέση με το baseline
+DASHBOARD_BACKENDS = ["pandas", "polars"]
+DASHBOARD_REPEATS = 3  # Επαναλήψεις κάθε κατάστασης φίλτρων (κρατιέται ο καλύτερος χρόνος)
+
+# Λεξιλόγιο για τα συνθετικά templates
+WORDS = [
+    "session", "opened", "closed", "for", "user", "connection", "from", "failed", "password", "accepted",
+    "request", "response", "timeout", "retry", "loading", "package", "update", "service", "started", "stopped",
+    "kernel", "device", "interface", "link", "state", "changed", "error", "warning", "client", "server",
+    "cache", "flush", "queue", "worker", "thread", "memory", "disk", "read", "write", "sync"
+]
+COMPONENTS = {
+    "Windows": ["CBS", "CSI", "DPX", "SQM", "WER"],
+    "Linux": ["sshd(pam_unix)", "su(pam_unix)", "ftpd", "kernel", "CRON", "syslogd", "xinetd"],
+    "Mac": ["kernel", "com.apple.cts", "mDNSResponder", "WindowServer", "sharingd", "configd"],
+}
+LEVELS = ["Info", "Warning", "Error"]
+SURICATA_EVENTS = [
+    ("POLICY", "Potential Corporate Privacy Violation", 1),
+    ("SCAN", "Attempted Information Leak", 2),
+    ("MALWARE", "A Network Trojan was detected", 1),
+    ("INFO", "Misc activity", 3),
+    ("DNS", "Potentially Bad Traffic", 2)
+]
+
+
+def make_templates(rng, n_templates):
+    """Συνθετικά templates: λέξεις του WORDS με θέσεις μεταβλητών ({num}, {ip}, {hex}, {path}, {user})"""
+    slots = ["{num}", "{ip}", "{hex}", "{path}", "{user}"]
+    templates = set()
+    while len(templates) < n_templates:
+        tokens = rng.sample(WORDS, rng.randint(3, 8))
+        for _ in range(rng.randint(0, 3)):
+            tokens.insert(rng.randint(0, len(tokens)), rng.choice(slots))
+        templates.add(" ".join(tokens))
+    return sorted(templates)
+
+
+def fill_template(rng, template):
+    return template.format(
+        num=rng.randint(0, 99999),
+        ip=f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+        hex=f"0x{rng.getrandbits(32):08x}",
+        path=f"/var/lib/{rng.choice(WORDS)}/{rng.choice(WORDS)}.dat",
+        user=f"user{rng.randint(1, 500)}"
+    )
+
+
+def generate_lines(log_type, n_lines, n_templates=DEFAULT_TEMPLATES, seed=DEFAULT_SEED):
+    """Γραμμές log σύμφωνες με το LOG_FORMAT του τύπου, με χρονολογική σειρά και σταθερό seed
+
+    Τα templates ακολουθούν κατανομή τύπου Zipf (λίγα πολύ συχνά, πολλά σπάνια). Τα syslog logs
+    ξεκινούν στις 31 Δεκεμβρίου ώστε να περνάνε την αλλαγή έτους.
+    """
+    rng = random.Random(seed)
+    templates = make_templates(rng, n_templates)
+    weights = [1.0 / (rank + 1) for rank in range(len(templates))]
+    timestamp = datetime(2023, 12, 31, 22, 0, 0)
+
+    lines = []
+    for _ in range(n_lines):
+        timestamp += timedelta(microseconds=rng.randint(0, 2000000))
+        content = fill_template(rng, rng.choices(templates, weights)[0])
+        if log_type == "Windows":
+            level = rng.choice(LEVELS)
+            component = rng.choice(COMPONENTS["Windows"])
+            lines.append(f"{timestamp:%Y-%m-%d %H:%M:%S}, {level:<22}{component:<7}{content}")
+        elif log_type == "Linux":
+            component = rng.choice(COMPONENTS["Linux"])
+            lines.append(f"{timestamp:%b} {timestamp.day:>2} {timestamp:%H:%M:%S} combo {component}[{rng.randint(1, 30000)}]: {content}")
+        elif log_type == "Mac":
+            component = rng.choice(COMPONENTS["Mac"])
+            address = f" (com.apple.{rng.choice(WORDS)})" if rng.random() < 0.2 else ""
+            lines.append(
+                f"{timestamp:%b} {timestamp.day:>2} {timestamp:%H:%M:%S} calvisitor-10-105-160-95 "
+                f"{component}[{rng.randint(0, 2000)}]{address}: {content}"
+            )
+        else:
+            event_type, classification, priority = rng.choice(SURICATA_EVENTS)
+            lines.append(
+                f"{timestamp:%m/%d/%Y-%H:%M:%S.%f}  [**] [1:{2000000 + rng.randint(0, 999)}:{rng.randint(1, 9)}] "
+                f"ET {event_type} {content} [**] [Classification: {classification}] [Priority: {priority}] "
+                f"{{{rng.choice(['TCP', 'UDP'])}}} 10.0.{rng.randint(0, 9)}.{rng.randint(1, 30)}:{rng.randint(1024, 65535)} "
+                f"-> 192.168.1.{rng.randint(1, 20)}:{rng.choice([22, 53, 80, 443, 1433, 3389])}"
+            )
+    return lines
+
+
+def write_log(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+        f.write("\n")
+
+
+def _peak_rss_mb():
+    """Μέγιστη μνήμη (RSS) της τρέχουσας διεργασίας σε MB"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def parse_synthetic(log_type, parser_choice, n_lines, n_templates, seed, stages):
+    """Parse ενός συνθετικού log: (df_structured, df_templates), με τους χρόνους generate και parse στο stages"""
+    from log_utils import PARSER_DEFAULTS, make_parser_args, parse_log_file
+
+    module = log_module(log_type)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as indir, tempfile.TemporaryDirectory() as outdir:
+        os.chdir(outdir)  # Ο LogCluster γράφει βοηθητικά αρχεία στο cwd
+        try:
+            log_name = f"{log_type.lower()}_bench.log"
+
+            started = time.perf_counter()
+            write_log(os.path.join(indir, log_name), generate_lines(log_type, n_lines, n_templates, seed))
+            stages["generate"] = time.perf_counter() - started
+
+            params = PARSER_DEFAULTS[parser_choice][log_type]
+            parser_args = make_parser_args(module.LOG_FORMAT, module.LOG_REGEX, indir, outdir, **params)
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):  # Οι parsers τυπώνουν πρόοδο ανά γραμμή
+                df_structured, df_templates, _ = parse_log_file(parser_choice, parser_args, log_name)
+            stages["parse"] = time.perf_counter() - started
+        finally:
+            os.chdir(cwd)
+    return df_structured, df_templates
+
+
+def run_case(log_type, parser_choice, n_lines, n_templates, seed):
+    """Μία περίπτωση benchmark (τρέχει σε ξεχωριστή διεργασία): χρόνος ανά στάδιο, lines/sec και μέγιστη μνήμη"""
+    from log_schema import apply_schema
+    from log_timestamps import normalize_timestamps
+    from log_rollups import ROLLUP_DIMENSIONS, TimeRollups
+    from log_filters import FilterIndex
+
+    stages = {}
+    df_structured, df_templates = parse_synthetic(log_type, parser_choice, n_lines, n_templates, seed, stages)
+
+    started = time.perf_counter()
+    df_structured = apply_schema(df_structured, log_type)
+    stages["schema"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    df_structured = normalize_timestamps(df_structured, log_type)
+    stages["timestamps"] = time.perf_counter() - started
+
+    dimensions = [c for c in ROLLUP_DIMENSIONS[log_type] if c in df_structured.columns]
+    if "datetime" in df_structured.columns:
+        started = time.perf_counter()
+        TimeRollups(df_structured, df_structured["datetime"], dimensions)
+        stages["rollups"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        FilterIndex(df_structured, dimensions, df_structured["datetime"])
+        stages["filter_index"] = time.perf_counter() - started
+
+    return {
+        "stages": {stage: round(seconds, 4) for stage, seconds in stages.items()},
+        "lines_per_sec": round(n_lines / stages["parse"], 1) if stages["parse"] > 0 else None,
+        "parsed_rows": len(df_structured),
+        "templates_found": len(df_templates),
+        "peak_rss_mb": _peak_rss_mb()
+    }
+
+
+def _case_worker(connection, args):
+    try:
+        connection.send({"status": "ok", **run_case(*args)})
+    except Exception as e:
+        connection.send({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        connection.close()
+
+
+def run_isolated(log_type, parser_choice, n_lines, n_templates, seed, timeout=DEFAULT_TIMEOUT):
+    """Τρέχει το run_case σε καινούργια διεργασία ώστε η μέγιστη μνήμη να αφορά μόνο αυτή την περίπτωση"""
+    context = mp.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_case_worker, args=(sender, (log_type, parser_choice, n_lines, n_templates, seed)))
+    process.start()
+    sender.close()
+
+    result = {"status": "timeout"}
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            result = {"status": "error", "error": f"Η διεργασία τερμάτισε με κωδικό {process.exitcode}"}
+    process.join(5)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    return result
+
+
+def dashboard_states(df, spec):
+    """Καταστάσεις φίλτρων για το benchmark του dashboard: όλα, μία τιμή στο πρώτο φίλτρο, μόνο η πρώτη ημέρα"""
+    from log_dashboard import filter_options
+    columns = [column for column, _ in spec["filters"]]
+    options, min_date, max_date = filter_options(df, columns)
+    everything = {column: options[column] for column in columns}
+    first = columns[0]
+    return [
+        ("ALL", everything, (min_date, max_date)),
+        (f"{first}={options[first][0]}", dict(everything, **{first: options[first][:1]}), (min_date, max_date)),
+        ("πρώτη ημέρα", everything, (min_date, min_date))
+    ]
+
+
+def chart_result(data, chart):
+    """Τα δεδομένα ενός γραφήματος, όπως τα υπολογίζει το render_* του πριν το σχεδιάσει"""
+    from log_dashboard import timeline_series, density_points, top_timeline_counts, TOP_N
+    kind = chart["kind"]
+    if kind == "top":
+        return data.top(chart["column"], chart.get("n", TOP_N))
+    if kind == "bar":
+        return data.counts((chart["y"], chart["color"]), as_str=tuple(chart.get("as_str", ())))
+    if kind == "heatmap":
+        return data.counts((chart["y"], chart["x"]), upper=tuple(chart.get("upper", ())))
+    if kind == "scatter":
+        return data.scatter(chart)
+    freq = data.bucket(chart)
+    if kind == "timeline":
+        by = chart.get("by")
+        return timeline_series(data.rollups(), freq, data.selections, data.date_range, by, by in chart.get("upper", ()))
+    if kind == "density":
+        return density_points(data.rollups(), freq, data.selections, data.date_range, chart["y"])
+    top_values = data.top(chart["column"], chart.get("n", TOP_N))[chart["column"]].tolist()
+    return top_timeline_counts(data.rollups(), freq, data.selections, data.date_range, chart["column"], top_values)
+
+
+def dashboard_results(data, spec):
+    """Τα δεδομένα όλων των widgets του dashboard για μία κατάσταση φίλτρων"""
+    results = {"summary": data.summary()}
+    if results["summary"]["rows"] == 0:
+        return results
+    for i, metric in enumerate(spec["metrics"]):
+        results[f"metric {i}"] = data.breakdown(metric["breakdown"]) if "breakdown" in metric else data.metric(metric)
+    for row in spec["charts"]:
+        for chart in [row] if isinstance(row, dict) else row:
+            results[chart["name"]] = chart_result(data, chart)
+    return results
+
+
+def differences(expected, actual, path=""):
+    """Οι διαφορές δύο αποτελεσμάτων (frames, dicts, λίστες, τιμές) ως λίστα από μηνύματα"""
+    import pandas as pd
+    if isinstance(expected, pd.DataFrame):
+        try:
+            pd.testing.assert_frame_equal(expected.reset_index(drop=True), actual.reset_index(drop=True), check_dtype=False, check_categorical=False)
+        except (AssertionError, AttributeError) as e:
+            return [f"{path}: {str(e).splitlines()[0]}"]
+        return []
+    if isinstance(expected, dict):
+        if set(expected) != set(actual):
+            return [f"{path}: διαφορετικά κλειδιά"]
+        return [diff for key in expected for diff in differences(expected[key], actual[key], f"{path}/{key}")]
+    if isinstance(expected, (list, tuple)):
+        if len(expected) != len(actual):
+            return [f"{path}: {len(expected)} != {len(actual)} στοιχεία"]
+        return [diff for i, (a, b) in enumerate(zip(expected, actual)) for diff in differences(a, b, f"{path}[{i}]")]
+    if (pd.isna(expected) and pd.isna(actual)) if pd.api.types.is_scalar(expected) else False:
+        return []
+    return [] if expected == actual else [f"{path}: {expected!r} != {actual!r}"]
+
+
+def run_dashboard_case(log_type, n_lines, n_templates, seed, backends=DASHBOARD_BACKENDS, repeats=DASHBOARD_REPEATS):
+    """Χρόνοι των υπολογισμών του dashboard ανά backend (και έλεγχος ότι τα αποτελέσματα ταυτίζονται με της pandas)
+
+    Το setup (τιμές φίλτρων, rollups, μετατροπή σε polars) γίνεται μία φορά ανά dataset και μετριέται χωριστά
+    από τις αλλαγές φίλτρων, που ξανα-υπολογίζουν όλα τα widgets χωρίς cache.
+    """
+    from log_schema import apply_schema
+    from log_timestamps import normalize_timestamps
+    from log_dashboard import dashboard_data_class, filter_options
+
+    spec = log_module(log_type).DASHBOARD
+    stages = {}
+    df, _ = parse_synthetic(log_type, "Drain", n_lines, n_templates, seed, stages)
+    df = normalize_timestamps(apply_schema(df, log_type), log_type)
+    states = dashboard_states(df, spec)
+
+    timings = {}
+    results = {}
+    for backend in backends:
+        data_class = dashboard_data_class(df, backend)
+        setup = []
+        per_state = {name: [] for name, _, _ in states}
+        for _ in range(repeats):
+            # Νέο αντίγραφο σε κάθε επανάληψη: τα caches ανά dataset (και των widgets) ξεκινούν άδεια
+            frame = df.copy()
+            started = time.perf_counter()
+            filter_options(frame, [column for column, _ in spec["filters"]])
+            warm = data_class(frame, spec, states[0][1], states[0][2])
+            warm.rollups()
+            if hasattr(warm, "frame"):
+                warm.frame()
+            setup.append(time.perf_counter() - started)
+
+            for name, selections, date_range in states:
+                started = time.perf_counter()
+                results[(backend, name)] = dashboard_results(data_class(frame, spec, selections, date_range), spec)
+                per_state[name].append(time.perf_counter() - started)
+        timings[backend] = {
+            "setup": round(min(setup), 4),
+            "states": {name: round(min(seconds), 4) for name, seconds in per_state.items()},
+            "filters_total": round(sum(min(seconds) for seconds in per_state.values()), 4)
+        }
+
+    diffs = [
+        f"{backend} · {name}{diff}"
+        for backend in backends if backend != backends[0]
+        for name, _, _ in states
+        for diff in differences(results[(backends[0], name)], results[(backend, name)])
+    ]
+    return {"rows": len(df), "parse_seconds": round(stages["parse"], 3), "timings": timings, "identical": not diffs, "differences": diffs[:20]}
+
+
+def case_key(result):
+    return f"{result['log_type']}/{result['parser']}/{result['lines']}/{result['templates']}"
+
+
+def compare_to_baseline(results, baseline, max_regression=DEFAULT_MAX_REGRESSION):
+    """Επιστρέφει τις περιπτώσεις που το lines/sec έπεσε περισσότερο από max_regression σε σχέση με το baseline"""
+    previous = {case_key(r): r for r in baseline.get("results", []) if r.get("status") == "ok"}
+    regressions = []
+    for result in results:
+        before = previous.get(case_key(result))
+        if before is None or not before.get("lines_per_sec"):
+            continue
+        if result.get("status") != "ok" or not result.get("lines_per_sec"):
+            regressions.append({"case": case_key(result), "baseline": before["lines_per_sec"], "current": None, "change": None})
+            continue
+        change = result["lines_per_sec"] / before["lines_per_sec"] - 1
+        if change < -max_regression:
+            regressions.append({
+                "case": case_key(result),
+                "baseline": before["lines_per_sec"],
+                "current": result["lines_per_sec"],
+                "change": round(change, 3)
+            })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark των log parsers πάνω σε συνθετικά logs")
+    parser.add_argument("--log-types", nargs="+", choices=LOG_TYPES, default=LOG_TYPES)
+    parser.add_argument("--parsers", nargs="+", choices=PARSERS, default=PARSERS)
+    parser.add_argument("--lines", nargs="+", type=int, default=DEFAULT_LINES, help="Πλήθος γραμμών (μία ή περισσότερες τιμές)")
+    parser.add_argument("--templates", nargs="+", type=int, default=[DEFAULT_TEMPLATES], help="Πλήθος διαφορετικών templates")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Μέγιστος χρόνος ανά περίπτωση (δευτερόλεπτα)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Αρχείο JSON για τα αποτελέσματα")
+    parser.add_argument("--baseline", help="JSON προηγούμενης εκτέλεσης για έλεγχο regression")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="Αποδεκτή πτώση lines/sec ως κλάσμα (π.χ. 0.2 = 20%%)")
+    parser.add_argument("--dashboard", action="store_true", help="Benchmark των backends του dashboard αντί για τους parsers")
+    parser.add_argument("--backends", nargs="+", choices=DASHBOARD_BACKENDS, default=DASHBOARD_BACKENDS,
+                        help="Backends του dashboard (το πρώτο είναι η αναφορά για τη σύγκριση)")
+    args = parser.parse_args(argv)
+
+    if args.dashboard:
+        return dashboard_main(args)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = []
+    for log_type in args.log_types:
+        for parser_choice in args.parsers:
+            for n_templates in args.templates:
+                for n_lines in args.lines:
+                    result = run_isolated(log_type, parser_choice, n_lines, n_templates, args.seed, args.timeout)
+                    result = {"log_type": log_type, "parser": parser_choice, "lines": n_lines, "templates": n_templates, **result}
+                    results.append(result)
+                    if result["status"] == "ok":
+                        print(f"{case_key(result):<40} {result['lines_per_sec']:>12,.0f} lines/s  "
+                              f"parse {result['stages']['parse']:.2f}s  peak {result['peak_rss_mb']} MB")
+                    else:
+                        print(f"{case_key(result):<40} {result['status']} {result.get('error', '')}")
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed
+        },
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Αποτελέσματα: {args.output}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']}: {regression['baseline']} -> {regression['current']} lines/s")
+        if regressions:
+            return 1
+        print("Κανένα regression σε σχέση με το baseline")
+    return 0
+
+
+def dashboard_main(args):
+    """Το --dashboard: χρόνοι ανά backend και τύπο log, με έλεγχο ότι τα αποτελέσματα ταυτίζονται"""
+    results = []
+    for log_type in args.log_types:
+        for n_templates in args.templates:
+            for n_lines in args.lines:
+                result = run_dashboard_case(log_type, n_lines, n_templates, args.seed, args.backends)
+                results.append({"log_type": log_type, "lines": n_lines, "templates": n_templates, **result})
+                reference = result["timings"][args.backends[0]]["filters_total"]
+                for backend, timing in result["timings"].items():
+                    speedup = reference / timing["filters_total"] if timing["filters_total"] > 0 else 0
+                    print(f"{log_type:<10} {n_lines:>9,} {backend:<8} setup {timing['setup']:7.3f}s  "
+                          f"φίλτρα {timing['filters_total']:7.3f}s  x{speedup:.2f}")
+                print(f"{'':<10} {'ίδια αποτελέσματα' if result['identical'] else 'ΔΙΑΦΟΡΕΣ'}")
+                for diff in result["differences"]:
+                    print(f"    {diff}")
+
+    meta = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": args.seed
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, ensure_ascii=False)
+    print(f"Αποτελέσματα: {args.output}")
+    return 0 if all(result["identical"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import os
+import json
+import hashlib
+import pandas as pd
+from log_perf import timed
+
+
+# Ρυθμίσεις cache (μπορούν να αλλάξουν μέσω environment variables)
+CACHE_DIR = os.environ.get(
+    "LOG_PARSER_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "log-parser")
+)
+CACHE_MAX_BYTES = int(os.environ.get("LOG_PARSER_CACHE_MAX_BYTES", 2 * 1024 ** 3))  # 2 GB
+CACHE_VERSION = 1  # Αύξηση όταν αλλάζει η μορφή των αποτελεσμάτων
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@timed("Hash upload", "cache", lines=None)
+def hash_upload(uploaded_file, chunk_size=HASH_CHUNK_SIZE):
+    """Υπολογίζει το SHA-256 του αρχείου διαβάζοντάς το σε κομμάτια"""
+    digest = hashlib.sha256()
+    uploaded_file.seek(0)
+    while True:
+        chunk = uploaded_file.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def hash_uploads(uploaded_files, chunk_size=HASH_CHUNK_SIZE):
+    """Hash για πολλά αρχεία μαζί (εξαρτάται από τη σειρά τους, όπως και το log που προκύπτει)"""
+    digest = hashlib.sha256()
+    for uploaded_file in uploaded_files:
+        digest.update(hash_upload(uploaded_file, chunk_size).encode("ascii"))
+    return digest.hexdigest()
+
+
+def make_cache_key(content_hash, parser_choice, log_format, regex, params):
+    """Κλειδί cache από το hash του περιεχομένου, τον parser, το format, τα regex και τις παραμέτρους"""
+    payload = {
+        "version": CACHE_VERSION,
+        "content": content_hash,
+        "parser": parser_choice,
+        "log_format": log_format,
+        "regex": list(regex or []),
+        "params": {key: str(value) for key, value in sorted(params.items())}
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _entry_path(cache_key, cache_dir):
+    return os.path.join(cache_dir, cache_key + ".pkl")
+
+
+@timed("Cache lookup", "cache", lines=lambda result: len(result[0]))
+def load_cached_result(cache_key, cache_dir=CACHE_DIR):
+    """Επιστρέφει (df_structured, df_templates) από την cache ή None"""
+    path = _entry_path(cache_key, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        df_structured, df_templates = pd.read_pickle(path)
+    except Exception:
+        # Κατεστραμμένη εγγραφή - τη διαγράφουμε και κάνουμε κανονικό parse
+        _remove(path)
+        return None
+
+    # Ενημέρωση του χρόνου πρόσβασης για το LRU
+    os.utime(path, None)
+    return df_structured, df_templates
+
+
+@timed("Cache store", "cache", lines=None)
+def store_cached_result(cache_key, df_structured, df_templates, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """Αποθηκεύει το αποτέλεσμα στην cache και εφαρμόζει το όριο μεγέθους"""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _entry_path(cache_key, cache_dir)
+    tmp_path = path + ".tmp"
+    pd.to_pickle((df_structured, df_templates), tmp_path)
+    os.replace(tmp_path, path)  # Ατομική εγγραφή
+    evict_cache(cache_dir, max_bytes)
+
+
+def evict_cache(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """Διαγράφει τις λιγότερο πρόσφατα χρησιμοποιημένες εγγραφές μέχρι να χωρέσουν στο όριο"""
+    if not os.path.isdir(cache_dir):
+        return
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".pkl"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """Αδειάζει ολόκληρη την cache"""
+    evict_cache(cache_dir, max_bytes=0)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
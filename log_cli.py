@@ -0,0 +1,248 @@
+"""Parse αρχείων log χωρίς Streamlit (π.χ. για nightly jobs)
+
+Παράδειγμα:
+    python log_cli.py --log-type Linux --parser Drain --param depth=4 --output-dir parsed/ /var/log/archive/
+    python log_cli.py --log-type Suricata --format csv --workers 8 fast.log
+    python log_cli.py --log-type Linux --pattern "syslog*.gz" /var/log/   (αποσυμπίεση κατά την ανάγνωση)
+    python log_cli.py --log-type Suricata --format dataset --output-dir /data/dataset /var/log/suricata/archive/
+
+Τα αποτελέσματα γράφονται ως <output-dir>/<όνομα αρχείου>_structured.parquet και _templates.parquet
+(ή .csv) και φορτώνονται στο dashboard από το "📂 Φόρτωση parsed Parquet".
+Με --format dataset όλα τα αρχεία προστίθενται σε ένα dataset στο <output-dir> (Parquet ανά τύπο log
+και ημέρα), που ανοίγει στο dashboard από το "🗄️ Out-of-core dataset" χωρίς να φορτωθεί στη μνήμη.
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from log_utils import (
+    PARSER_FACTORY, PARSER_DEFAULTS, PARSER_PARAM_TYPES, SPOOL_BUFFER_SIZE, STREAM_LINE_FILTERS, make_parser_args, mine_log_file, mining_cache_params
+)
+from log_library import TemplateLibrary, library_key, run_with_library
+from log_columnar import write_parquet
+from log_dataset import write_dataset
+from log_cache import hash_upload, make_cache_key, store_cached_result
+from log_archives import detect_compression, strip_compression_suffix, virtual_log
+from log_perf import PerfRecorder, recording, stage, trace_json
+from log_types import LOG_MODULES, log_module
+
+
+OUTPUT_FORMATS = ["parquet", "csv", "dataset"]
+DEFAULT_PATTERN = "*.log"
+
+
+def find_log_files(paths, pattern=DEFAULT_PATTERN):
+    """Τα αρχεία προς parse: τα αρχεία όπως δόθηκαν και, για κάθε φάκελο, όσα ταιριάζουν στο pattern (αναδρομικά)
+
+    Επιστρέφει λίστα (διαδρομή αρχείου, σχετικό όνομα για την έξοδο).
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for match in sorted(glob.glob(os.path.join(path, "**", pattern), recursive=True)):
+                if os.path.isfile(match):
+                    files.append((match, os.path.relpath(match, path)))
+        elif os.path.isfile(path):
+            files.append((path, os.path.basename(path)))
+        else:
+            raise FileNotFoundError(f"Δεν βρέθηκε: {path}")
+    return files
+
+
+def parse_params(parser_choice, log_type, overrides):
+    """Οι παράμετροι του PARSER_DEFAULTS με τις τιμές του --param (key=value) από πάνω"""
+    params = dict(PARSER_DEFAULTS[parser_choice][log_type])
+    for item in overrides or []:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Η παράμετρος '{item}' πρέπει να είναι της μορφής key=value")
+        params[key.strip()] = value.strip()
+
+    # Ίδιος έλεγχος τύπων με το run_parser
+    for key, expected_type in PARSER_PARAM_TYPES.get(parser_choice, {}).items():
+        if key in params:
+            try:
+                expected_type(params[key])
+            except ValueError:
+                raise ValueError(f"Η παράμετρος '{key}' πρέπει να είναι τύπου {expected_type.__name__}.")
+    return params
+
+
+def parse_file(path, log_type, parser_choice, params, workers=1, buffer_size=SPOOL_BUFFER_SIZE, verbose=False, use_key_fields=True, use_library=False, deduplicate=True):
+    """Parse ενός αρχείου (χωρίς αντιγραφή: το indir είναι ο φάκελος του αρχείου)
+
+    Τα συμπιεσμένα αρχεία (gzip/bz2/xz/zstd) διαβάζονται με αποσυμπίεση κατά την ανάγνωση.
+
+    Επιστρέφει (structured, templates, μηνύματα για το dedup / τα shards / τη βιβλιοθήκη).
+    """
+    module = log_module(log_type)
+    key_fields = getattr(module, "KEY_FIELDS", None) if use_key_fields else None
+    path = os.path.abspath(path)  # Πριν το chdir
+    indir = os.path.dirname(path)
+    log_name = os.path.basename(path)
+    with open(path, "rb") as f:
+        compression = detect_compression(f)
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    library = None
+    if use_library:
+        library = TemplateLibrary(library_key(parser_choice, module.LOG_FORMAT, module.LOG_REGEX, params), parser_choice, module.LOG_FORMAT)
+
+    with tempfile.TemporaryDirectory() as outdir, tempfile.TemporaryDirectory() as archive_dir, output:
+        log_path = path
+        source = contextlib.nullcontext()
+        if compression:
+            # Το indir είναι προσωρινός φάκελος με το αρχείο ως virtual log (χωρίς την κατάληξη συμπίεσης)
+            indir = archive_dir
+            log_path = os.path.join(indir, strip_compression_suffix(log_name))
+            source = virtual_log(log_path, [path])
+        parser_args = make_parser_args(module.LOG_FORMAT, module.LOG_REGEX, indir, outdir, **params)
+        cwd = os.getcwd()
+        os.chdir(outdir)  # Ο LogCluster γράφει βοηθητικά αρχεία στο cwd
+        try:
+            with source:
+                def mine(args, log_path, out):
+                    return mine_log_file(parser_choice, args, log_path, buffer_size, out, workers, key_fields, deduplicate)
+
+                if library is not None:
+                    df_structured, df_templates, _, messages, stats = run_with_library(
+                        mine, parser_args, log_path, library, buffer_size, line_filter=STREAM_LINE_FILTERS.get(parser_choice)
+                    )
+                    messages = [
+                        f"{stats['matched']:,} γραμμές από τη βιβλιοθήκη, {stats['new_templates']:,} νέα templates"
+                    ] + messages
+                else:
+                    df_structured, df_templates, _, messages = mine(parser_args, log_path, "memory")
+        finally:
+            os.chdir(cwd)
+    return df_structured, df_templates, messages
+
+
+def write_results(df_structured, df_templates, base, output_format):
+    """Γράφει τα αποτελέσματα ως <base>_structured / <base>_templates σε Parquet ή CSV"""
+    if output_format == "parquet":
+        return write_parquet(df_structured, df_templates, base)
+    os.makedirs(os.path.dirname(os.path.abspath(base)), exist_ok=True)
+    structured_path = base + "_structured.csv"
+    templates_path = base + "_templates.csv"
+    df_structured.to_csv(structured_path, index=False)
+    df_templates.to_csv(templates_path, index=False)
+    return structured_path, templates_path
+
+
+def cache_key_for(path, log_type, parser_choice, params, workers, use_key_fields=True, use_library=False, deduplicate=True):
+    """Το κλειδί του cache του dashboard που θα έφτιαχνε το run_parser για το ίδιο αρχείο και τις ίδιες ρυθμίσεις
+
+    Με use_library το κλειδί περιέχει την τρέχουσα κατάσταση της βιβλιοθήκης, οπότε υπολογίζεται πριν από το parse.
+    """
+    module = log_module(log_type)
+    key_fields = getattr(module, "KEY_FIELDS", None) if use_key_fields else None
+    cache_params = dict(params, output="memory", **mining_cache_params(parser_choice, workers, key_fields, deduplicate))
+    if use_library:
+        library = TemplateLibrary(library_key(parser_choice, module.LOG_FORMAT, module.LOG_REGEX, params), parser_choice, module.LOG_FORMAT)
+        cache_params["library"] = library.fingerprint()
+    with open(path, "rb") as f:
+        return make_cache_key(hash_upload(f), parser_choice, module.LOG_FORMAT, module.LOG_REGEX, cache_params)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse αρχείων log σε Parquet/CSV χωρίς Streamlit")
+    parser.add_argument("paths", nargs="+", help="Αρχεία ή φάκελοι με logs")
+    parser.add_argument("--log-type", required=True, choices=list(LOG_MODULES))
+    parser.add_argument("--parser", default="Drain", choices=list(PARSER_FACTORY))
+    parser.add_argument("--param", action="append", default=[], help="Παράμετρος του parser ως key=value (π.χ. depth=4)")
+    parser.add_argument("--output-dir", default="parsed", help="Φάκελος εξόδου")
+    parser.add_argument("--format", default="parquet", choices=OUTPUT_FORMATS)
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN, help="Pattern αρχείων μέσα στους φακέλους")
+    parser.add_argument("--workers", type=int, default=1, help="Παράλληλο parse σε shards (Drain, Spell, IPLoM, MoLFI)")
+    parser.add_argument("--no-key-fields", action="store_true", help="Χωρίς το ένα template ανά κλειδί (SID/Revision στα Suricata)")
+    parser.add_argument("--no-dedup", action="store_true", help="Χωρίς συγχώνευση των ίδιων γραμμών (μετά το masking) πριν το mining")
+    parser.add_argument("--library", action="store_true", help="Warm start από τη βιβλιοθήκη templates (και ενημέρωσή της)")
+    parser.add_argument("--cache", action="store_true", help="Αποθήκευση και στο cache του dashboard")
+    parser.add_argument("--stats-json", help="Αρχείο JSON με τα στατιστικά throughput")
+    parser.add_argument("--trace", help="Αρχείο Trace Event Format (chrome://tracing, Perfetto) με τα στάδια κάθε αρχείου")
+    parser.add_argument("--verbose", action="store_true", help="Εμφάνιση της εξόδου των parsers")
+    args = parser.parse_args(argv)
+
+    try:
+        params = parse_params(args.parser, args.log_type, args.param)
+        files = find_log_files(args.paths, args.pattern)
+    except (ValueError, FileNotFoundError) as e:
+        parser.error(str(e))
+    if not files:
+        parser.error(f"Κανένα αρχείο δεν ταιριάζει στο '{args.pattern}'")
+
+    stats = []
+    recorders = []
+    failed = 0
+    for path, relative_name in files:
+        size = os.path.getsize(path)
+        started = time.perf_counter()
+        recorder = PerfRecorder(f"{args.parser} · {relative_name}")
+        recorders.append(recorder)
+        cache_key = cache_key_for(
+            path, args.log_type, args.parser, params, args.workers, not args.no_key_fields, args.library, not args.no_dedup
+        ) if args.cache else None
+        try:
+            with recording(recorder), stage(recorder.name, "total"):
+                df_structured, df_templates, messages = parse_file(
+                    path, args.log_type, args.parser, params, args.workers, verbose=args.verbose,
+                    use_key_fields=not args.no_key_fields, use_library=args.library, deduplicate=not args.no_dedup
+                )
+        except Exception as e:
+            failed += 1
+            print(f"✗ {path}: {type(e).__name__}: {e}", file=sys.stderr)
+            stats.append({"file": path, "status": "error", "error": str(e)})
+            continue
+        elapsed = time.perf_counter() - started
+
+        if args.format == "dataset":
+            write_dataset(df_structured, df_templates, args.output_dir, args.log_type)
+            outputs = [args.output_dir]
+        else:
+            base = os.path.join(args.output_dir, os.path.splitext(strip_compression_suffix(relative_name))[0])
+            outputs = write_results(df_structured, df_templates, base, args.format)
+        if cache_key is not None and not df_structured.empty:
+            store_cached_result(cache_key, df_structured, df_templates)
+
+        rows = len(df_structured)
+        stats.append({
+            "file": path,
+            "status": "ok",
+            "rows": rows,
+            "templates": len(df_templates),
+            "bytes": size,
+            "seconds": round(elapsed, 3),
+            "lines_per_sec": round(rows / elapsed, 1) if elapsed > 0 else None,
+            "mb_per_sec": round(size / 1e6 / elapsed, 2) if elapsed > 0 else None,
+            "outputs": list(outputs),
+            "notes": messages
+        })
+        print(f"✓ {path}: {rows:,} γραμμές, {len(df_templates):,} templates σε {elapsed:.1f}s "
+              f"({rows / elapsed if elapsed > 0 else 0:,.0f} lines/s, {size / 1e6 / elapsed if elapsed > 0 else 0:.1f} MB/s)")
+        for message in messages:
+            print(f"    {message}")
+
+    done = [s for s in stats if s["status"] == "ok"]
+    total_rows = sum(s["rows"] for s in done)
+    total_seconds = sum(s["seconds"] for s in done)
+    total_bytes = sum(s["bytes"] for s in done)
+    if total_seconds > 0:
+        print(f"Σύνολο: {len(done)} αρχεία, {total_rows:,} γραμμές σε {total_seconds:.1f}s "
+              f"({total_rows / total_seconds:,.0f} lines/s, {total_bytes / 1e6 / total_seconds:.1f} MB/s)")
+
+    if args.stats_json:
+        with open(args.stats_json, "w", encoding="utf-8") as f:
+            json.dump({"log_type": args.log_type, "parser": args.parser, "params": params, "files": stats}, f, indent=2, ensure_ascii=False)
+    if args.trace:
+        with open(args.trace, "w", encoding="utf-8") as f:
+            f.write(trace_json(recorders))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import os
+import threading
+from contextlib import contextmanager
+import pandas as pd
+from log_perf import timed
+
+
+# Τύποι των στηλών του parser: ακέραιοι οι αριθμοί γραμμών/εμφανίσεων και strings όλες οι υπόλοιπες
+# (ίδιοι με output="memory" και output="csv", ώστε π.χ. το Ms "008629" να μη γίνεται 8629)
+STRUCTURED_DTYPES = {"LineId": "int64"}
+TEMPLATE_DTYPES = {"EventId": "str", "EventTemplate": "str", "Occurrences": "int64"}
+DEFAULT_DTYPE = "str"
+
+_capture_lock = threading.Lock()
+_capture_dirs = {}
+_original_to_csv = pd.DataFrame.to_csv
+
+
+def write_parser_frame(frame, path_or_buf=None, *args, **kwargs):
+    """Writer των parsers όσο τρέχει ένα capture: τα frames για καταχωρημένο outdir μένουν στη μνήμη,
+    όλα τα άλλα γράφονται κανονικά με το to_csv του pandas
+    """
+    if isinstance(path_or_buf, (str, os.PathLike)):
+        path = os.path.abspath(os.fspath(path_or_buf))
+        with _capture_lock:
+            captured = _capture_dirs.get(os.path.dirname(path))
+        if captured is not None:
+            columns = kwargs.get("columns")
+            captured[os.path.basename(path)] = frame[list(columns)] if columns is not None else frame
+            return None
+    return _original_to_csv(frame, path_or_buf, *args, **kwargs)
+
+
+@contextmanager
+def capture_parser_output(outdir):
+    """Context manager: ό,τι γράφεται με to_csv μέσα στο outdir επιστρέφεται ως DataFrame αντί να πάει στο δίσκο
+
+    Οι parsers του logparser γράφουν με DataFrame.to_csv μέσα στο parse τους (ο MoLFI χωρίς ξεχωριστή μέθοδο
+    εξόδου), οπότε το to_csv δείχνει στο write_parser_frame μόνο όσο υπάρχει ενεργό capture και επανέρχεται
+    στο αρχικό όταν κλείσει το τελευταίο.
+    """
+    outdir = os.path.abspath(outdir)
+    captured = {}
+    with _capture_lock:
+        if not _capture_dirs:
+            pd.DataFrame.to_csv = write_parser_frame
+        _capture_dirs[outdir] = captured
+    try:
+        yield captured
+    finally:
+        with _capture_lock:
+            _capture_dirs.pop(outdir, None)
+            if not _capture_dirs:
+                pd.DataFrame.to_csv = _original_to_csv
+
+
+def read_parser_csv(structured_path, templates_path):
+    """Διαβάζει τα CSV ενός parser με τους τύπους του output="memory" (τα κενά πεδία μένουν κενά strings)"""
+    df_structured = pd.read_csv(structured_path, dtype=str, keep_default_na=False) if os.path.exists(structured_path) else pd.DataFrame()
+    df_templates = pd.read_csv(templates_path, dtype=str, keep_default_na=False) if os.path.exists(templates_path) else pd.DataFrame()
+    return normalize_structured(df_structured), normalize_templates(df_templates)
+
+
+def normalize_structured(df_structured):
+    """Εφαρμόζει σταθερούς τύπους στο structured frame (ParameterList όπως στο CSV)"""
+    if df_structured.empty:
+        return df_structured
+    if "ParameterList" in df_structured.columns:
+        df_structured["ParameterList"] = [
+            str(value) if isinstance(value, (list, tuple)) else value
+            for value in df_structured["ParameterList"]
+        ]
+    return _apply_dtypes(df_structured, STRUCTURED_DTYPES)
+
+
+def normalize_templates(df_templates):
+    """Εφαρμόζει σταθερούς τύπους στον πίνακα templates"""
+    if df_templates.empty:
+        return df_templates
+    return _apply_dtypes(df_templates, TEMPLATE_DTYPES).reset_index(drop=True)
+
+
+def _apply_dtypes(df, dtypes):
+    for column in df.columns:
+        dtype = dtypes.get(column, DEFAULT_DTYPE)
+        # Στήλες με κενές τιμές (π.χ. MoLFI χωρίς template) μένουν ως έχουν
+        if df[column].dtype != dtype and not df[column].isna().any():
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+@timed("Parquet write", "io", lines=None)
+def write_parquet(df_structured, df_templates, path):
+    """Αποθηκεύει structured και templates ως <path>_structured.parquet και <path>_templates.parquet"""
+    base = path[:-len(".parquet")] if path.endswith(".parquet") else path
+    directory = os.path.dirname(os.path.abspath(base))
+    os.makedirs(directory, exist_ok=True)
+    structured_path = base + "_structured.parquet"
+    templates_path = base + "_templates.parquet"
+    df_structured.to_parquet(structured_path, index=False)
+    df_templates.to_parquet(templates_path, index=False)
+    return structured_path, templates_path
+
+
+@timed("Parquet read", "io", lines=lambda result: len(result[0]))
+def read_parquet(path):
+    """Διαβάζει τα αρχεία του write_parquet (με ή χωρίς την κατάληξη .parquet / _structured.parquet)"""
+    base = path[:-len(".parquet")] if path.endswith(".parquet") else path
+    if base.endswith("_structured") or base.endswith("_templates"):
+        base = base.rsplit("_", 1)[0]
+    df_structured = pd.read_parquet(base + "_structured.parquet")
+    templates_path = base + "_templates.parquet"
+    df_templates = pd.read_parquet(templates_path) if os.path.exists(templates_path) else pd.DataFrame()
+    return df_structured, df_templates
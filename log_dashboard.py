@@ -0,0 +1,542 @@
+import os
+import numbers
+import streamlit as st
+import pandas as pd
+import altair as alt
+import plotly.express as px
+from log_filters import DashboardViews, cached_for_dataset
+from log_dataset import ParquetDataset
+from log_polars import to_polars, summarize as polars_summarize, bin_points as polars_bin_points
+from log_perf import SectionTimer
+from log_rollups import TimeRollups, get_rollups, pick_bucket, ROLLUP_LABELS, ROLLUP_MAX_BUCKETS
+from log_downsample import bin_points, downsample_series, describe_reduction, DENSITY_POINT_BUDGET
+
+
+TIME_COLUMN = "datetime"
+ALL_OPTION = "ALL"
+TOP_N = 10
+DEFAULT_METRIC_COLOR = "#528AFF"
+EMPTY_MESSAGE = "⚠️ Δεν υπάρχουν δεδομένα για τα επιλεγμένα φίλτρα. Δοκιμάστε άλλες επιλογές."
+
+# Backend για τους υπολογισμούς των dashboards σε DataFrame: "pandas" ή "polars" (lazy plans, πολυνηματικά)
+DASHBOARD_BACKEND = os.environ.get("LOG_PARSER_DASHBOARD_BACKEND", "pandas")
+
+# Μέγιστο πλήθος χρονικών buckets ανά είδος γραφήματος (το spec ενός γραφήματος το αλλάζει με "buckets")
+CHART_BUCKETS = {
+    "timeline": ROLLUP_MAX_BUCKETS,
+    "density": 100,  # Όσα και τα nbinsx του density heatmap
+    "top_timeline": 250  # Stacked bars: 1 λεπτό για 1 ώρα, 15 λεπτά για 1 ημέρα, 3 ώρες για 1 μήνα
+}
+
+# Τα πεδία κάθε είδους γραφήματος που είναι στήλες της κοινής ομαδοποίησης (summary)
+CUBE_FIELDS = {
+    "top": ["column"],
+    "bar": ["y", "color"],
+    "heatmap": ["x", "y"],
+    "top_timeline": ["column"]
+}
+
+
+def render_dashboard(df, spec):
+    """Dashboard ενός τύπου log από τη δήλωσή του (filters, metrics, charts)
+
+    Τα metrics και τα γραφήματα με counts (top-N, ραβδογράμματα, heatmaps) προκύπτουν από μία
+    ομαδοποίηση των φιλτραρισμένων logs σε όλες τις στήλες που χρειάζονται, οπότε το φιλτραρισμένο
+    frame διαβάζεται μία φορά για όλα (και μία για κάθε scatter). Τα χρονικά γραφήματα έρχονται από τα rollups,
+    σε ανάλυση που προσαρμόζεται στο διάστημα των φιλτραρισμένων logs (pick_bucket).
+    Κάθε στοιχείο του spec["charts"] είναι ένα γράφημα ή λίστα από γραφήματα που μπαίνουν δίπλα-δίπλα.
+    Στη θέση του df μπορεί να δοθεί ParquetDataset (out-of-core): τα ίδια ερωτήματα γίνονται τότε στο DuckDB.
+    Για το αποτέλεσμα μιας προεπισκόπησης (df.attrs["preview"]) τα metrics δείχνονται ως εκτιμήσεις.
+    """
+    timer = SectionTimer(f"{spec['log_type']} dashboard")
+
+    selections, date_range = show_filters(df, spec)
+    st.markdown("---")
+
+    timer.lap("Φίλτρα")
+
+    data = dashboard_data_class(df)(df, spec, selections, date_range)
+    summary = data.summary()
+    if summary["rows"] == 0:
+        st.warning(spec.get("empty_message", EMPTY_MESSAGE))
+        return
+
+    timer.lap("Εφαρμογή φίλτρων", summary["rows"])
+
+    if data.preview:
+        st.info(preview_message(data.preview))
+    show_metrics(data, spec["metrics"], spec.get("metric_style", ""))
+    st.markdown("---")
+
+    timer.lap("Metrics")
+
+    for row in spec["charts"]:
+        if isinstance(row, dict):
+            render_chart(data, row)
+            timer.lap(row["name"])
+            continue
+        for column, chart in zip(st.columns(len(row)), row):
+            with column:
+                render_chart(data, chart)
+            timer.lap(chart["name"])
+
+
+def dashboard_data_class(df, backend=None):
+    """Η κλάση των δεδομένων του dashboard για το df (ParquetDataset ή DataFrame με το backend των ρυθμίσεων)"""
+    if isinstance(df, ParquetDataset):
+        return DatasetDashboardData
+    backend = backend or DASHBOARD_BACKEND
+    if backend not in DASHBOARD_BACKENDS:
+        raise ValueError(f"Άγνωστο backend dashboard '{backend}' (διαθέσιμα: {', '.join(DASHBOARD_BACKENDS)})")
+    return DASHBOARD_BACKENDS[backend]
+
+
+def filter_options(df, columns):
+    """Οι τιμές κάθε φίλτρου (με τη σειρά εμφάνισης) και το εύρος ημερομηνιών, μία φορά ανά dataset"""
+    if isinstance(df, ParquetDataset):
+        return cached_for_dataset(df, "filter_options", tuple(columns), lambda: df.filter_options(columns))
+
+    def build():
+        options = {column: df[column].dropna().unique().tolist() for column in columns}
+        dates = df[TIME_COLUMN].dt.date
+        return options, dates.min(), dates.max()
+    return cached_for_dataset(df, "filter_options", tuple(columns), build)
+
+
+def show_filters(df, spec):
+    """Ένα multiselect ανά φίλτρο (κενό ή ALL = όλες οι τιμές) και επιλογή ημερομηνιών"""
+    options, min_date, max_date = filter_options(df, [column for column, _ in spec["filters"]])
+    widgets = st.columns(len(spec["filters"]) + 1)
+
+    selections = {}
+    for widget, (column, label) in zip(widgets, spec["filters"]):
+        with widget:
+            selected = st.multiselect(label, [ALL_OPTION] + options[column])
+            selections[column] = options[column] if ALL_OPTION in selected or not selected else selected
+
+    with widgets[-1]:
+        date_range = st.date_input(spec["date_label"], value=[min_date, max_date])
+    return selections, date_range
+
+
+def summary_dimensions(spec):
+    """Οι στήλες της κοινής ομαδοποίησης: όσες χρειάζονται τα metrics και τα γραφήματα με counts"""
+    columns = []
+    for metric in spec["metrics"]:
+        columns += [metric[key] for key in ("nunique", "breakdown") if key in metric]
+    for row in spec["charts"]:
+        for chart in [row] if isinstance(row, dict) else row:
+            columns += [chart[field] for field in CUBE_FIELDS.get(chart["kind"], [])]
+    return list(dict.fromkeys(columns))
+
+
+def summarize(filtered_df, dimensions):
+    """Count ανά συνδυασμό τιμών των dimensions στα φιλτραρισμένα logs, σε ένα πέρασμα
+
+    Οι συνδυασμοί μένουν με τη σειρά πρώτης εμφάνισης, οπότε και οι τιμές κάθε στήλης έχουν τη σειρά του unique().
+    """
+    if dimensions:
+        cube = filtered_df.groupby(dimensions, sort=False, observed=True, dropna=False).size().reset_index(name="Count")
+    else:
+        cube = pd.DataFrame({"Count": [len(filtered_df)]})
+    times = filtered_df[TIME_COLUMN]
+    return {"rows": len(filtered_df), "cube": cube, "start": times.min(), "end": times.max()}
+
+
+def format_time_range(start, end):
+    if pd.isna(start) or pd.isna(end):
+        return "N/A"
+    delta = end - start
+    hours = delta.seconds // 3600
+    minutes = (delta.seconds % 3600) // 60
+    return (f"{delta.days}D, " if delta.days > 0 else "") + f"{hours:02d}h, {minutes:02d}m"
+
+
+class DashboardData:
+    """Τα δεδομένα των widgets για τα τρέχοντα φίλτρα, όλα με cache ανά συνδυασμό φίλτρων (DashboardViews)"""
+
+    def __init__(self, df, spec, selections, date_range):
+        self.df = df
+        self.log_type = spec["log_type"]
+        self.selections = selections
+        self.date_range = date_range
+        self.views = DashboardViews(df, selections, date_range, TIME_COLUMN)
+        self.dimensions = [column for column in summary_dimensions(spec) if column in df.columns]
+        self.preview = getattr(df, "attrs", {}).get("preview")
+
+    def summary(self):
+        return self.views.view("summary", lambda views: summarize(views.filtered(), self.dimensions))
+
+    def rollups(self):
+        rollups = get_rollups(self.df, self.log_type, lambda: self.df[TIME_COLUMN])
+        outside = [column for column in self.selections if column not in rollups.dimensions]
+        if not outside:
+            return rollups
+        # Φίλτρα σε στήλες εκτός των cubes (π.χ. PID, ports): rollups μόνο των γραμμών που περνάνε το FilterIndex
+        return self.views.view("rollups", lambda views: TimeRollups(
+            views.filtered(), lambda: views.filtered()[TIME_COLUMN], rollups.dimensions, applied=outside
+        ))
+
+    def scatter(self, chart):
+        """(σημεία, info) του bin_points για ένα scatter"""
+        return self.views.view(f"scatter:{chart['name']}", lambda views: scatter_points(views.filtered(), chart))
+
+    def bucket(self, chart):
+        """Η ανάλυση ενός χρονικού γραφήματος για το διάστημα που καλύπτουν τα φιλτραρισμένα logs"""
+        summary = self.summary()
+        return pick_bucket(summary["start"], summary["end"], chart.get("buckets", CHART_BUCKETS[chart["kind"]]))
+
+    def metric(self, metric):
+        summary = self.summary()
+        if metric.get("value") == "count":
+            return summary["rows"]
+        if metric.get("value") == "time_range":
+            return format_time_range(summary["start"], summary["end"])
+        column = metric["nunique"]
+        return summary["cube"][column].nunique() if column in summary["cube"].columns else "N/A"
+
+    def breakdown(self, column):
+        """[(τιμή, count)] για κάθε τιμή της στήλης, με τη σειρά πρώτης εμφάνισης"""
+        def build(views):
+            cube = self.summary()["cube"]
+            if column not in cube.columns:
+                return []
+            return list(cube.groupby(column, sort=False, observed=True)["Count"].sum().items())
+        return self.views.view(f"breakdown:{column}", build)
+
+    def counts(self, columns, as_str=(), upper=()):
+        """Counts ανά συνδυασμό τιμών των columns (ίδια με groupby(columns).size() στα φιλτραρισμένα logs)
+
+        Οι στήλες του as_str γίνονται strings και του upper κεφαλαία πριν την ομαδοποίηση.
+        """
+        def build(views):
+            cube = self.summary()["cube"]
+            keys = {}
+            for column in columns:
+                values = cube[column].astype(str) if column in as_str else cube[column]
+                keys[column] = values.str.upper() if column in upper else values
+            return cube.assign(**keys).groupby(list(columns), observed=True)["Count"].sum().reset_index()
+        return self.views.view(f"counts:{columns}:{as_str}:{upper}", build)
+
+    def top(self, column, n=TOP_N):
+        """Οι n συχνότερες τιμές της στήλης ως frame [column, Count] (όπως value_counts().nlargest(n))"""
+        def build(views):
+            counts = self.summary()["cube"].groupby(column, observed=True)["Count"].sum()
+            top = counts.sort_values(ascending=False).nlargest(n).reset_index()
+            top.columns = [column, "Count"]
+            return top
+        return self.views.view(f"top:{column}:{n}", build)
+
+
+class DatasetDashboardData(DashboardData):
+    """Το DashboardData για ParquetDataset: summary, rollups και scatter ως ερωτήματα στο DuckDB
+
+    Όλα τα υπόλοιπα (metrics, top-N, counts) προκύπτουν από το summary όπως και στη μνήμη, με το ίδιο cache
+    ανά συνδυασμό φίλτρων. Το views.filtered() δεν χρησιμοποιείται, αφού τα logs δεν φορτώνονται ποτέ.
+    """
+
+    def summary(self):
+        return self.views.view("summary", lambda views: self.df.summarize(self.selections, self.date_range, self.dimensions))
+
+    def rollups(self):
+        return self.df.rollups()
+
+    def scatter(self, chart):
+        def build(views):
+            return self.df.bin_points(
+                self.selections, self.date_range, x="datetime", y=chart["y"], color=chart["color"],
+                extra=chart.get("extra", []), melt=chart.get("melt")
+            )
+        return self.views.view(f"scatter:{chart['name']}", build)
+
+
+class PolarsDashboardData(DashboardData):
+    """Το DashboardData με τα βαριά βήματα (φίλτρα → summary, melt → scatter) ως lazy plans της polars
+
+    Η polars βελτιστοποιεί όλο το plan (π.χ. διαβάζει μόνο τις στήλες που χρειάζονται) και το εκτελεί
+    σε όλους τους πυρήνες. Τα αποτελέσματα επιστρέφουν ως pandas με τους τύπους του df, οπότε metrics,
+    top-N και counts βγαίνουν από τον ίδιο κώδικα. Τα rollups και οι τιμές των φίλτρων υπολογίζονται
+    μία φορά ανά dataset και μένουν στην pandas.
+    """
+
+    def __init__(self, df, spec, selections, date_range):
+        super().__init__(df, spec, selections, date_range)
+        self.columns = [TIME_COLUMN] + [column for column, _ in spec["filters"]] + self.dimensions + spec_columns(spec, "scatter")
+
+    def frame(self):
+        return to_polars(self.df, self.columns)
+
+    def summary(self):
+        return self.views.view("summary", lambda views: polars_summarize(self.frame(), self.df, self.selections, self.date_range, self.dimensions))
+
+    def scatter(self, chart):
+        def build(views):
+            return polars_bin_points(
+                self.frame(), self.df, self.selections, self.date_range, x="datetime", y=chart["y"], color=chart["color"],
+                extra=chart.get("extra", []), melt=chart.get("melt")
+            )
+        return self.views.view(f"scatter:{chart['name']}", build)
+
+
+DASHBOARD_BACKENDS = {
+    "pandas": DashboardData,
+    "polars": PolarsDashboardData
+}
+
+
+def spec_columns(spec, kind):
+    """Οι στήλες που διαβάζουν τα γραφήματα ενός είδους (π.χ. όλων των scatter)"""
+    columns = []
+    for row in spec["charts"]:
+        for chart in [row] if isinstance(row, dict) else row:
+            if chart["kind"] != kind:
+                continue
+            melt = chart.get("melt")
+            columns += list(melt["id_vars"]) + list(melt["value_vars"]) if melt else [chart["y"], chart["color"]] + list(chart.get("extra", []))
+    return columns
+
+
+def show_metrics(data, metrics, style=""):
+    """Τα widgets με τα νούμερα: ένα ανά metric και ένα ανά τιμή για τα breakdown (π.χ. ανά Level)"""
+    widgets = []
+    for metric in metrics:
+        if "breakdown" in metric:
+            colors = metric.get("colors", {})
+            for value, count in data.breakdown(metric["breakdown"]):
+                widgets.append((f"{value} Logs", estimate(count, data.preview), colors.get(value, DEFAULT_METRIC_COLOR)))
+        else:
+            # Οι διαφορετικές τιμές του δείγματος είναι μόνο κάτω όριο για όλο το log
+            widgets.append((metric["label"], estimate(data.metric(metric), data.preview, "nunique" in metric), None))
+
+    for column, (label, value, color) in zip(st.columns(len(widgets)), widgets):
+        with column:
+            st.caption(label)
+            css = "; ".join(([f"color:{color}"] if color else []) + ([style] if style else []))
+            st.markdown(f"<h2 style='{css}'>{value}</h2>" if css else f"<h2>{value}</h2>", unsafe_allow_html=True)
+
+
+def estimate(value, preview, lower_bound=False):
+    """Ένα νούμερο του δείγματος μιας προεπισκόπησης: count αναγμένο σε όλο το log (≈) ή κάτω όριο (≥)"""
+    if not preview or not isinstance(value, numbers.Integral):
+        return value
+    if preview["scale"] and not lower_bound:
+        return f"≈{round(value * preview['scale'])}"
+    return f"≥{value}"
+
+
+def preview_message(preview):
+    """Η σημείωση πάνω από ένα dashboard που δείχνει προεπισκόπηση"""
+    if preview["scale"]:
+        source = f"δείγμα {preview['sample_lines']:,} γραμμών από όλο το log (~{preview['estimated_lines']:,} γραμμές)"
+        marks = "τα νούμερα με ≈ είναι εκτιμήσεις για όλο το log και με ≥ κάτω όρια"
+    else:
+        source = f"δείγμα {preview['sample_lines']:,} γραμμών από την αρχή του log (συμπιεσμένο ή rotated)"
+        marks = "τα νούμερα με ≥ είναι κάτω όρια"
+    return (
+        f"🔎 Προεπισκόπηση από {source}: {marks}, ενώ τα γραφήματα δείχνουν τις γραμμές του δείγματος. "
+        "Τα πραγματικά αποτελέσματα εμφανίζονται μόλις τελειώσει το πλήρες parse."
+    )
+
+
+def render_chart(data, chart):
+    CHART_RENDERERS[chart["kind"]](data, chart)
+
+
+def render_timeline(data, chart):
+    """Line chart από τα rollups: counts ανά bucket (και ανά τιμή της στήλης by) στην ανάλυση του pick_bucket"""
+    rollups = data.rollups()
+    freq = data.bucket(chart)
+    by = chart.get("by")
+    series = data.views.view(
+        f"timeline:{chart['name']}",
+        lambda views: timeline_series(rollups, freq, data.selections, data.date_range, by, by in chart.get("upper", ()))
+    )
+
+    st.markdown(chart["title"].format(freq=ROLLUP_LABELS[freq]))
+    if by:
+        st.line_chart(data=series, x="datetime", y="Count", color="Log Level", use_container_width=True)
+    else:
+        st.line_chart(data=series, x="datetime", y="Count", use_container_width=True)
+
+
+def timeline_series(rollups, freq, selections, date_range, by=None, upper=False):
+    if by is None:
+        resampled = rollups.query(freq, selections, date_range).rename(columns={"bucket": "datetime"})
+        return downsample_series(resampled, "datetime", "Count")
+
+    df_rollup = rollups.query(freq, selections, date_range, by=[by])
+    if upper:
+        df_rollup[by] = df_rollup[by].astype(str).str.upper()
+    resampled = (
+        df_rollup.groupby(["bucket", by], observed=True)["Count"].sum()
+        .unstack(fill_value=0)
+        .reset_index()
+        .rename(columns={"bucket": "datetime"})
+    )
+    # Long format για το line chart (μία γραμμή ανά τιμή του by)
+    df_long = resampled.melt(id_vars="datetime", var_name="Log Level", value_name="Count")
+    return downsample_series(df_long, "datetime", "Count", by="Log Level")
+
+
+def render_top(data, chart):
+    """Οριζόντιο ραβδόγραμμα με τις TOP_N συχνότερες τιμές μιας στήλης"""
+    column = chart["column"]
+    st.markdown(chart["title"])
+    if column not in data.df.columns:
+        return
+    top = data.top(column, chart.get("n", TOP_N))
+    bars = alt.Chart(top).mark_bar().encode(
+        x=alt.X("Count:Q", title="Συχνότητα"),
+        y=alt.Y(f"{column}:N", sort="-x", title=chart.get("axis_title", column)),
+        tooltip=[f"{column}:N", "Count:Q"],
+        color=alt.value("#4C78A8")
+    ).properties(width=700, height=400)
+    st.altair_chart(bars, use_container_width=True)
+
+
+def render_bar(data, chart):
+    """Ομαδοποιημένο ραβδόγραμμα: counts ανά τιμή του y, χρωματισμένα ανά τιμή του color"""
+    y, color = chart["y"], chart["color"]
+    st.markdown(chart["title"])
+    if y not in data.df.columns or color not in data.df.columns:
+        return
+    bar_df = data.counts((y, color), as_str=tuple(chart.get("as_str", ())))
+    colors = chart.get("colors")
+    scale = alt.Scale(domain=list(colors), range=list(colors.values())) if colors else alt.Undefined
+    bars = alt.Chart(bar_df).mark_bar().encode(
+        x=alt.X("Count:Q", title=chart.get("x_title", "Αριθμός Εμφανίσεων")),
+        y=alt.Y(f"{y}:N", sort="-x", title=chart.get("y_title", y)),
+        color=alt.Color(f"{color}:N", title=chart.get("color_title", color), scale=scale),
+        tooltip=[color, y, "Count"]
+    ).properties(width=800, height=400)
+    st.altair_chart(bars, use_container_width=True)
+
+
+def render_heatmap(data, chart):
+    """Heatmap με counts ανά συνδυασμό τιμών δύο στηλών"""
+    x, y = chart["x"], chart["y"]
+    st.markdown(chart["title"])
+    if x not in data.df.columns or y not in data.df.columns:
+        return
+    heatmap_df = data.counts((y, x), upper=tuple(chart.get("upper", ())))
+    heatmap = alt.Chart(heatmap_df).mark_rect().encode(
+        x=alt.X(f"{x}:N"),
+        y=alt.Y(f"{y}:N"),
+        color=alt.Color("Count:Q", scale=alt.Scale(scheme="viridis")),
+        tooltip=[f"{y}:N", f"{x}:N", "Count:Q"]
+    ).properties(width=chart.get("width", 700), height=400)
+    st.altair_chart(heatmap, use_container_width=True)
+
+
+def render_density(data, chart):
+    """Density heatmap χρόνου × τιμών μιας στήλης, από τα rollups (με budget σημείων)"""
+    y = chart["y"]
+    rollups = data.rollups()
+    freq = data.bucket(chart)
+    df_heatmap = data.views.view(f"density:{chart['name']}", lambda views: density_points(rollups, freq, data.selections, data.date_range, y))
+
+    st.markdown(chart["title"])
+    fig = px.density_heatmap(
+        df_heatmap,
+        x="datetime",
+        y=y,
+        z="Count",
+        nbinsx=100,  # προσαρμόζεται ανάλογα με το πλήθος των logs
+        color_continuous_scale="Viridis",
+        labels={"datetime": "Χρόνος", y: y, "Count": "Logs"},
+    )
+    fig.update_layout(
+        xaxis_title="Χρόνος",
+        yaxis_title=y,
+        xaxis_tickformat="%d-%m %H:%M",
+        autosize=True,
+        height=500
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def density_points(rollups, freq, selections, date_range, y):
+    df_heatmap = rollups.query(freq, selections, date_range, by=[y]).rename(columns={"bucket": "datetime"})
+    df_heatmap, _ = bin_points(df_heatmap, x="datetime", y=y, weight="Count", budget=DENSITY_POINT_BUDGET, max_categories=None)
+    return df_heatmap
+
+
+def render_top_timeline(data, chart):
+    """Stacked bars ανά χρονικό bucket για τις n συχνότερες τιμές μιας στήλης (οι υπόλοιπες ως "Άλλο")"""
+    column = chart["column"]
+    st.markdown(chart["title"])
+    freq = data.bucket(chart)
+    top_values = data.top(column, chart.get("n", TOP_N))[column].tolist()
+    rollups = data.rollups()
+    grouped = data.views.view(
+        f"top_timeline:{chart['name']}",
+        lambda views: top_timeline_counts(rollups, freq, data.selections, data.date_range, column, top_values)
+    )
+
+    stacked = alt.Chart(grouped).mark_bar().encode(
+        x=alt.X("datetime_grouped:T", title=f"Χρόνος (ανά {ROLLUP_LABELS[freq]})"),
+        y=alt.Y("Count:Q", title="Αριθμός Logs"),
+        color=alt.Color(f"{column}_TopN:N", title=column),
+        tooltip=["datetime_grouped:T", f"{column}_TopN:N", "Count:Q"]
+    ).properties(width=800, height=400)
+    st.altair_chart(stacked, use_container_width=True)
+
+
+def top_timeline_counts(rollups, freq, selections, date_range, column, top_values):
+    # Τα counts ανά bucket και τιμή προκύπτουν από το rollup που διαιρεί ακριβώς το freq
+    grouped = rollups.query(freq, selections, date_range, by=[column])
+    grouped[f"{column}_TopN"] = grouped[column].astype(str).where(grouped[column].isin(top_values), "Άλλο")
+    return (
+        grouped.groupby(["bucket", f"{column}_TopN"])["Count"].sum()
+        .reset_index()
+        .rename(columns={"bucket": "datetime_grouped"})
+    )
+
+
+def render_scatter(data, chart):
+    """Scatter χρόνου × τιμών μιας στήλης, με ένα σημείο ανά (χρονικό bin, τιμή, color) μέσα στο budget σημείων"""
+    y, color = chart["y"], chart["color"]
+    melt = chart.get("melt")
+    required = set(melt["id_vars"]) | set(melt["value_vars"]) if melt else {y}
+    st.markdown(chart["title"])
+    if not required.issubset(data.df.columns):
+        if chart.get("missing_message"):
+            st.info(chart["missing_message"])
+        return
+
+    points, reduction = data.scatter(chart)
+    caption = describe_reduction(reduction, chart["what"])
+    if caption:
+        st.caption(caption)
+
+    size = chart.get("point_size", 60)
+    point_size = alt.Size("Count:Q", scale=alt.Scale(range=[size, 400]), legend=None) if points["Count"].max() > 1 else alt.value(size)
+    titles = chart.get("tooltip_titles", {})
+    fields = [("datetime", "T"), (y, "N")] + [(column, "N") for column in chart.get("extra", [])] + [(color, "N"), ("Count", "Q")]
+    scatter = alt.Chart(points).mark_circle(opacity=chart.get("opacity", alt.Undefined)).encode(
+        x=alt.X("datetime:T", title="Χρόνος"),
+        y=alt.Y(f"{y}:N", title=chart.get("y_title", y)),
+        color=alt.Color(f"{color}:N", title=chart.get("color_title", alt.Undefined)),
+        size=point_size,
+        tooltip=[alt.Tooltip(f"{field}:{kind}", title=titles[field]) if field in titles else f"{field}:{kind}" for field, kind in fields]
+    ).properties(width=800, height=chart.get("height", 400))
+    st.altair_chart(scatter, use_container_width=True)
+
+
+def scatter_points(filtered_df, chart):
+    source = filtered_df
+    if chart.get("melt"):
+        # Long format (π.χ. SrcIP/DstIP σε κοινή στήλη IP_Address)
+        source = pd.melt(filtered_df, **chart["melt"])
+    return bin_points(source, x="datetime", y=chart["y"], color=chart["color"], extra=chart.get("extra", []))
+
+
+CHART_RENDERERS = {
+    "timeline": render_timeline,
+    "top": render_top,
+    "bar": render_bar,
+    "heatmap": render_heatmap,
+    "density": render_density,
+    "top_timeline": render_top_timeline,
+    "scatter": render_scatter
+}
@@ -0,0 +1,283 @@
+import os
+import glob
+import time
+import pandas as pd
+from log_schema import apply_schema
+from log_timestamps import normalize_timestamps
+from log_perf import stage, timed
+from log_downsample import TIME_BIN_LADDER, SCATTER_POINT_BUDGET, MAX_CATEGORIES
+
+
+TIME_COLUMN = "datetime"
+STRUCTURED_DIR = "structured"
+TEMPLATES_DIR = "templates"
+# Φάκελοι log_type=<τύπος>/day=<YYYY-MM-DD> (hive partitioning). Όχι "date": το DuckDB δεν ξεχωρίζει
+# κεφαλαία-πεζά στα ονόματα των στηλών και τα logs έχουν ήδη στήλη Date
+PARTITION_COLUMNS = ["log_type", "day"]
+ROW_GROUP_SIZE = 128 * 1024  # Γραμμές ανά row group (μονάδα ανάγνωσης και pruning με τα min/max της στήλης)
+PREVIEW_ROWS = 1000  # Γραμμές του πίνακα "Structured Logs" όταν τα δεδομένα μένουν στο δίσκο
+
+# Η σειρά των γραμμών στο dataset: ημέρα, σειρά εγγραφής του αρχείου και θέση μέσα στο αρχείο
+ROW_ORDER = "(file_index::BIGINT << 40) + file_row_number"
+
+
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError:
+        raise ValueError("Για τα out-of-core datasets χρειάζεται το πακέτο duckdb (pip install duckdb)")
+    return duckdb
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as pds
+    except ImportError:
+        raise ValueError("Για την εγγραφή out-of-core datasets χρειάζεται το πακέτο pyarrow (pip install pyarrow)")
+    return pa, pc, pds
+
+
+def _interval(freq):
+    """Η διάρκεια ενός bucket σε δευτερόλεπτα (για το time_bucket του DuckDB)"""
+    return pd.Timedelta(freq).total_seconds()
+
+
+def _bucket(column, freq):
+    # Με origin το epoch τα buckets συμπίπτουν με το .dt.floor(freq) της pandas (και για τις εβδομάδες)
+    return f"time_bucket(to_seconds({_interval(freq)}), {column}, TIMESTAMP '1970-01-01')" if freq else column
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+@timed("Dataset write", "io")
+def write_dataset(df_structured, df_templates, root, log_type):
+    """Προσθήκη ενός parse στο dataset του root: Parquet ανά τύπο log και ημέρα (hive partitioning)
+
+    Κάθε εγγραφή γράφει νέα αρχεία (τα υπάρχοντα μένουν), οπότε π.χ. τα αρχεία ενός μήνα
+    προστίθενται ένα-ένα χωρίς να χρειαστεί ποτέ όλος ο μήνας στη μνήμη. Τα templates
+    συγχωνεύονται με όσα υπάρχουν ήδη για τον τύπο log (αθροίζοντας τα Occurrences).
+    Επιστρέφει το πλήθος των γραμμών που γράφτηκαν.
+    """
+    pa, pc, pds = _pyarrow()
+
+    if df_structured is None or df_structured.empty:
+        return 0
+    if TIME_COLUMN not in df_structured.columns:
+        df_structured = normalize_timestamps(apply_schema(df_structured, log_type), log_type)
+    if TIME_COLUMN not in df_structured.columns:
+        raise ValueError(f"Δεν βρέθηκαν timestamps για το partitioning ανά ημέρα ({log_type})")
+
+    table = pa.Table.from_pandas(df_structured, preserve_index=False)
+    table = table.set_column(table.schema.get_field_index(TIME_COLUMN), TIME_COLUMN, pc.cast(table[TIME_COLUMN], pa.timestamp("us")))
+    table = table.append_column("log_type", pa.array([log_type] * len(table), pa.string()))
+    table = table.append_column("day", pc.cast(table[TIME_COLUMN], pa.date32()))
+
+    # Τα ονόματα των αρχείων ταξινομούνται με τη σειρά εγγραφής (βλ. ROW_ORDER)
+    pds.write_dataset(
+        table,
+        os.path.join(root, STRUCTURED_DIR),
+        format="parquet",
+        partitioning=pds.partitioning(pa.schema([("log_type", pa.string()), ("day", pa.date32())]), flavor="hive"),
+        basename_template=f"part-{time.time_ns()}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_group=ROW_GROUP_SIZE,
+        min_rows_per_group=min(ROW_GROUP_SIZE, len(table))
+    )
+
+    if df_templates is not None and not df_templates.empty:
+        templates_path = os.path.join(root, TEMPLATES_DIR, f"log_type={log_type}", "templates.parquet")
+        if os.path.exists(templates_path):
+            df_templates = merge_templates(pd.read_parquet(templates_path), df_templates)
+        os.makedirs(os.path.dirname(templates_path), exist_ok=True)
+        df_templates.to_parquet(templates_path, index=False)
+    return len(table)
+
+
+def merge_templates(existing, new):
+    """Τα templates δύο parse σε έναν πίνακα (τα Occurrences αθροίζονται ανά template)"""
+    merged = pd.concat([existing, new], ignore_index=True)
+    keys = [column for column in ("EventId", "EventTemplate") if column in merged.columns]
+    if not keys or "Occurrences" not in merged.columns:
+        return merged.drop_duplicates(ignore_index=True)
+    return merged.groupby(keys, sort=False, dropna=False)["Occurrences"].sum().reset_index()
+
+
+class ParquetDataset:
+    """Ένα dataset του write_dataset για έναν τύπο log, με ερωτήματα στο DuckDB αντί για DataFrame στη μνήμη
+
+    Τα φίλτρα του dashboard γίνονται WHERE: οι ημερομηνίες κόβουν ολόκληρους φακέλους (partitions), οι τιμές
+    των στηλών εφαρμόζονται στο scan των Parquet (με τα min/max κάθε row group), και διαβάζονται μόνο οι
+    στήλες που χρειάζεται κάθε ερώτημα. Τα φίλτρα έχουν την ίδια σημασιολογία με το FilterIndex:
+    οι γραμμές με κενή τιμή ή χωρίς ημερομηνία δεν περνάνε ποτέ.
+    """
+
+    def __init__(self, root, log_type):
+        duckdb = _duckdb()
+        self.root = root
+        self.log_type = log_type
+        pattern = os.path.join(root, STRUCTURED_DIR, f"log_type={log_type}", "*", "*.parquet")
+        if not glob.glob(pattern):
+            raise FileNotFoundError(f"Δεν υπάρχουν δεδομένα {log_type} στο dataset {root}")
+        self.source = f"read_parquet('{pattern.replace(chr(39), chr(39) * 2)}', hive_partitioning = true, union_by_name = true)"
+        self.connection = duckdb.connect()
+        schema = self.connection.execute(f"DESCRIBE SELECT * FROM {self.source}").fetchall()
+        self.columns = [row[0] for row in schema if row[0] not in PARTITION_COLUMNS]
+        # Στιγμιότυπο: ό,τι γραφτεί αργότερα φαίνεται με νέο ParquetDataset
+        self.n_rows = self.connection.execute(f"SELECT count(*) FROM {self.source}").fetchone()[0]
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def empty(self):
+        return self.n_rows == 0
+
+    def query(self, label, sql, params=()):
+        """Εκτέλεση ενός ερωτήματος (ο πίνακας ως {source}) σε δικό του cursor, ώστε να τρέχει από οποιοδήποτε thread"""
+        with stage(f"DuckDB: {label}", "query") as span:
+            result = self.connection.cursor().execute(sql.format(source=self.source), list(params)).df()
+            span["lines"] = len(result)
+        return result
+
+    def filter_options(self, columns):
+        """Όπως το filter_options του dashboard: τιμές κάθε στήλης με τη σειρά εμφάνισης και εύρος ημερομηνιών"""
+        options = {}
+        for column in columns:
+            values = self.query(
+                f"τιμές {column}",
+                f"SELECT {_quote(column)} AS value FROM {{source}} WHERE {_quote(column)} IS NOT NULL GROUP BY 1 ORDER BY min({ROW_ORDER})"
+            )
+            options[column] = values["value"].tolist()
+        dates = self.query("εύρος ημερομηνιών", "SELECT min(day) AS start, max(day) AS end FROM {source}")
+        start, end = dates["start"].iloc[0], dates["end"].iloc[0]
+        return options, (None if pd.isna(start) else pd.Timestamp(start).date()), (None if pd.isna(end) else pd.Timestamp(end).date())
+
+    def where(self, selections, date_range):
+        """Το WHERE (και οι παράμετροί του) για τα φίλτρα, όπως το FilterIndex.mask (date_range=None: χωρίς φίλτρο ημερομηνίας)"""
+        clauses, params = [], []
+        if date_range is not None:
+            clauses.append("day BETWEEN ? AND ?")
+            params.extend([pd.Timestamp(date_range[0]).date(), pd.Timestamp(date_range[1]).date()])
+        for column, values in selections.items():
+            clauses.append(f"{_quote(column)} IN (SELECT unnest(?))")
+            params.append(list(values))
+        return " AND ".join(clauses) or "TRUE", params
+
+    def summarize(self, selections, date_range, dimensions):
+        """Όπως το summarize του dashboard, με ένα GROUP BY στα φιλτραρισμένα logs"""
+        where, params = self.where(selections, date_range)
+        keys = ", ".join(_quote(column) for column in dimensions)
+        grouped = self.query("summary", (
+            f"SELECT {keys + ', ' if keys else ''}count(*) AS Count, min({TIME_COLUMN}) AS _start, max({TIME_COLUMN}) AS _end "
+            f"FROM {{source}} WHERE {where}" + (f" GROUP BY ALL ORDER BY min({ROW_ORDER})" if keys else "")
+        ), params)
+        cube = grouped.drop(columns=["_start", "_end"])
+        return {"rows": int(cube["Count"].sum()), "cube": cube, "start": grouped["_start"].min(), "end": grouped["_end"].max()}
+
+    def rollups(self):
+        return DatasetRollups(self)
+
+    def bin_points(self, selections, date_range, x, y, color=None, extra=(), melt=None, budget=SCATTER_POINT_BUDGET, max_categories=MAX_CATEGORIES):
+        """Όπως το log_downsample.bin_points πάνω στα φιλτραρισμένα logs, με όλη τη δουλειά στο DuckDB
+
+        Με melt (όπως στο pd.melt) οι στήλες value_vars γίνονται μία στήλη (UNPIVOT). Στη μνήμη
+        έρχονται μόνο τα σημεία του γραφήματος (το πολύ budget).
+        """
+        where, params = self.where(selections, date_range)
+        keys = [y] + ([color] if color else [])
+        if melt:
+            # Η σειρά του pd.melt: πρώτα όλες οι γραμμές του πρώτου value_var, μετά του δεύτερου κλπ
+            value_vars = list(melt["value_vars"])
+            columns = ", ".join(_quote(column) for column in list(melt["id_vars"]) + value_vars)
+            source = (
+                f"SELECT * EXCLUDE (_order), list_position(?, {_quote(melt['var_name'])}) * (1::BIGINT << 60) + _order AS _order FROM ("
+                f"UNPIVOT (SELECT {columns}, {ROW_ORDER} AS _order FROM {{source}} WHERE {where}) "
+                f"ON {', '.join(_quote(column) for column in value_vars)} "
+                f"INTO NAME {_quote(melt['var_name'])} VALUE {_quote(melt['value_name'])})"
+            )
+            params = [value_vars] + params
+        else:
+            columns = ", ".join(_quote(column) for column in dict.fromkeys([x] + keys + list(extra)))
+            source = f"SELECT {columns}, {ROW_ORDER} AS _order FROM {{source}} WHERE {where}"
+        data = f"(SELECT * FROM ({source}) WHERE {_quote(x)} IS NOT NULL AND {_quote(y)} IS NOT NULL)"
+
+        rows = int(self.query("scatter: γραμμές", f"SELECT count(*) AS n FROM {data}", params)["n"].iloc[0])
+        info = {"rows": rows, "points": 0, "bin": None, "categories": max_categories, "categories_dropped": 0, "cells_dropped": 0}
+
+        # Αν οι γραμμές δεν χωράνε στο budget, στον άξονα y κρατάμε μόνο τις πιο συχνές κατηγορίες
+        if max_categories is not None and rows > budget:
+            totals = self.query(
+                "scatter: κατηγορίες",
+                f"SELECT {_quote(y)} AS value, count(*) AS n FROM {data} GROUP BY 1 ORDER BY n DESC, min(_order)",
+                params
+            )
+            if len(totals) > max_categories:
+                data = f"(SELECT * FROM {data} WHERE {_quote(y)} IN (SELECT unnest(?)))"
+                params = params + [totals["value"].iloc[:max_categories].tolist()]
+                info["categories_dropped"] = len(totals) - max_categories
+
+        # Οι γραμμές με κενό color δεν γίνονται σημεία (όπως στο groupby)
+        cells = f"(SELECT * FROM {data} WHERE {' AND '.join(f'{_quote(key)} IS NOT NULL' for key in keys)})"
+
+        # Binary search στη σκάλα (τα κελιά μειώνονται όσο μεγαλώνει το bin)
+        group = ", ".join(_quote(key) for key in keys)
+        lo, hi = 0, len(TIME_BIN_LADDER) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            count = self.query(
+                f"scatter: κελιά ανά {TIME_BIN_LADDER[mid] or 'timestamp'}",
+                f"SELECT count(*) AS n FROM (SELECT DISTINCT {_bucket(_quote(x), TIME_BIN_LADDER[mid])}, {group} FROM {cells})",
+                params
+            )["n"].iloc[0]
+            if count <= budget:
+                hi = mid
+            else:
+                lo = mid + 1
+        width = TIME_BIN_LADDER[lo]
+        info["bin"] = width
+
+        firsts = "".join(f", any_value({_quote(column)} ORDER BY _order) AS {_quote(column)}" for column in extra if column not in keys)
+        # Αν ούτε το πιο αδρό bin χωράει, κρατάμε τα κελιά με τις περισσότερες γραμμές
+        points = self.query("scatter: σημεία", (
+            f"SELECT * FROM (SELECT {_bucket(_quote(x), width)} AS {_quote(x)}, {group}, count(*) AS Count{firsts} "
+            f"FROM {cells} GROUP BY ALL ORDER BY Count DESC, 1, {group} LIMIT {int(budget) + 1}) ORDER BY 1, {group}"
+        ), params)
+        if len(points) > budget:
+            total = int(self.query("scatter: πλήθος κελιών", f"SELECT count(*) AS n FROM (SELECT DISTINCT {_bucket(_quote(x), width)}, {group} FROM {cells})", params)["n"].iloc[0])
+            info["cells_dropped"] = total - budget
+            points = points.nlargest(budget, "Count").sort_values(x)
+        points = points.reset_index(drop=True)
+
+        info["points"] = len(points)
+        return points, info
+
+    def head(self, n=PREVIEW_ROWS):
+        """Οι πρώτες n γραμμές (για τον πίνακα Structured Logs)"""
+        return self.query("προεπισκόπηση", f"SELECT * EXCLUDE (log_type, day) FROM {{source}} ORDER BY {ROW_ORDER} LIMIT {int(n)}")
+
+    def templates(self):
+        path = os.path.join(self.root, TEMPLATES_DIR, f"log_type={self.log_type}", "templates.parquet")
+        return pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+
+
+class DatasetRollups:
+    """Ίδια διεπαφή με το TimeRollups, με GROUP BY ανά bucket στο DuckDB αντί για προϋπολογισμένα cubes"""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def query(self, freq, selections, date_range, by=()):
+        """Counts ανά bucket (και ανά στήλες by) για τα επιλεγμένα φίλτρα (οι κενές τιμές του by μένουν εκτός)"""
+        where, params = self.dataset.where(selections, date_range)
+        by = [_quote(column) for column in by]
+        not_null = "".join(f" AND {column} IS NOT NULL" for column in by)
+        result = self.dataset.query(f"rollup ανά {freq}", (
+            f"SELECT {_bucket(TIME_COLUMN, freq)} AS bucket{''.join(', ' + column for column in by)}, count(*) AS Count "
+            f"FROM {{source}} WHERE {where} AND {TIME_COLUMN} IS NOT NULL{not_null} GROUP BY ALL ORDER BY ALL"
+        ), params)
+        result["bucket"] = result["bucket"].astype("datetime64[ns]")
+        return result
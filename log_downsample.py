@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+
+# Μέγιστο πλήθος γραμμών που στέλνεται στο frontend ανά γράφημα (το Altair σταματάει στις 5000 by default)
+SCATTER_POINT_BUDGET = 5000
+LINE_POINT_BUDGET = 5000
+DENSITY_POINT_BUDGET = 5000
+MAX_CATEGORIES = 100  # Μέγιστο πλήθος κατηγοριών (π.χ. PIDs, IPs) στον άξονα y ενός scatter
+
+# Πλάτη χρονικών bins από το λεπτότερο στο πιο αδρό (None = χωρίς binning)
+TIME_BIN_LADDER = [None, "1s", "5s", "15s", "30s", "1min", "5min", "15min", "30min",
+                   "1h", "3h", "6h", "12h", "1D", "7D"]
+
+
+def bin_points(df, x, y, color=None, weight=None, extra=(), budget=SCATTER_POINT_BUDGET, max_categories=MAX_CATEGORIES):
+    """2-D binning για point clouds: χρονικά bins στον x (datetime) × τιμές του y (και του color)
+
+    Κάθε κελί γίνεται ένα σημείο με στήλη Count (πλήθος γραμμών ή άθροισμα του weight). Επιλέγεται
+    το λεπτότερο bin που χωράει στο budget, ενώ οι στήλες του extra κρατούν την πρώτη τιμή του κελιού.
+    Επιστρέφει (points, info) με info = {"rows", "points", "bin", "categories", "categories_dropped", "cells_dropped"}.
+    """
+    keys = [y] + ([color] if color else [])
+    columns = list(dict.fromkeys([x] + keys + list(extra) + ([weight] if weight else [])))
+    data = df[columns].dropna(subset=[x, y])
+    info = {"rows": len(data), "points": 0, "bin": None, "categories": max_categories, "categories_dropped": 0, "cells_dropped": 0}
+
+    # Αν οι γραμμές δεν χωράνε στο budget, στον άξονα y κρατάμε μόνο τις πιο συχνές κατηγορίες
+    if max_categories is not None and len(data) > budget:
+        totals = data.groupby(y, observed=True)[weight].sum() if weight else data[y].value_counts()
+        if len(totals) > max_categories:
+            data = data[data[y].isin(totals.nlargest(max_categories).index)]
+            info["categories_dropped"] = len(totals) - max_categories
+
+    # Binary search στη σκάλα (τα κελιά μειώνονται όσο μεγαλώνει το bin)
+    lo, hi = 0, len(TIME_BIN_LADDER) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _cell_count(data, x, keys, TIME_BIN_LADDER[mid]) <= budget:
+            hi = mid
+        else:
+            lo = mid + 1
+    width = TIME_BIN_LADDER[lo]
+    info["bin"] = width
+
+    binned = data.assign(**{x: data[x].dt.floor(width)}) if width else data
+    aggregations = {"Count": (weight, "sum") if weight else (x, "size")}
+    aggregations.update({column: (column, "first") for column in extra if column not in keys})
+    points = binned.groupby([x] + keys, observed=True).agg(**aggregations).reset_index()
+
+    # Αν ούτε το πιο αδρό bin χωράει, κρατάμε τα κελιά με τις περισσότερες γραμμές
+    if len(points) > budget:
+        info["cells_dropped"] = len(points) - budget
+        points = points.nlargest(budget, "Count").sort_values(x)
+
+    info["points"] = len(points)
+    return points, info
+
+
+def _cell_count(data, x, keys, width):
+    bins = data[x].dt.floor(width) if width else data[x]
+    return data.groupby([bins] + keys, observed=True).ngroups
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: δείκτες των threshold σημείων που διατηρούν το σχήμα της σειράς"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    bucket_size = (n - 2) / (threshold - 2)
+    sampled = np.empty(threshold, dtype=np.int64)
+    sampled[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        # Μέσος όρος του επόμενου bucket (για το τελευταίο, το τελευταίο σημείο)
+        avg_start = int((i + 1) * bucket_size) + 1
+        avg_end = min(int((i + 2) * bucket_size) + 1, n)
+        if avg_start >= avg_end:
+            avg_start, avg_end = n - 1, n
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        # Το σημείο του τρέχοντος bucket με το μεγαλύτερο τρίγωνο με το προηγούμενο επιλεγμένο και τον μέσο όρο
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        sampled[i + 1] = a
+    sampled[-1] = n - 1
+    return sampled
+
+
+def downsample_series(df, x, y, by=None, budget=LINE_POINT_BUDGET):
+    """LTTB ανά χρονοσειρά (ανά τιμή του by) ώστε το σύνολο των σημείων να μένει μέσα στο budget"""
+    if len(df) <= budget:
+        return df
+    groups = [(None, df)] if by is None else list(df.groupby(by, observed=True, sort=False))
+    per_series = max(budget // max(len(groups), 1), 3)
+
+    parts = []
+    for _, series in groups:
+        series = series.sort_values(x)
+        xs = series[x].to_numpy(dtype="datetime64[ns]").astype(np.int64) if pd.api.types.is_datetime64_any_dtype(series[x]) else series[x].to_numpy()
+        parts.append(series.iloc[lttb(xs, series[y].to_numpy(dtype=float), per_series)])
+    return pd.concat(parts, ignore_index=True)
+
+
+def describe_reduction(info, category_label):
+    """Σύντομη περιγραφή της μείωσης για st.caption (None αν στάλθηκαν όλες οι γραμμές)"""
+    if info["bin"] is None and not info["categories_dropped"] and not info["cells_dropped"]:
+        return None
+    parts = [f"{info['rows']:,} γραμμές → {info['points']:,} σημεία"]
+    if info["bin"]:
+        parts.append(f"ομαδοποίηση ανά {info['bin']}")
+    if info["categories_dropped"]:
+        parts.append(f"μόνο τα {info['categories']} πιο συχνά {category_label}")
+    if info["cells_dropped"]:
+        parts.append(f"{info['cells_dropped']:,} σπάνια κελιά εκτός")
+    return "ℹ️ " + ", ".join(parts)
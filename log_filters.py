@@ -0,0 +1,147 @@
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from log_perf import timed
+from log_schema import drop_unused_categories
+
+
+VIEW_CACHE_SIZE = 16  # Πόσοι συνδυασμοί φίλτρων κρατιούνται ανά γράφημα
+
+
+class FilterIndex:
+    """Index για τα φίλτρα του dashboard: ταξινομημένα row ids ανά τιμή στήλης και ταξινομημένες ημέρες
+
+    Η επιλογή γραμμών γίνεται με συνένωση των row ids των επιλεγμένων τιμών και
+    binary search στο εύρος ημερομηνιών, με την ίδια σημασιολογία με τα .isin():
+    οι γραμμές με κενή τιμή δεν περνάνε ποτέ το φίλτρο, ούτε με την επιλογή "ALL".
+    """
+
+    def __init__(self, df, columns, time_values):
+        self.n_rows = len(df)
+        self.columns = {}
+        for column in columns:
+            codes, uniques = pd.factorize(df[column])
+            order = np.argsort(codes, kind="stable")
+            valid = codes >= 0
+            counts = np.bincount(codes[valid], minlength=len(uniques))
+            starts = int((~valid).sum()) + np.concatenate([[0], np.cumsum(counts)])
+            lookup = {value: code for code, value in enumerate(uniques)}
+            self.columns[column] = (lookup, order, starts, valid)
+
+        # Ημέρες από το epoch (οι γραμμές χωρίς ημερομηνία μένουν εκτός)
+        if callable(time_values):
+            time_values = time_values()
+        times = pd.to_datetime(pd.Series(time_values), errors="coerce")
+        has_time = times.notna().to_numpy()
+        days = times.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+        timed_rows = np.flatnonzero(has_time)
+        day_order = np.argsort(days[timed_rows], kind="stable")
+        self.time_rows = timed_rows[day_order]
+        self.sorted_days = days[timed_rows][day_order]
+
+    def column_mask(self, column, values):
+        """Μάσκα γραμμών όπου η στήλη έχει μία από τις τιμές (όπως το .isin())"""
+        lookup, order, starts, valid = self.columns[column]
+        codes = {lookup[value] for value in values if value in lookup}
+        if len(codes) == len(lookup):
+            return valid  # Όλες οι τιμές ("ALL")
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for code in codes:
+            mask[order[starts[code]:starts[code + 1]]] = True
+        return mask
+
+    def date_mask(self, start_date, end_date):
+        """Μάσκα γραμμών με ημερομηνία στο κλειστό διάστημα [start_date, end_date]"""
+        start_day = np.datetime64(start_date, "D").astype(np.int64)
+        end_day = np.datetime64(end_date, "D").astype(np.int64)
+        lo = np.searchsorted(self.sorted_days, start_day, side="left")
+        hi = np.searchsorted(self.sorted_days, end_day, side="right")
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.time_rows[lo:hi]] = True
+        return mask
+
+    def mask(self, selections, date_range):
+        """Συνδυασμός (AND) όλων των φίλτρων: selections = {στήλη: επιλεγμένες τιμές}"""
+        mask = self.date_mask(date_range[0], date_range[1])
+        for column, values in selections.items():
+            mask &= self.column_mask(column, values)
+        return mask
+
+
+_dataset_cache = {}
+
+
+def cached_for_dataset(df, name, signature, build):
+    """Κρατάει ένα παράγωγο αντικείμενο (index, rollups κλπ) ανά frame μέχρι να αλλάξει το frame"""
+    key = (id(df), name)
+    entry = _dataset_cache.get(key)
+    if entry is not None:
+        ref, n_rows, cached_signature, value = entry
+        if ref() is df and n_rows == len(df) and cached_signature == signature:
+            return value
+
+    value = build()
+    _dataset_cache[key] = (weakref.ref(df, lambda _: _dataset_cache.pop(key, None)), len(df), signature, value)
+    return value
+
+
+@timed("Filter index", "filters", lines=None)
+def get_filter_index(df, columns, time_values):
+    """Επιστρέφει το FilterIndex του frame, χτίζοντάς το μόνο την πρώτη φορά για κάθε dataset
+
+    Το time_values μπορεί να είναι callable ώστε να υπολογίζεται μόνο όταν χτίζεται το index.
+    """
+    return cached_for_dataset(df, "filter_index", tuple(columns), lambda: FilterIndex(df, columns, time_values))
+
+
+def selection_key(selections, date_range):
+    """Hashable κλειδί για την κατάσταση των φίλτρων (η σειρά των επιλογών δεν μετράει)"""
+    return (
+        tuple((column, frozenset(values)) for column, values in selections.items()),
+        tuple(str(day) for day in date_range)
+    )
+
+
+def cached_view(df, name, key, build):
+    """Το αποτέλεσμα του build() για το frame και το key, με LRU των VIEW_CACHE_SIZE τελευταίων keys"""
+    views = cached_for_dataset(df, "view:" + name, None, OrderedDict)
+    if key in views:
+        views.move_to_end(key)
+        return views[key]
+    value = build()
+    views[key] = value
+    if len(views) > VIEW_CACHE_SIZE:
+        views.popitem(last=False)
+    return value
+
+
+class DashboardViews:
+    """Τα δεδομένα των γραφημάτων ενός dashboard για μία κατάσταση των φίλτρων
+
+    Κάθε γράφημα είναι ξεχωριστή μονάδα που εξαρτάται μόνο από το dataset και τα φίλτρα: υπολογίζεται
+    μία φορά ανά συνδυασμό τους, και το φιλτραρισμένο frame χτίζεται μόνο αν κάποιο γράφημα δεν είναι
+    ήδη στο cache (π.χ. όταν ο χρήστης επιστρέφει σε προηγούμενη επιλογή).
+    """
+
+    def __init__(self, df, selections, date_range, time_column="datetime"):
+        self.df = df
+        self.selections = selections
+        self.date_range = date_range
+        self.time_column = time_column
+        self.key = selection_key(selections, date_range)
+        self._filtered = None
+
+    def filtered(self):
+        """Το φιλτραρισμένο frame, χωρίς τις κατηγορίες που δεν εμφανίζονται σε αυτό"""
+        if self._filtered is None:
+            index = get_filter_index(self.df, list(self.selections), lambda: self.df[self.time_column])
+            self._filtered = drop_unused_categories(self.df[index.mask(self.selections, self.date_range)])
+        return self._filtered
+
+    def view(self, name, build):
+        """Το build(self) από το cache για τα τρέχοντα φίλτρα ή υπολογισμένο τώρα
+
+        Το build δεν πρέπει να αλλάζει το filtered() ή το αποτέλεσμά του, που μοιράζονται ανάμεσα σε εκτελέσεις.
+        """
+        return cached_view(self.df, name, self.key, lambda: build(self))
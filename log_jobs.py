@@ -0,0 +1,224 @@
+import os
+import time
+import queue
+import itertools
+import threading
+
+
+PROGRESS_EVERY = 5000  # Κάθε πόσες γραμμές ενημερώνεται η πρόοδος (και ελέγχεται η ακύρωση)
+
+JOB_STATUS_LABELS = {
+    "queued": "⏳ Σε αναμονή",
+    "running": "⚙️ Σε εξέλιξη",
+    "done": "✅ Ολοκληρώθηκε",
+    "failed": "❗ Απέτυχε",
+    "cancelled": "🛑 Ακυρώθηκε"
+}
+
+_local = threading.local()
+_job_ids = itertools.count(1)
+
+
+class JobCancelled(BaseException):
+    """Ακύρωση job: BaseException ώστε να μην το πιάνει το except Exception του run_parser"""
+
+
+class ParseJob:
+    """Ένα parse που τρέχει στο background: κατάσταση, πρόοδος, μηνύματα για το UI και αποτέλεσμα"""
+
+    def __init__(self, label, fn, kwargs, meta=None):
+        self.id = next(_job_ids)
+        self.label = label
+        self.fn = fn
+        self.kwargs = kwargs
+        self.meta = dict(meta or {})
+        self.status = "queued"
+        self.stage = ""
+        self.unit = "γραμμές"
+        self.done = 0
+        self.total = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.updated = None
+        self.stage_started = None
+        self.result = None
+        self.error = None
+        self.notices = []
+        self.collected = False
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.status == "queued":
+            self.status = "cancelled"
+            self.finished = time.time()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def fraction(self):
+        """Ποσοστό ολοκλήρωσης του τρέχοντος σταδίου (None όταν το σύνολο δεν είναι γνωστό)"""
+        if not self.total:
+            return None
+        return min(self.done / self.total, 1.0)
+
+    def eta(self):
+        """Εκτίμηση του χρόνου που απομένει στο τρέχον στάδιο, από τον ρυθμό του μέχρι τώρα"""
+        fraction = self.fraction()
+        if not fraction or self.stage_started is None:
+            return None
+        spent = time.time() - self.stage_started
+        return spent * (1 - fraction) / fraction
+
+    def progress_text(self):
+        if self.status != "running":
+            return JOB_STATUS_LABELS[self.status] + (f" σε {self.elapsed():.1f}s" if self.finished and self.started else "")
+        text = self.stage or "Έναρξη"
+        if self.done or self.total:
+            text += f": {self.done:,}" + (f" / {self.total:,}" if self.total else "") + f" {self.unit}"
+        text += f" · {self.elapsed():.0f}s"
+        eta = self.eta()
+        if eta is not None:
+            text += f" · ~{eta:.0f}s ακόμη"
+        elif self.updated is not None:
+            text += f" · τελευταία ενημέρωση πριν {time.time() - self.updated:.0f}s"
+        return text
+
+    def run(self):
+        """Τρέχει στο worker thread του JobQueue"""
+        if self.cancelled:
+            return
+        self.status = "running"
+        self.started = self.updated = self.stage_started = time.time()
+        _local.job = self
+        try:
+            self.result = self.fn(**self.kwargs)
+            self.status = "cancelled" if self.cancelled else "done"
+        except JobCancelled:
+            self.status = "cancelled"
+        except Exception as e:
+            self.status = "failed"
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            _local.job = None
+            self.finished = time.time()
+
+
+def current_job():
+    """Το job του τρέχοντος thread (None έξω από το JobQueue)"""
+    return getattr(_local, "job", None)
+
+
+def report_progress(done, total=None, stage=None, unit="γραμμές"):
+    """Ενημέρωση της προόδου του τρέχοντος job και έλεγχος ακύρωσης (χωρίς job δεν κάνει τίποτα)"""
+    job = current_job()
+    if job is None:
+        return
+    if job.cancelled:
+        raise JobCancelled()
+    now = time.time()
+    if stage is not None and stage != job.stage:
+        job.stage = stage
+        job.stage_started = now
+    job.done = done
+    job.total = total
+    job.unit = unit
+    job.updated = now
+
+
+def track_lines(lines, path=None, stage="Ανάγνωση", every=PROGRESS_EVERY):
+    """Οι γραμμές όπως είναι, με αναφορά προόδου κάθε every γραμμές όταν τρέχουν μέσα σε job
+
+    Το σύνολο εκτιμάται από το μέγεθος του αρχείου (όχι για συμπιεσμένα/virtual logs).
+    """
+    if current_job() is None:
+        return lines
+    return _tracked_lines(lines, path, stage, every)
+
+
+def _tracked_lines(lines, path, stage, every):
+    size = os.path.getsize(path) if path and os.path.isfile(path) else None
+    chars = 0
+    count = 0
+    for line in lines:
+        count += 1
+        chars += len(line)
+        if count % every == 0:
+            report_progress(count, int(count * size / chars) if size and chars else None, stage)
+        yield line
+    report_progress(count, count, stage)
+
+
+def notify(kind, message):
+    """Μήνυμα για το UI: μέσα σε job κρατιέται για όταν ολοκληρωθεί, αλλιώς εμφανίζεται αμέσως"""
+    job = current_job()
+    if job is not None:
+        job.notices.append((kind, message))
+        return
+    show_notice(kind, message)
+
+
+def show_notice(kind, message):
+    """Εμφάνιση ενός μηνύματος του notify (info/warning/error ή πίνακας masking_report)"""
+    import streamlit as st
+    if kind == "masking_report":
+        with st.expander("🎭 Regex masking: hits και κόστος ανά pattern"):
+            st.dataframe(message, use_container_width=True)
+    else:
+        getattr(st, kind)(message)
+
+
+class JobQueue:
+    """Ουρά από parse jobs που τρέχουν με τη σειρά σε ένα worker thread
+
+    Οι parsers είναι CPU-bound (και το παράλληλο parse γίνεται ήδη με processes στα shards),
+    οπότε ένα thread αρκεί ώστε το UI να μην παγώνει και τα jobs να μπαίνουν στη σειρά.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self._pending = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, label, fn, meta=None, **kwargs):
+        job = ParseJob(label, fn, kwargs, meta)
+        with self._lock:
+            self.jobs.append(job)
+            self._pending.put(job)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="log-parser-jobs", daemon=True)
+                self._worker.start()
+        return job
+
+    def _run(self):
+        # Το thread τερματίζει όταν αδειάσει η ουρά και ξεκινάει νέο με το επόμενο submit
+        while True:
+            with self._lock:
+                try:
+                    job = self._pending.get_nowait()
+                except queue.Empty:
+                    self._worker = None
+                    return
+            job.run()
+
+    def active(self):
+        return [job for job in self.jobs if job.active]
+
+    def get(self, job_id):
+        return next((job for job in self.jobs if job.id == job_id), None)
+
+    def clear_finished(self):
+        with self._lock:
+            self.jobs = [job for job in self.jobs if job.active]
@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from log_cache import CACHE_DIR
+from log_sharding import template_regex
+from log_jobs import PROGRESS_EVERY, report_progress
+from log_perf import timed
+from log_signatures import split_log, parse_lines, csv_roundtrip
+
+
+# Η βιβλιοθήκη είναι ένα αρχείο SQLite δίπλα στο cache (μπορεί να αλλάξει μέσω environment variable)
+LIBRARY_PATH = os.environ.get("LOG_PARSER_LIBRARY_PATH", os.path.join(CACHE_DIR, "templates.sqlite"))
+LIBRARY_VERSION = 1  # Αύξηση όταν αλλάζει ο τρόπος που γίνεται το matching
+DEFAULT_PARSED_COLUMNS = ["EventId", "EventTemplate", "ParameterList"]
+READ_BUFFER_SIZE = 1024 * 1024
+
+LIBRARY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS libraries (
+    library TEXT PRIMARY KEY,
+    parser TEXT,
+    log_format TEXT,
+    parsed_columns TEXT
+);
+CREATE TABLE IF NOT EXISTS templates (
+    library TEXT,
+    template TEXT,
+    event_id TEXT,
+    occurrences INTEGER,
+    first_seen TEXT,
+    last_seen TEXT,
+    PRIMARY KEY (library, template)
+);
+"""
+
+
+def library_key(parser_choice, log_format, regex, params):
+    """Κλειδί βιβλιοθήκης από τον parser, το format, τα regex και τις παραμέτρους (χωρίς το περιεχόμενο)"""
+    payload = {
+        "version": LIBRARY_VERSION,
+        "parser": parser_choice,
+        "log_format": log_format,
+        "regex": list(regex or []),
+        "params": {key: str(value) for key, value in sorted(params.items())}
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class TemplateLibrary:
+    """Τα templates που έχουν βρεθεί σε προηγούμενα parse για έναν parser και ένα log format (SQLite)"""
+
+    def __init__(self, key, parser_choice="", log_format="", path=LIBRARY_PATH):
+        self.key = key
+        self.parser_choice = parser_choice
+        self.log_format = log_format
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(LIBRARY_SCHEMA)
+            row = conn.execute("SELECT parsed_columns FROM libraries WHERE library = ?", (key,)).fetchone()
+            self.parsed_columns = json.loads(row[0]) if row else None
+            self.event_ids = dict(conn.execute("SELECT template, event_id FROM templates WHERE library = ?", (key,)))
+        self._index = None
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def __len__(self):
+        return len(self.event_ids)
+
+    def fingerprint(self):
+        """Η κατάσταση της βιβλιοθήκης για το κλειδί του cache: αλλάζει με κάθε νέο template (όχι με τα Occurrences)"""
+        digest = hashlib.sha256()
+        for template in sorted(self.event_ids):
+            digest.update(template.encode("utf-8") + b"\0")
+        return digest.hexdigest()
+
+    @timed("Library match", "library", lines=lambda result: len(result[0]))
+    def match(self, contents):
+        """Template και παράμετροι για κάθε γραμμή (None όπου κανένα γνωστό template δεν ταιριάζει)
+
+        Το matching γίνεται μία φορά ανά διαφορετικό Content, πρώτα με τα templates που αρχίζουν με την
+        ίδια λέξη και με τα πιο συγκεκριμένα (περισσότεροι σταθεροί χαρακτήρες) πρώτα.
+        """
+        codes, uniques = pd.factorize(pd.Series(contents), use_na_sentinel=True)
+        templates = np.full(len(uniques) + 1, None, dtype=object)
+        params = np.full(len(uniques) + 1, None, dtype=object)
+        if self.event_ids:
+            if self._index is None:
+                self._index = _build_index(self.event_ids)
+            anchors, unanchored = self._index
+            for i, content in enumerate(uniques):
+                if i % PROGRESS_EVERY == 0:
+                    report_progress(i, len(uniques), "Βιβλιοθήκη", "μοναδικές γραμμές")
+                content = str(content)
+                candidates = [entry for word in set(content.split()) for entry in anchors.get(word, ())]
+                candidates.extend(unanchored)
+                candidates.sort(key=lambda entry: -entry[0])
+                for _, template, pattern in candidates:
+                    found = pattern.match(content)
+                    if found is not None:
+                        templates[i] = template
+                        params[i] = str(list(found.groups()))
+                        break
+        return templates[codes], params[codes]  # Ο κωδικός -1 (κενό Content) δείχνει στο τελευταίο None
+
+    @timed("Library update", "library", lines=None)
+    def update(self, df_templates, parsed_columns):
+        """Γράφει πίσω τα templates του parse (νέα ή γνωστά) με τα Occurrences τους"""
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = []
+        if not df_templates.empty and {"EventId", "EventTemplate"}.issubset(df_templates.columns):
+            occurrences = df_templates["Occurrences"] if "Occurrences" in df_templates.columns else pd.Series(0, index=df_templates.index)
+            for event_id, template, count in zip(df_templates["EventId"], df_templates["EventTemplate"], occurrences):
+                if isinstance(template, str) and isinstance(event_id, str):
+                    rows.append((self.key, template, event_id, int(count), now, now))
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO libraries (library, parser, log_format, parsed_columns) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(library) DO UPDATE SET parsed_columns = excluded.parsed_columns",
+                (self.key, self.parser_choice, self.log_format, json.dumps(list(parsed_columns)))
+            )
+            conn.executemany(
+                "INSERT INTO templates (library, template, event_id, occurrences, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(library, template) DO UPDATE SET "
+                "occurrences = occurrences + excluded.occurrences, last_seen = excluded.last_seen",
+                rows
+            )
+
+        new_templates = sum(1 for _, template, *_ in rows if template not in self.event_ids)
+        self.parsed_columns = list(parsed_columns)
+        self.event_ids.update({template: event_id for _, template, event_id, *_ in rows})
+        self._index = None
+        return new_templates
+
+
+def _build_index(event_ids):
+    """Index των templates ανά λέξη-άγκυρα: τη σπανιότερη σταθερή λέξη κάθε template
+
+    Κάθε σταθερή λέξη ενός template εμφανίζεται ως ολόκληρη λέξη σε κάθε γραμμή που του ταιριάζει,
+    οπότε μια γραμμή ελέγχεται μόνο με τα templates που η άγκυρά τους υπάρχει στη γραμμή.
+    Επιστρέφει ({λέξη: [(σταθεροί χαρακτήρες, template, regex)]}, templates χωρίς σταθερή λέξη).
+    """
+    entries = []
+    frequency = {}
+    for template in event_ids:
+        normalized = re.sub(r"<.{1,5}>", "<*>", template)
+        literal = len(normalized) - 3 * normalized.count("<*>") - normalized.count(" ")
+        if literal <= 0:
+            continue  # Ένα template μόνο με <*> θα ταίριαζε σε όλα - αυτές οι γραμμές πάνε στον parser
+        words = {word for word in normalized.split() if "<*>" not in word}
+        for word in words:
+            frequency[word] = frequency.get(word, 0) + 1
+        entries.append((literal, template, words))
+
+    anchors = {}
+    unanchored = []
+    for literal, template, words in entries:
+        entry = (literal, template, re.compile(template_regex(template)))
+        if words:
+            anchor = min(words, key=lambda word: (frequency[word], -len(word)))
+            anchors.setdefault(anchor, []).append(entry)
+        else:
+            unanchored.append(entry)
+    return anchors, unanchored
+
+
+def run_with_library(mine, parser_args, log_path, library, buffer_size=READ_BUFFER_SIZE, output="memory", line_filter=None):
+    """Parse με warm start από τη βιβλιοθήκη: οι γραμμές με γνωστό template δεν περνάνε από τον parser
+
+    Το mine(parser_args, log_path, output) κάνει το parse των υπόλοιπων γραμμών και επιστρέφει
+    (structured, templates, masking_report, messages). Τα templates που βρέθηκαν γράφονται πίσω στη
+    βιβλιοθήκη. Επιστρέφει (structured, templates, masking_report, messages, stats).
+    """
+    started = time.perf_counter()
+    log_name = os.path.basename(log_path)
+    df_log, raw_lines = split_log(log_path, parser_args["log_format"], buffer_size, line_filter)
+    stats = {"lines": len(df_log), "matched": 0, "mined": len(df_log), "new_templates": 0, "library_templates": len(library)}
+
+    templates, params = library.match(df_log["Content"]) if "Content" in df_log.columns else (None, None)
+    if templates is None or not len(library):
+        # Κενή βιβλιοθήκη: κανονικό parse όλου του αρχείου και αποθήκευση των templates
+        return _mine_all(mine, parser_args, log_path, library, output, stats, started)
+
+    unmatched = np.flatnonzero(pd.isna(templates))
+    stats["matched"] = len(df_log) - len(unmatched)
+    stats["mined"] = len(unmatched)
+
+    df_mined, masking_report, messages = None, None, []
+    if len(unmatched):
+        df_mined, _, masking_report, messages = parse_lines(
+            lambda parser_choice, args, name, size, out: mine(args, os.path.join(args["indir"], name), out),
+            library.parser_choice, parser_args, log_name, (raw_lines[i] for i in unmatched), buffer_size
+        )
+        if len(df_mined) != len(unmatched):
+            return _mine_all(mine, parser_args, log_path, library, output, stats, started)
+
+    parsed_columns = (
+        [column for column in df_mined.columns if column not in df_log.columns] if df_mined is not None
+        else library.parsed_columns or DEFAULT_PARSED_COLUMNS
+    )
+    matched = np.flatnonzero(pd.notna(templates))
+    known = {
+        "EventTemplate": templates[matched],
+        "EventId": np.array([library.event_ids[t] for t in templates[matched]], dtype=object),
+        "ParameterList": params[matched]
+    }
+    df_structured = df_log.copy()
+    for column in parsed_columns:
+        values = np.full(len(df_log), None, dtype=object)
+        values[matched] = known.get(column, None)
+        if df_mined is not None:
+            values[unmatched] = df_mined[column].to_numpy(dtype=object)
+        df_structured[column] = values
+
+    df_templates = templates_table(df_structured)
+    stats["new_templates"] = library.update(df_templates, parsed_columns)
+    stats["library_templates"] = len(library)
+    if output != "memory":
+        df_structured, df_templates = csv_roundtrip(df_structured, df_templates, parser_args["outdir"], log_name)
+    stats["parse_time"] = time.perf_counter() - started
+    return df_structured, df_templates, masking_report, messages, stats
+
+
+def _mine_all(mine, parser_args, log_path, library, output, stats, started):
+    df_structured, df_templates, masking_report, messages = mine(parser_args, log_path, output)
+    parsed_columns = [column for column in df_structured.columns if column in DEFAULT_PARSED_COLUMNS]
+    if not df_structured.empty:
+        stats["new_templates"] = library.update(df_templates, parsed_columns)
+    stats.update(matched=0, mined=len(df_structured), library_templates=len(library), parse_time=time.perf_counter() - started)
+    return df_structured, df_templates, masking_report, messages, stats
+
+
+def templates_table(df_structured):
+    """Ο πίνακας templates (EventId, EventTemplate, Occurrences) με τη σειρά πρώτης εμφάνισης"""
+    if "EventTemplate" not in df_structured.columns:
+        return pd.DataFrame()
+    counts = df_structured.groupby(["EventId", "EventTemplate"], sort=False, dropna=True).size()
+    return counts.reset_index(name="Occurrences")[["EventId", "EventTemplate", "Occurrences"]]
+
+
+def clear_library(key=None, path=LIBRARY_PATH):
+    """Διαγράφει τα templates μιας βιβλιοθήκης (ή όλων αν key=None)"""
+    if not os.path.exists(path):
+        return
+    with sqlite3.connect(path, timeout=30) as conn:
+        if key is None:
+            conn.execute("DELETE FROM templates")
+            conn.execute("DELETE FROM libraries")
+        else:
+            conn.execute("DELETE FROM templates WHERE library = ?", (key,))
+            conn.execute("DELETE FROM libraries WHERE library = ?", (key,))
@@ -0,0 +1,179 @@
+import re
+import time
+import pandas as pd
+from log_jobs import PROGRESS_EVERY, report_progress
+
+
+MASK_BATCH_SIZE = 10000  # Γραμμές ανά batch
+
+# Αντικαταστάσεις μέσα στο pattern ώστε να μη μπορεί να περάσει πάνω από αλλαγή γραμμής
+_LINE_SAFE_ESCAPES = {"\\s": r"[^\S\n]", "\\W": r"[^\w\n]", "\\D": r"[^\d\n]"}
+_LINE_UNSAFE_CLASS_ESCAPES = {"\\s", "\\W", "\\D", "\\n"}
+_LOOKAROUNDS = ("(?=", "(?!", "(?<=", "(?<!")
+
+
+def line_safe_pattern(pattern):
+    """Επιστρέφει compiled εκδοχή του pattern που δεν ταιριάζει ποτέ πάνω από '\\n', ή None αν δεν γίνεται με ασφάλεια"""
+    compiled = re.compile(pattern)
+    if compiled.flags & (re.DOTALL | re.MULTILINE):
+        return None
+
+    out = []
+    i = 0
+    in_class = negated = class_first = False
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            escape = pattern[i:i + 2]
+            i += 2
+            if escape in ("\\A", "\\Z", "\\z"):
+                return None
+            if in_class:
+                if not negated and escape in _LINE_UNSAFE_CLASS_ESCAPES:
+                    return None
+                out.append(escape)
+                class_first = False
+            else:
+                if escape == "\\n":
+                    return None
+                out.append(_LINE_SAFE_ESCAPES.get(escape, escape))
+            continue
+
+        if in_class:
+            if ch == "]" and not class_first:
+                in_class = False
+            out.append(ch)
+            class_first = False
+            i += 1
+            continue
+
+        if ch == "[":
+            in_class = True
+            class_first = True
+            negated = pattern[i + 1:i + 2] == "^"
+            if negated:
+                out.append("[^\\n")  # Οι αρνητικές κλάσεις δεν πρέπει να πιάνουν την αλλαγή γραμμής
+                i += 2
+            else:
+                out.append("[")
+                i += 1
+            continue
+
+        if ch in "^$":
+            return None
+        out.append(ch)
+        i += 1
+
+    safe = re.compile("".join(out))
+    if safe.match(""):
+        return None  # Patterns που ταιριάζουν κενό string τα τρέχουμε ανά γραμμή
+    return safe
+
+
+class MaskingEngine:
+    """Εφαρμόζει τα REGEX_PATTERNS σε batches γραμμών με αποτέλεσμα ίδιο με τη σειριακή εφαρμογή ανά γραμμή"""
+
+    def __init__(self, patterns, replacement="<*>"):
+        self.patterns = list(patterns or [])
+        self.replacement = replacement
+        self._repl = replacement.replace("\\", "\\\\")
+        self.compiled = [re.compile(p) for p in self.patterns]
+        self.line_safe = [line_safe_pattern(p) for p in self.patterns]
+
+        # Ένα συνδυασμένο pattern για να παρακάμπτουμε batches χωρίς κανένα match. Πάνω σε όλο το batch
+        # μόνο όταν κάθε pattern έχει line-safe εκδοχή χωρίς lookarounds (ένα ^ ή ένα lookbehind βλέπει
+        # αλλιώς την αρχή μιας γραμμής μέσα στο batch), αλλιώς ο έλεγχος γίνεται ανά γραμμή
+        self.combined_on_blob = all(
+            safe is not None and not any(lookaround in p for lookaround in _LOOKAROUNDS)
+            for p, safe in zip(self.patterns, self.line_safe)
+        )
+        sources = [safe.pattern for safe in self.line_safe] if self.combined_on_blob else self.patterns
+        try:
+            self.combined = re.compile("|".join(f"(?:{p})" for p in sources)) if self.patterns else None
+        except re.error:
+            self.combined = None
+
+        self.hits = [0] * len(self.patterns)
+        self.seconds = [0.0] * len(self.patterns)
+        self.lines = 0
+
+    def mask_line(self, line):
+        """Σειριακή εφαρμογή όλων των patterns σε μία γραμμή"""
+        for pattern in self.compiled:
+            line = pattern.sub(self._repl, line)
+        return line
+
+    def mask_batch(self, lines):
+        """Masking πολλών γραμμών με ένα πέρασμα ανά pattern πάνω σε όλο το batch"""
+        lines = list(lines)
+        self.lines += len(lines)
+        if not lines or not self.patterns:
+            return lines
+
+        blob = "\n".join(lines)
+        if self.combined is not None:
+            # Κανένα pattern δεν ταιριάζει - η σειριακή εφαρμογή δεν θα άλλαζε τίποτα
+            if self.combined_on_blob and self.combined.search(blob) is None:
+                return lines
+            if not self.combined_on_blob and not any(self.combined.search(line) for line in lines):
+                return lines
+
+        for i, (pattern, safe) in enumerate(zip(self.compiled, self.line_safe)):
+            started = time.perf_counter()
+            if safe is not None:
+                blob, count = safe.subn(self._repl, blob)
+            else:
+                count = 0
+                parts = []
+                for part in blob.split("\n"):
+                    part, n = pattern.subn(self._repl, part)
+                    parts.append(part)
+                    count += n
+                blob = "\n".join(parts)
+            self.hits[i] += count
+            self.seconds[i] += time.perf_counter() - started
+
+        return blob.split("\n")
+
+    def mask_all(self, lines, batch_size=MASK_BATCH_SIZE):
+        """Masking μιας ολόκληρης λίστας γραμμών σε batches"""
+        lines = list(lines)
+        masked = []
+        for start in range(0, len(lines), batch_size):
+            masked.extend(self.mask_batch(lines[start:start + batch_size]))
+        return masked
+
+    def report(self):
+        """Αναφορά hits και χρόνου ανά pattern"""
+        total = sum(self.seconds) or 1.0
+        return pd.DataFrame({
+            "Pattern": self.patterns,
+            "Hits": self.hits,
+            "Seconds": [round(s, 4) for s in self.seconds],
+            "Cost %": [round(100 * s / total, 1) for s in self.seconds],
+            "Batched": [safe is not None for safe in self.line_safe]
+        })
+
+
+class PrecomputedPreprocess:
+    """Αντικαθιστά το parser.preprocess με αποτελέσματα που υπολογίστηκαν από πριν σε batches"""
+
+    def __init__(self, engine, contents, batch_size=MASK_BATCH_SIZE):
+        self.engine = engine
+        self.contents = list(contents)
+        self.masked = engine.mask_all(self.contents, batch_size)
+        self.position = 0
+        self.calls = 0
+
+    def __call__(self, line):
+        # Οι parsers καλούν το preprocess μία φορά ανά γραμμή με τη σειρά του df_log
+        self.calls += 1
+        if self.calls == len(self.contents):
+            report_progress(0, None, "Αποτελέσματα")  # Μετά την τελευταία γραμμή ο parser γράφει τα αποτελέσματα
+        elif self.calls % PROGRESS_EVERY == 0:
+            report_progress(self.calls, len(self.contents), "Mining")
+        if self.position < len(self.contents) and self.contents[self.position] == line:
+            masked = self.masked[self.position]
+            self.position += 1
+            return masked
+        return self.engine.mask_line(line)
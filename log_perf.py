@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import threading
+import functools
+import tracemalloc
+from contextlib import contextmanager
+import pandas as pd
+
+
+MB = 1024 * 1024
+
+# Σειρά των στηλών του πίνακα στο panel "Performance"
+PERF_COLUMNS = ["Stage", "Category", "Start (s)", "Duration (s)", "Lines", "Lines/s", "Peak mem (MB)", "RSS (MB)"]
+
+_local = threading.local()
+
+# Threads με ενεργό recording: το tracemalloc μετράει όλο το process, οπότε το peak ενός σταδίου
+# ισχύει μόνο αν όσο έτρεχε δεν κατέγραφε κανένα άλλο thread (π.χ. job άλλου session)
+_active_lock = threading.Lock()
+_active_threads = {}
+_overlaps = 0  # Αυξάνεται κάθε φορά που ξεκινάει recording ενώ υπάρχει ήδη ενεργό σε άλλο thread
+
+
+class PerfRecorder:
+    """Χρόνοι, γραμμές και μνήμη ανά στάδιο (spans) για ένα parse ή μία εκτέλεση του dashboard"""
+
+    def __init__(self, name):
+        self.name = name
+        self.origin = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def to_frame(self):
+        """Ο πίνακας των σταδίων με τη σειρά έναρξης (εμφωλευμένα στάδια με εσοχή)"""
+        rows = []
+        for span in sorted(self.spans, key=lambda s: (s["start"], s["depth"])):
+            lines = span.get("lines")
+            rows.append({
+                "Stage": "  " * span["depth"] + span["name"],
+                "Category": span["category"],
+                "Start (s)": round(span["start"], 3),
+                "Duration (s)": round(span["duration"], 3),
+                "Lines": lines,
+                "Lines/s": round(lines / span["duration"]) if lines and span["duration"] > 0 else None,
+                "Peak mem (MB)": span.get("peak_mb"),
+                "RSS (MB)": span.get("rss_mb")
+            })
+        return pd.DataFrame(rows, columns=PERF_COLUMNS)
+
+    def to_dict(self):
+        return {"name": self.name, "spans": list(self.spans)}
+
+    def trace_events(self, pid=1):
+        """Τα spans ως "complete" events του Trace Event Format (chrome://tracing, Perfetto)"""
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": self.name}}]
+        for span in self.spans:
+            args = {key: value for key, value in span.items() if key not in ("name", "category", "start", "duration", "thread", "depth")}
+            events.append({
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": round(span["start"] * 1e6),
+                "dur": round(span["duration"] * 1e6),
+                "pid": pid,
+                "tid": span["thread"],
+                "args": args
+            })
+        return events
+
+
+def perf_json(recorders):
+    """Τα spans όλων των recorders ως JSON"""
+    return json.dumps([recorder.to_dict() for recorder in recorders], indent=2, ensure_ascii=False, default=str)
+
+
+def trace_json(recorders):
+    """Ένα αρχείο Trace Event Format για πολλούς recorders (ένα process ανά recorder)"""
+    events = []
+    for pid, recorder in enumerate(recorders, 1):
+        events.extend(recorder.trace_events(pid))
+    return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, ensure_ascii=False, default=str)
+
+
+def current_recorder():
+    return getattr(_local, "recorder", None)
+
+
+@contextmanager
+def recording(recorder):
+    """Τα stages του τρέχοντος thread καταγράφονται στον recorder μέσα σε αυτό το block"""
+    global _overlaps
+    previous = (current_recorder(), getattr(_local, "stack", None))
+    _local.recorder = recorder
+    _local.stack = []
+    thread = threading.get_ident()
+    with _active_lock:
+        if _active_threads and thread not in _active_threads:
+            _overlaps += 1
+        _active_threads[thread] = _active_threads.get(thread, 0) + 1
+    try:
+        yield recorder
+    finally:
+        with _active_lock:
+            _active_threads[thread] -= 1
+            if not _active_threads[thread]:
+                del _active_threads[thread]
+        _local.recorder, _local.stack = previous
+
+
+def _concurrency():
+    """(πλήθος threads με recording, μετρητής επικαλύψεων) για τον έλεγχο του peak ενός σταδίου"""
+    with _active_lock:
+        return len(_active_threads), _overlaps
+
+
+def run_recorded(recorder, fn, **kwargs):
+    """Κλήση του fn με καταγραφή των stages του στον recorder (π.χ. ως job του JobQueue)"""
+    with recording(recorder):
+        with stage(recorder.name, "total"):
+            return fn(**kwargs)
+
+
+def start_memory_tracing():
+    """Μέτρηση μνήμης ανά στάδιο με tracemalloc (επιβαρύνει κάθε allocation, γι' αυτό είναι προαιρετική)"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def stop_memory_tracing():
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def rss_mb():
+    """Η τρέχουσα μνήμη (RSS) του process σε MB (ή η μέγιστη όπου δεν υπάρχει /proc)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB, 1)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (MB if os.uname().sysname == "Darwin" else 1024), 1)
+
+
+def _open_frame(stack, name, category, lines=None):
+    """Νέο span στη στοίβα του thread, με μέτρηση μνήμης όταν τρέχει το tracemalloc"""
+    span = {"name": name, "category": category, "lines": lines}
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # Το peak του γονικού σταδίου κρατιέται πριν μηδενιστεί για το εμφωλευμένο
+            stack[-1]["_peak"] = max(stack[-1].get("_peak", 0), peak)
+        tracemalloc.reset_peak()
+        span["_memory_start"] = current
+        span["_peak"] = current
+        span["_overlaps"] = _concurrency()[1]
+    stack.append(span)
+    span["_started"] = time.perf_counter()
+    return span
+
+
+def _close_frame(recorder, stack, span):
+    ended = time.perf_counter()
+    # Ό,τι έμεινε ανοιχτό πάνω από το span (π.χ. SectionTimer μετά από return) κλείνει χωρίς καταγραφή
+    if any(frame is span for frame in stack):
+        while stack.pop() is not span:
+            pass
+    started = span.pop("_started")
+    span["start"] = started - recorder.origin
+    span["duration"] = ended - started
+    span["thread"] = threading.get_ident()
+    span["depth"] = len(stack)
+    memory_start = span.pop("_memory_start", None)
+    peak = span.pop("_peak", None)
+    overlaps = span.pop("_overlaps", None)
+    if memory_start is not None and tracemalloc.is_tracing():
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        active, current_overlaps = _concurrency()
+        if active > 1 or current_overlaps != overlaps:
+            # Άλλο thread κατέγραφε ταυτόχρονα: το peak θα περιείχε και τη δική του μνήμη
+            span["peak_shared"] = True
+        else:
+            span["peak_mb"] = round((peak - memory_start) / MB, 1)
+        if stack:
+            stack[-1]["_peak"] = max(stack[-1].get("_peak", 0), peak)
+    span["rss_mb"] = rss_mb()
+    if span.get("lines") is None:
+        span.pop("lines", None)
+    recorder.add(span)
+
+
+@contextmanager
+def stage(name, category="parse", lines=None):
+    """Καταγραφή ενός σταδίου (χρόνος, γραμμές, μνήμη) στον recorder του thread, αν υπάρχει
+
+    Το span που επιστρέφεται δέχεται τιμές μέσα στο block (π.χ. span["lines"] = len(df)).
+    Το "Peak mem" είναι η μέγιστη αύξηση της μνήμης της Python μέσα στο στάδιο (μόνο με tracemalloc).
+    """
+    recorder = current_recorder()
+    if recorder is None:
+        yield {}
+        return
+    span = _open_frame(_local.stack, name, category, lines)
+    try:
+        yield span
+    finally:
+        _close_frame(recorder, _local.stack, span)
+
+
+def timed(name, category="parse", lines=len):
+    """Decorator: κάθε κλήση της συνάρτησης καταγράφεται ως stage (lines από το αποτέλεσμα)"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name, category) as span:
+                result = fn(*args, **kwargs)
+                if span and lines is not None:
+                    try:
+                        span["lines"] = lines(result)
+                    except TypeError:
+                        pass
+                return result
+        return wrapper
+    return decorator
+
+
+class SectionTimer:
+    """Χρονομέτρηση διαδοχικών τμημάτων μιας συνάρτησης (π.χ. των γραφημάτων ενός dashboard)
+
+    Κάθε lap(name) καταγράφει ως stage το διάστημα από το προηγούμενο lap (ή από τη δημιουργία).
+    """
+
+    def __init__(self, prefix, category="dashboard"):
+        self.prefix = prefix
+        self.category = category
+        self.recorder = current_recorder()
+        self._span = self._open()
+
+    def _open(self):
+        if self.recorder is None:
+            return None
+        return _open_frame(_local.stack, self.prefix, self.category)
+
+    def lap(self, name, lines=None):
+        if self._span is not None:
+            self._span["name"] = f"{self.prefix}: {name}"
+            self._span["lines"] = lines
+            _close_frame(self.recorder, _local.stack, self._span)
+        self._span = self._open()
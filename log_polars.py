@@ -0,0 +1,134 @@
+import re
+import pandas as pd
+from log_filters import cached_for_dataset
+from log_perf import timed
+from log_downsample import TIME_BIN_LADDER, SCATTER_POINT_BUDGET, MAX_CATEGORIES
+
+
+TIME_COLUMN = "datetime"
+
+# Οι μονάδες των πλατών του TIME_BIN_LADDER στη σύνταξη διαρκειών της polars (π.χ. 5min → 5m)
+DURATION_UNITS = {"s": "s", "min": "m", "h": "h", "D": "d"}
+
+
+def _polars():
+    try:
+        import polars as pl
+    except ImportError:
+        raise ValueError("Για το backend polars χρειάζεται το πακέτο polars (pip install polars)")
+    return pl
+
+
+def polars_duration(freq):
+    """Το πλάτος ενός bin της pandas στη σύνταξη της polars (το truncate της ταυτίζεται με το .dt.floor)"""
+    count, unit = re.fullmatch(r"(\d+)(\D+)", freq).groups()
+    return count + DURATION_UNITS[unit]
+
+
+@timed("Polars frame", "filters", lines=None)
+def to_polars(df, columns):
+    """Οι στήλες του dashboard ως polars DataFrame, μία φορά ανά dataset"""
+    pl = _polars()
+    columns = [column for column in dict.fromkeys(columns) if column in df.columns]
+    return cached_for_dataset(df, "polars", tuple(columns), lambda: pl.from_pandas(df[columns]))
+
+
+def restore_dtypes(result, df):
+    """Οι τύποι των στηλών του df στο αποτέλεσμα (π.χ. category, UInt16), όπως θα τους έβγαζε η pandas
+
+    Οι κατηγορίες που δεν εμφανίζονται αφαιρούνται, όπως στο φιλτραρισμένο frame (drop_unused_categories).
+    """
+    for column in result.columns:
+        if column not in df.columns:
+            continue
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            # Πάντα: η σύγκριση των CategoricalDtype αγνοεί τη σειρά των κατηγοριών, που ορίζει τη σειρά του groupby
+            result[column] = result[column].astype(object).astype(df[column].dtype).cat.remove_unused_categories()
+        elif result[column].dtype != df[column].dtype:
+            result[column] = result[column].astype(df[column].dtype)
+    return result
+
+
+def filter_expression(selections, date_range, time_column=TIME_COLUMN):
+    """Τα φίλτρα του dashboard ως polars expression, με την ίδια σημασιολογία με το FilterIndex.mask"""
+    pl = _polars()
+    # Τα is_between / is_in δίνουν null για κενές τιμές, οπότε οι γραμμές τους δεν περνάνε (όπως και με "ALL")
+    expression = pl.col(time_column).dt.date().is_between(pd.Timestamp(date_range[0]).date(), pd.Timestamp(date_range[1]).date())
+    for column, values in selections.items():
+        expression &= pl.col(column).is_in(list(values))
+    return expression
+
+
+def summarize(frame, df, selections, date_range, dimensions):
+    """Όπως το summarize του dashboard: ένα lazy plan φίλτρο → group by που τρέχει παράλληλα στην polars"""
+    pl = _polars()
+    aggregations = [pl.len().alias("Count"), pl.col(TIME_COLUMN).min().alias("_start"), pl.col(TIME_COLUMN).max().alias("_end")]
+    query = frame.lazy().filter(filter_expression(selections, date_range))
+    # Με maintain_order οι συνδυασμοί μένουν με τη σειρά πρώτης εμφάνισης (όπως με sort=False)
+    query = query.group_by(dimensions, maintain_order=True).agg(aggregations) if dimensions else query.select(aggregations)
+    grouped = query.collect().to_pandas()
+
+    cube = restore_dtypes(grouped.drop(columns=["_start", "_end"]), df)
+    cube["Count"] = cube["Count"].astype("int64")
+    rows = int(cube["Count"].sum())
+    start, end = (grouped["_start"].min(), grouped["_end"].max()) if rows else (pd.NaT, pd.NaT)
+    return {"rows": rows, "cube": cube, "start": start, "end": end}
+
+
+def bin_points(frame, df, selections, date_range, x, y, color=None, extra=(), melt=None, budget=SCATTER_POINT_BUDGET, max_categories=MAX_CATEGORIES):
+    """Όπως το log_downsample.bin_points πάνω στα φιλτραρισμένα logs (και στο pd.melt τους), ως lazy plans της polars
+
+    Στην pandas επιστρέφονται μόνο τα σημεία του γραφήματος.
+    """
+    pl = _polars()
+    keys = [y] + ([color] if color else [])
+    query = frame.lazy().filter(filter_expression(selections, date_range))
+    if melt:
+        # Οι τιμές ως strings, όπως το object που βγάζει το pd.melt για κατηγορίες με διαφορετικά λεξικά
+        query = query.select(list(melt["id_vars"]) + [pl.col(column).cast(pl.String) for column in melt["value_vars"]]).unpivot(
+            on=list(melt["value_vars"]), index=list(melt["id_vars"]), variable_name=melt["var_name"], value_name=melt["value_name"]
+        )
+    data = query.select(list(dict.fromkeys([x] + keys + list(extra)))).drop_nulls([x, y])
+
+    rows = data.select(pl.len()).collect().item()
+    info = {"rows": rows, "points": 0, "bin": None, "categories": max_categories, "categories_dropped": 0, "cells_dropped": 0}
+
+    # Αν οι γραμμές δεν χωράνε στο budget, στον άξονα y κρατάμε μόνο τις πιο συχνές κατηγορίες
+    # (οι ισοβαθμίες με τη σειρά πρώτης εμφάνισης, όπως στο value_counts)
+    if max_categories is not None and rows > budget:
+        totals = data.group_by(y, maintain_order=True).len().sort("len", descending=True, maintain_order=True).collect()
+        if len(totals) > max_categories:
+            data = data.filter(pl.col(y).is_in(totals[y][:max_categories].to_list()))
+            info["categories_dropped"] = len(totals) - max_categories
+
+    # Οι γραμμές με κενό color δεν γίνονται σημεία (όπως στο groupby), ενώ το data μένει lazy μέχρι εδώ
+    cells = data.drop_nulls(keys).collect().lazy()
+
+    def binned(width):
+        return pl.col(x).dt.truncate(polars_duration(width)) if width else pl.col(x)
+
+    # Binary search στη σκάλα (τα κελιά μειώνονται όσο μεγαλώνει το bin)
+    lo, hi = 0, len(TIME_BIN_LADDER) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if cells.select(binned(TIME_BIN_LADDER[mid]), *keys).unique().select(pl.len()).collect().item() <= budget:
+            hi = mid
+        else:
+            lo = mid + 1
+    width = TIME_BIN_LADDER[lo]
+    info["bin"] = width
+
+    firsts = [pl.col(column).drop_nulls().first() for column in extra if column not in keys]
+    points = cells.with_columns(binned(width)).group_by([x] + keys).agg(pl.len().alias("Count"), *firsts).collect().to_pandas()
+    # Η σειρά του groupby της pandas (x και μετά οι κατηγορίες με τη σειρά του dtype τους)
+    points = restore_dtypes(points, df).sort_values([x] + keys, ignore_index=True)
+    points["Count"] = points["Count"].astype("int64")
+    points = points[[x] + keys + ["Count"] + [column for column in extra if column not in keys]]
+
+    # Αν ούτε το πιο αδρό bin χωράει, κρατάμε τα κελιά με τις περισσότερες γραμμές
+    if len(points) > budget:
+        info["cells_dropped"] = len(points) - budget
+        points = points.nlargest(budget, "Count").sort_values(x)
+
+    info["points"] = len(points)
+    return points, info
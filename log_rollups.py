@@ -0,0 +1,112 @@
+import pandas as pd
+from log_filters import cached_for_dataset
+from log_perf import timed
+
+
+# Αναλύσεις από τη λεπτότερη στην πιο αδρή (κάθε μία διαιρεί ακριβώς τις επόμενες)
+ROLLUP_FREQS = ["1min", "5min", "1h", "1D"]
+ROLLUP_MAX_BUCKETS = 1500  # Μέγιστο πλήθος σημείων ανά χρονοσειρά (default του pick_bucket)
+
+# Αναλύσεις των χρονικών γραφημάτων: κάθε μία προκύπτει ακριβώς από κάποιο cube του ROLLUP_FREQS
+BUCKET_FREQS = ["1min", "5min", "15min", "30min", "1h", "3h", "6h", "12h", "1D", "7D"]
+ROLLUP_LABELS = {
+    "1min": "λεπτό",
+    "5min": "5 λεπτά",
+    "15min": "15 λεπτά",
+    "30min": "30 λεπτά",
+    "1h": "ώρα",
+    "3h": "3 ώρες",
+    "6h": "6 ώρες",
+    "12h": "12 ώρες",
+    "1D": "ημέρα",
+    "7D": "εβδομάδα"
+}
+
+# Διαστάσεις των cubes ανά τύπο log: οι στήλες μικρής πληθικότητας των φίλτρων του dashboard, που
+# καλύπτουν και τις στήλες των χρονικών γραφημάτων. Με PID ή ports το cube θα είχε σχεδόν όσες γραμμές
+# και το log, οπότε τα φίλτρα σε αυτές εφαρμόζονται με το FilterIndex (βλ. DashboardData.rollups)
+ROLLUP_DIMENSIONS = {
+    "Windows": ["Level", "Component"],
+    "Linux": ["Level", "Component"],
+    "Mac": ["Component", "User"],
+    "Suricata": ["EventType", "ClassDescription", "Protocol"]
+}
+
+
+class TimeRollups:
+    """Προϋπολογισμένα counts ανά χρονικό bucket × διαστάσεις, σε όλες τις αναλύσεις του ROLLUP_FREQS
+
+    Το applied είναι στήλες με φίλτρα που έχουν ήδη εφαρμοστεί στο df (το query τα αγνοεί).
+    """
+
+    def __init__(self, df, time_values, dimensions, applied=()):
+        self.dimensions = [column for column in dimensions if column in df.columns]
+        self.applied = set(applied)
+        if callable(time_values):
+            time_values = time_values()
+        times = pd.to_datetime(pd.Series(time_values, index=df.index), errors="coerce")
+
+        # Οι γραμμές χωρίς χρόνο μένουν εκτός, όπως και στο pd.Grouper
+        base = df[self.dimensions].assign(bucket=times.dt.floor(ROLLUP_FREQS[0]))
+        base = base[base["bucket"].notna()]
+        keys = ["bucket"] + self.dimensions
+
+        self.cubes = {}
+        cube = base.groupby(keys, observed=True, dropna=False).size().reset_index(name="Count")
+        self.cubes[ROLLUP_FREQS[0]] = cube
+        for freq in ROLLUP_FREQS[1:]:
+            # Κάθε ανάλυση προκύπτει από την προηγούμενη και όχι από τις γραμμές του log
+            cube = (
+                cube.assign(bucket=cube["bucket"].dt.floor(freq))
+                .groupby(keys, observed=True, dropna=False)["Count"].sum()
+                .reset_index()
+            )
+            self.cubes[freq] = cube
+
+    def source_freq(self, freq):
+        """Το πιο αδρό cube από το οποίο προκύπτει ακριβώς η ανάλυση freq (π.χ. 15min από το 5min)"""
+        step = pd.Timedelta(freq)
+        fitting = [f for f in ROLLUP_FREQS if pd.Timedelta(f) <= step and step % pd.Timedelta(f) == pd.Timedelta(0)]
+        if not fitting:
+            raise ValueError(f"Η ανάλυση {freq} δεν προκύπτει από τα rollups ({', '.join(ROLLUP_FREQS)})")
+        return fitting[-1]
+
+    def query(self, freq, selections, date_range, by=()):
+        """Counts ανά bucket (και ανά στήλες by) για τα επιλεγμένα φίλτρα, με την ίδια σημασιολογία με το FilterIndex"""
+        source = self.source_freq(freq)
+        cube = self.cubes[source]
+
+        days = cube["bucket"].dt.normalize()
+        mask = (days >= pd.Timestamp(date_range[0])) & (days <= pd.Timestamp(date_range[1]))
+        for column, values in selections.items():
+            if column not in self.applied:
+                mask &= cube[column].isin(values)
+        cube = cube[mask]
+
+        buckets = cube["bucket"] if source == freq else cube["bucket"].dt.floor(freq)
+        return cube.groupby([buckets] + list(by), observed=True)["Count"].sum().reset_index()
+
+
+def pick_bucket(start, end, max_buckets=ROLLUP_MAX_BUCKETS):
+    """Η λεπτότερη ανάλυση του BUCKET_FREQS που χωράει το διάστημα [start, end] σε max_buckets buckets
+
+    Με το διάστημα των φιλτραρισμένων logs, ένα στενότερο φίλτρο ημερομηνιών δίνει λεπτότερη ανάλυση,
+    που βγαίνει πάλι από τα cubes του TimeRollups χωρίς να ξαναδιαβαστούν οι γραμμές του log.
+    """
+    if pd.isna(start) or pd.isna(end):
+        return BUCKET_FREQS[0]
+    span = pd.Timestamp(end) - pd.Timestamp(start)
+    for freq in BUCKET_FREQS:
+        if span // pd.Timedelta(freq) + 1 <= max_buckets:
+            return freq
+    return BUCKET_FREQS[-1]
+
+
+@timed("Rollups", "filters", lines=None)
+def get_rollups(df, log_type, time_values):
+    """Επιστρέφει τα TimeRollups του frame, υπολογίζοντάς τα μία φορά ανά dataset
+
+    Το time_values μπορεί να είναι callable ώστε να υπολογίζεται μόνο όταν χτίζονται τα cubes.
+    """
+    dimensions = ROLLUP_DIMENSIONS.get(log_type, [])
+    return cached_for_dataset(df, "rollups", tuple(dimensions), lambda: TimeRollups(df, time_values, dimensions))
@@ -0,0 +1,125 @@
+import os
+import re
+import bisect
+import numpy as np
+from log_archives import open_log, is_virtual_log
+from log_perf import timed
+
+
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Γραμμές του δείγματος της προεπισκόπησης (parse σε λίγα δευτερόλεπτα)
+PREVIEW_LINES = int(os.environ.get("LOG_PARSER_PREVIEW_LINES", 20000))
+POSITION_STRATA = 32  # Τμήματα του αρχείου (ανά θέση) από τα οποία παίρνει γραμμές το δείγμα
+WINDOW_FACTOR = 4  # Γραμμές που διαβάζονται ανά τμήμα, ως πολλαπλάσιο των γραμμών που κρατιούνται
+LENGTH_BUCKETS = [40, 80, 120, 200, 400]  # Όρια μήκους γραμμής (bytes) των στρωμάτων
+PREFIX_CHARS = 24  # Χαρακτήρες της αρχής της γραμμής (με τα ψηφία ως 0) που ορίζουν το σχήμα της
+
+
+def line_stratum(line):
+    """Το στρώμα μιας γραμμής: κάδος μήκους και σχήμα της αρχής της (π.χ. timestamp + Level)"""
+    prefix = re.sub(rb"\d", b"0", line[:PREFIX_CHARS])
+    return bisect.bisect(LENGTH_BUCKETS, len(line)), prefix
+
+
+def read_windows(path, n_windows, window_lines):
+    """Γραμμές από n_windows σημεία του αρχείου σε ίσες αποστάσεις (η μισή γραμμή πριν από κάθε σημείο ανήκει στο προηγούμενο)
+
+    Επιστρέφει (λίστα γραμμών ανά τμήμα, bytes που διαβάστηκαν).
+    """
+    size = os.path.getsize(path)
+    windows = []
+    bytes_read = 0
+    with open(path, "rb", buffering=READ_BUFFER_SIZE) as f:
+        for i in range(n_windows):
+            start, end = size * i // n_windows, size * (i + 1) // n_windows
+            read_lines = sum(len(lines) for lines in windows)
+            if i == n_windows - 1 and read_lines:
+                # Το τελευταίο τμήμα διαβάζεται ως το τέλος του αρχείου, ώστε το δείγμα να φτάνει ως τις τελευταίες γραμμές
+                start = max(start, size - window_lines * bytes_read // read_lines)
+            if start > 0:
+                f.seek(start - 1)
+                f.readline()
+            lines = []
+            while len(lines) < window_lines and f.tell() < end:
+                line = f.readline()
+                if not line:
+                    break
+                lines.append(line)
+                bytes_read += len(line)
+            windows.append(lines)
+    return windows, bytes_read
+
+
+def read_head(path, n_lines):
+    """Οι πρώτες n_lines γραμμές ενός log που δεν επιτρέπει seek (συμπιεσμένο ή rotated segments)"""
+    lines = []
+    with open_log(path) as fin:
+        for line in fin:
+            lines.append(line.encode())
+            if len(lines) >= n_lines:
+                break
+    return [lines]
+
+
+def stratified_pick(lines, quota):
+    """Δείγμα το πολύ quota γραμμών με αναλογική κατανομή στα στρώματα (τουλάχιστον μία ανά στρώμα), με τη σειρά του αρχείου
+
+    Αν τα στρώματα είναι τόσα που η μία γραμμή ανά στρώμα ξεπερνά το quota, μένουν εκτός τα μικρότερα.
+    """
+    if len(lines) <= quota:
+        return list(lines)
+    groups = {}
+    for i, line in enumerate(lines):
+        groups.setdefault(line_stratum(line), []).append(i)
+    sizes = {stratum: max(1, len(indices) * quota // len(lines)) for stratum, indices in groups.items()}
+    excess = sum(sizes.values()) - quota
+    for stratum in sorted(groups, key=lambda s: len(groups[s])):
+        if excess <= 0:
+            break
+        excess -= sizes.pop(stratum)
+    picked = []
+    for stratum, k in sizes.items():
+        indices = groups[stratum]
+        # Σε ίσες αποστάσεις μέσα στο στρώμα, ώστε να καλύπτεται όλο το τμήμα του αρχείου
+        picked.extend(indices[j] for j in np.unique(np.linspace(0, len(indices) - 1, k).round().astype(int)))
+    return [lines[i] for i in sorted(picked)]
+
+
+@timed("Stratified sample", "io", lines=lambda result: result["sample_lines"])
+def write_sample(log_path, sample_path, n_lines=PREVIEW_LINES, n_windows=POSITION_STRATA):
+    """Γράφει στο sample_path ένα δείγμα του log, στρωματοποιημένο ανά θέση στο αρχείο και ανά μήκος/αρχή γραμμής
+
+    Τα συμπιεσμένα ή rotated logs δεν επιτρέπουν seek, οπότε το δείγμα βγαίνει από την αρχή τους και το
+    συνολικό πλήθος γραμμών δεν εκτιμάται (estimated_lines/scale = None).
+    Επιστρέφει info με sample_lines, estimated_lines, scale (γραμμές log ανά γραμμή δείγματος) και method.
+    """
+    if is_virtual_log(log_path):
+        windows, method = read_head(log_path, n_lines * WINDOW_FACTOR), "head"
+        quotas = [n_lines]
+    else:
+        windows_lines = -(-n_lines * WINDOW_FACTOR // n_windows)
+        windows, bytes_read = read_windows(log_path, n_windows, windows_lines)
+        method = "stratified"
+        quotas = [n_lines * (i + 1) // n_windows - n_lines * i // n_windows for i in range(n_windows)]
+
+    sample = []
+    for lines, quota in zip(windows, quotas):
+        sample.extend(stratified_pick(lines, quota))
+
+    os.makedirs(os.path.dirname(sample_path), exist_ok=True)
+    with open(sample_path, "wb") as f:
+        f.writelines(line if line.endswith(b"\n") else line + b"\n" for line in sample)
+
+    read_lines = sum(len(lines) for lines in windows)
+    estimated_lines = None
+    if method == "stratified" and read_lines:
+        # Από το μέσο μήκος των γραμμών που διαβάστηκαν
+        estimated_lines = max(read_lines, round(os.path.getsize(log_path) * read_lines / bytes_read))
+    return {
+        "method": method,
+        "sample_lines": len(sample),
+        "read_lines": read_lines,
+        "estimated_lines": estimated_lines,
+        "scale": estimated_lines / len(sample) if estimated_lines and sample else None
+    }
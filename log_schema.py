@@ -0,0 +1,86 @@
+import pandas as pd
+from log_perf import timed
+
+
+# Στήλες που υπάρχουν σε όλους τους τύπους log (από τον parser)
+_EVENT_COLUMNS = {"EventId": "category", "EventTemplate": "category"}
+
+# Τύποι ανά στήλη για κάθε τύπο log όπως τον παράγουν οι process_*_log
+LOG_SCHEMAS = {
+    "Windows": {
+        "Level": "category",
+        "Component": "category",
+        **_EVENT_COLUMNS
+    },
+    "Linux": {
+        "Month": "category",
+        "Date": "UInt8",
+        "Level": "category",
+        "Component": "category",
+        "PID": "UInt32",
+        **_EVENT_COLUMNS
+    },
+    "Mac": {
+        "Month": "category",
+        "Date": "UInt8",
+        "User": "category",
+        "Component": "category",
+        "PID": "UInt32",
+        "Address": "category",
+        **_EVENT_COLUMNS
+    },
+    "Suricata": {
+        "Month": "UInt8",
+        "Date": "UInt8",
+        "Year": "UInt16",
+        "SID": "UInt32",
+        "Revision": "UInt16",
+        "EventType": "category",
+        "ClassDescription": "category",
+        "PriorityValue": "UInt8",
+        "Protocol": "category",
+        "SrcIP": "category",  # Τα IPs αποθηκεύονται ως ακέραιοι κωδικοί + λεξικό τιμών
+        "DstIP": "category",
+        "SrcPort": "UInt16",
+        "DstPort": "UInt16",
+        **_EVENT_COLUMNS
+    }
+}
+
+
+@timed("Schema (dtypes)", "schema")
+def apply_schema(df_structured, log_type):
+    """Μετατρέπει το structured frame στους τύπους του LOG_SCHEMAS (μία φορά κατά την εισαγωγή)"""
+    schema = LOG_SCHEMAS.get(log_type)
+    if schema is None or df_structured is None or df_structured.empty:
+        return df_structured
+
+    df_structured = df_structured.copy()
+    for column, dtype in schema.items():
+        if column not in df_structured.columns:
+            continue
+        try:
+            if dtype == "category":
+                df_structured[column] = df_structured[column].astype("category")
+            else:
+                converted = pd.to_numeric(df_structured[column], errors="coerce")
+                if converted.isna().sum() > df_structured[column].isna().sum():
+                    continue  # Υπάρχουν μη αριθμητικές τιμές - η στήλη μένει όπως ήταν
+                df_structured[column] = converted.astype(dtype)
+        except (TypeError, ValueError):
+            # Τιμές εκτός εύρους ή μη ακέραιες - η στήλη μένει όπως ήταν
+            continue
+    return df_structured
+
+
+def drop_unused_categories(df):
+    """Αφαιρεί τις κατηγορίες που δεν εμφανίζονται μετά το φιλτράρισμα (για value_counts/groupby)"""
+    df = df.copy()
+    for column in df.select_dtypes(include="category").columns:
+        df[column] = df[column].cat.remove_unused_categories()
+    return df
+
+
+def memory_usage(df):
+    """Μνήμη του frame σε bytes (μαζί με τα strings)"""
+    return int(df.memory_usage(deep=True).sum())
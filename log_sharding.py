@@ -0,0 +1,222 @@
+import os
+import re
+import functools
+import time
+import hashlib
+import tempfile
+import multiprocessing
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from log_jobs import JobCancelled, report_progress
+from log_perf import stage
+
+
+# Parsers που μπορούν να τρέξουν παράλληλα (ο LogCluster γράφει προσωρινά αρχεία στο cwd)
+SHARDABLE_PARSERS = {"Drain", "Spell", "IPLoM", "MoLFI"}
+MIN_SHARD_BYTES = 1024 * 1024  # Κάτω από αυτό δεν αξίζει το κόστος των processes
+COPY_BUFFER_SIZE = 1024 * 1024
+# Τα shards ξεκινούν από threads (Streamlit, JobQueue): με fork ένα lock κάποιου άλλου thread μπορεί
+# να μείνει κλειδωμένο στο νέο process, οπότε τα processes ξεκινούν πάντα με spawn
+MP_CONTEXT = "spawn"
+
+
+def plan_shards(log_path, workers, min_shard_bytes=None):
+    """Χωρίζει το αρχείο σε byte ranges που ξεκινούν και τελειώνουν σε αλλαγή γραμμής"""
+    if min_shard_bytes is None:
+        min_shard_bytes = MIN_SHARD_BYTES
+    size = os.path.getsize(log_path)
+    num_shards = max(1, min(int(workers), size // max(min_shard_bytes, 1)))
+    if num_shards <= 1:
+        return [(0, size)]
+
+    bounds = [0]
+    with open(log_path, "rb") as f:
+        for i in range(1, num_shards):
+            f.seek(max(size * i // num_shards, bounds[-1]))
+            f.readline()  # Ευθυγράμμιση στην επόμενη γραμμή
+            position = f.tell()
+            if bounds[-1] < position < size:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def write_shard(log_path, start, end, shard_path, buffer_size=COPY_BUFFER_SIZE):
+    """Αντιγράφει το byte range [start, end) σε ξεχωριστό αρχείο"""
+    with open(log_path, "rb") as src, open(shard_path, "wb") as dst:
+        src.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = src.read(min(buffer_size, remaining))
+            if not chunk:
+                break
+            dst.write(chunk)
+            remaining -= len(chunk)
+
+
+def _parse_shard(parse_fn, parser_choice, parser_args, shard_dir, shard_name, buffer_size, output):
+    """Τρέχει σε worker process: parse ενός shard με τον ίδιο parser και τις ίδιες παραμέτρους"""
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as shard_output_dir:
+        args = dict(parser_args, indir=shard_dir, outdir=shard_output_dir)
+        df_structured, df_templates, masking_report = parse_fn(parser_choice, args, shard_name, buffer_size, output)
+    return df_structured, df_templates, masking_report, time.perf_counter() - started
+
+
+def run_sharded(parse_fn, parser_choice, parser_args, log_path, workers, buffer_size=COPY_BUFFER_SIZE, output="memory"):
+    """Parse του αρχείου σε shards μέσω ProcessPoolExecutor και συγχώνευση των αποτελεσμάτων"""
+    started = time.perf_counter()
+    ranges = plan_shards(log_path, workers)
+    log_name = os.path.basename(log_path)
+
+    with tempfile.TemporaryDirectory() as shards_root:
+        jobs = []
+        with stage("Write shards", "io"):
+            for i, (start, end) in enumerate(ranges):
+                shard_dir = os.path.join(shards_root, f"shard_{i:03d}")
+                os.makedirs(shard_dir)
+                write_shard(log_path, start, end, os.path.join(shard_dir, log_name), buffer_size)
+                jobs.append(shard_dir)
+
+        with stage(f"Parse shards ({parser_choice})", "mining"), ProcessPoolExecutor(
+            max_workers=min(int(workers), len(jobs)), mp_context=multiprocessing.get_context(MP_CONTEXT)
+        ) as executor:
+            futures = [
+                executor.submit(_parse_shard, parse_fn, parser_choice, parser_args, shard_dir, log_name, buffer_size, output)
+                for shard_dir in jobs
+            ]
+            results = []
+            try:
+                for future in futures:  # Διατήρηση της σειράς των shards
+                    results.append(future.result())
+                    report_progress(len(results), len(futures), "Shards", "shards")
+            except JobCancelled:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    with stage("Merge shards", "mining"):
+        df_structured, df_templates = merge_shard_results([(s, t) for s, t, _, _ in results])
+    masking_report = merge_masking_reports([report for _, _, report, _ in results])
+    wall_time = time.perf_counter() - started
+    shard_time = sum(elapsed for _, _, _, elapsed in results)
+    stats = {
+        "workers": int(workers),
+        "shards": len(ranges),
+        "wall_time": wall_time,
+        "shard_time": shard_time,
+        # Μέση παραλληλία (χρόνος των shards / wall time) και όχι επιτάχυνση: δεν υπάρχει μέτρηση με ένα process
+        "parallelism": shard_time / wall_time if wall_time > 0 else 1.0
+    }
+    return df_structured, df_templates, masking_report, stats
+
+
+def merge_masking_reports(reports):
+    """Αθροίζει τις αναφορές masking των shards"""
+    reports = [r for r in reports if r is not None]
+    if not reports:
+        return None
+    merged = reports[0].copy()
+    for column in ("Hits", "Seconds"):
+        merged[column] = sum(r[column] for r in reports)
+    total = merged["Seconds"].sum() or 1.0
+    merged["Cost %"] = (100 * merged["Seconds"] / total).round(1)
+    return merged
+
+
+def merge_shard_results(results):
+    """Ενώνει τα structured frames των shards και συγχωνεύει τα templates σε ενιαίο πίνακα"""
+    frames = []
+    offset = 0
+    for df_structured, _ in results:
+        if df_structured is None or df_structured.empty:
+            continue
+        df_structured = df_structured.copy()
+        if "LineId" in df_structured.columns:
+            df_structured["LineId"] = df_structured["LineId"] + offset
+        offset += len(df_structured)
+        frames.append(df_structured)
+
+    if not frames:
+        return pd.DataFrame(), pd.DataFrame()
+
+    df_structured = pd.concat(frames, ignore_index=True)
+    if "EventTemplate" not in df_structured.columns:
+        return df_structured, pd.DataFrame()
+
+    templates = [t for t in df_structured["EventTemplate"].dropna().unique() if isinstance(t, str)]
+    mapping = merge_templates(templates)
+    changed = {old for old, new in mapping.items() if old != new}
+
+    if changed:
+        remapped = df_structured["EventTemplate"].isin(changed)
+        df_structured["EventTemplate"] = df_structured["EventTemplate"].map(lambda t: mapping.get(t, t))
+        if "ParameterList" in df_structured.columns:
+            df_structured.loc[remapped, "ParameterList"] = [
+                str(parameter_list(template, content))
+                for template, content in zip(
+                    df_structured.loc[remapped, "EventTemplate"],
+                    df_structured.loc[remapped, "Content"].astype(str)
+                )
+            ]
+
+    # Ίδιο σχήμα EventId με το logparser ώστε να ταιριάζει με το single-process parse
+    event_ids = {t: template_id(t) for t in df_structured["EventTemplate"].dropna().unique() if isinstance(t, str)}
+    df_structured["EventId"] = df_structured["EventTemplate"].map(event_ids)
+
+    occurrences = df_structured["EventTemplate"].value_counts()
+    df_templates = pd.DataFrame({"EventTemplate": df_structured["EventTemplate"].dropna().unique()})
+    df_templates["EventId"] = df_templates["EventTemplate"].map(event_ids)
+    df_templates["Occurrences"] = df_templates["EventTemplate"].map(occurrences)
+    return df_structured, df_templates[["EventId", "EventTemplate", "Occurrences"]]
+
+
+def merge_templates(templates):
+    """Αντιστοιχίζει κάθε template στο πιο γενικό template (ίδιου μήκους) που το καλύπτει"""
+    by_length = {}
+    for template in templates:
+        tokens = template.split()
+        by_length.setdefault(len(tokens), []).append((template, tokens))
+
+    mapping = {}
+    for group in by_length.values():
+        # Πρώτα τα πιο γενικά templates (περισσότερα <*>)
+        group.sort(key=lambda item: -item[1].count("<*>"))
+        kept = []
+        for template, tokens in group:
+            target = template
+            for general, general_tokens in kept:
+                if all(g == "<*>" or g == t for g, t in zip(general_tokens, tokens)):
+                    target = general
+                    break
+            if target == template:
+                kept.append((template, tokens))
+            mapping[template] = target
+    return mapping
+
+
+def template_id(template):
+    return hashlib.md5(template.encode("utf-8")).hexdigest()[0:8]
+
+
+def template_regex(template):
+    """Το regex του template όπως στο get_parameter_list του logparser (κάθε <*> γίνεται (.*?))"""
+    regex = re.sub(r"<.{1,5}>", "<*>", template)
+    regex = re.sub(r"([^A-Za-z0-9])", r"\\\1", regex)
+    regex = re.sub(r"\\ +", r"\\s+", regex)
+    return "^" + regex.replace(r"\<\*\>", "(.*?)") + "$"
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_template(template):
+    # Τα templates είναι πολύ περισσότερα από την cache του re (512)
+    return re.compile(template_regex(template))
+
+
+def parameter_list(template, content):
+    """Εξαγωγή παραμέτρων όπως στο get_parameter_list του logparser"""
+    if "<*>" not in re.sub(r"<.{1,5}>", "<*>", template):
+        return []
+    found = _compiled_template(template).findall(content)
+    found = found[0] if found else ()
+    return list(found) if isinstance(found, tuple) else [found]
@@ -0,0 +1,196 @@
+import os
+import re
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+from log_masking import MaskingEngine
+from log_columnar import read_parser_csv
+from log_sharding import SHARDABLE_PARSERS, parameter_list, run_sharded
+from log_archives import open_log
+from log_jobs import track_lines
+from log_perf import stage, timed
+
+
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+def logformat_regex(log_format):
+    """Headers και regex για το split των γραμμών (ίδιο με το generate_logformat_regex του logparser)"""
+    headers = []
+    regex = ""
+    for k, splitter in enumerate(re.split(r"(<[^<>]+>)", log_format)):
+        if k % 2 == 0:
+            regex += re.sub(" +", "\\\\s+", splitter)
+        else:
+            header = splitter.strip("<").strip(">")
+            regex += "(?P<%s>.*?)" % header
+            headers.append(header)
+    return headers, re.compile("^" + regex + "$")
+
+
+def split_log(log_path, log_format, buffer_size=READ_BUFFER_SIZE, line_filter=None):
+    """Split των γραμμών στα πεδία του log format. Επιστρέφει (df_log, αρχικές γραμμές) για όσες ταιριάζουν"""
+    with stage("Split log", "io") as span:
+        df_log, raw_lines = _split_lines(log_path, log_format, buffer_size, line_filter)
+        span["lines"] = len(df_log)
+    return df_log, raw_lines
+
+
+def _split_lines(log_path, log_format, buffer_size, line_filter):
+    headers, regex = logformat_regex(log_format)
+    rows = []
+    raw_lines = []
+    with open_log(log_path, buffer_size) as fin:
+        for line in track_lines(fin, log_path):
+            match = regex.search((line_filter(line) if line_filter else line).strip())
+            if match is None:
+                continue
+            rows.append([match.group(header) for header in headers])
+            raw_lines.append(line)
+    df_log = pd.DataFrame(rows, columns=headers)
+    df_log.insert(0, "LineId", range(1, len(df_log) + 1))
+    return df_log, raw_lines
+
+
+def run_keyed(parse_fn, parser_choice, parser_args, log_path, key_fields, buffer_size=READ_BUFFER_SIZE, output="memory", line_filter=None, workers=1):
+    """Parse με templates ανά κλειδί (π.χ. SID/Revision των Suricata alerts)
+
+    Κάθε γραμμή με κλειδί που έχει ήδη εμφανιστεί παίρνει το template της πρώτης γραμμής με το ίδιο
+    κλειδί, οπότε από τον parser περνάει μόνο μία γραμμή ανά κλειδί. Αν ένα κλειδί εμφανίζεται με
+    διαφορετικό Content (π.χ. επαναχρησιμοποιημένο SID), κάθε Content του μετράει ως ξεχωριστό κλειδί.
+    Τα EventId είναι αυτά του parser. Με workers > 1 οι γραμμές που περνάνε από τον parser χωρίζονται σε shards.
+    Επιστρέφει (structured, templates, masking_report, stats) όπως το run_sharded.
+    """
+    started = time.perf_counter()
+    df_log, raw_lines = split_log(log_path, parser_args["log_format"], buffer_size, line_filter)
+    if df_log.empty or not set(key_fields).issubset(df_log.columns):
+        return _run_grouped(parse_fn, parser_choice, parser_args, log_path, df_log, raw_lines, None, buffer_size, output, started, workers)
+
+    # Ο κωδικός κάθε κλειδιού είναι η σειρά πρώτης εμφάνισής του, άρα η γραμμή i του parser αντιστοιχεί στον κωδικό i
+    lookup_fields = list(dict.fromkeys(list(key_fields) + (["Content"] if "Content" in df_log.columns else [])))
+    codes = df_log.groupby(lookup_fields, sort=False, dropna=False).ngroup().to_numpy()
+    result = _run_grouped(parse_fn, parser_choice, parser_args, log_path, df_log, raw_lines, codes, buffer_size, output, started, workers)
+    result[3]["keys"] = len(df_log.drop_duplicates(list(key_fields))) if result[3]["keys"] is not None else None
+    return result
+
+
+def run_deduplicated(parse_fn, parser_choice, parser_args, log_path, buffer_size=READ_BUFFER_SIZE, output="memory", line_filter=None, workers=1):
+    """Parse μόνο των μοναδικών γραμμών μετά το masking με τα regex του parser
+
+    Οι γραμμές με ίδιο Content μετά το masking (π.χ. heartbeats, cron) δίνουν στον parser την ίδια
+    ακολουθία tokens, οπότε περνάει μόνο η πρώτη τους και οι υπόλοιπες παίρνουν το template της.
+    Με workers > 1 οι μοναδικές γραμμές χωρίζονται σε shards (run_sharded).
+    Επιστρέφει (structured, templates, masking_report, stats) με stats["keys"] = μοναδικές γραμμές.
+    """
+    started = time.perf_counter()
+    df_log, raw_lines = split_log(log_path, parser_args["log_format"], buffer_size, line_filter)
+    if df_log.empty or "Content" not in df_log.columns:
+        return _run_grouped(parse_fn, parser_choice, parser_args, log_path, df_log, raw_lines, None, buffer_size, output, started, workers)
+
+    # Masking μία φορά ανά διαφορετικό Content και ομαδοποίηση με βάση το αποτέλεσμα
+    with stage("Regex masking (dedup)", "masking", len(df_log)):
+        content_codes, contents = pd.factorize(df_log["Content"].fillna(""))
+        masked = MaskingEngine(parser_args.get("rex", [])).mask_all(contents.astype(str))
+        codes = pd.factorize(pd.Series(masked, dtype=object))[0][content_codes]
+    return _run_grouped(parse_fn, parser_choice, parser_args, log_path, df_log, raw_lines, codes, buffer_size, output, started, workers)
+
+
+def _run_grouped(parse_fn, parser_choice, parser_args, log_path, df_log, raw_lines, codes, buffer_size, output, started, workers=1):
+    """Parse της πρώτης γραμμής κάθε ομάδας (codes με σειρά πρώτης εμφάνισης) και επέκταση σε όλες τις γραμμές"""
+    log_name = os.path.basename(log_path)
+    stats = {"lines": len(df_log), "keys": None, "mined": len(df_log), "parse_time": 0.0, "shards": 1}
+    if codes is not None:
+        first_rows = np.flatnonzero(~pd.Series(codes).duplicated().to_numpy())
+        df_first, df_templates, masking_report = parse_lines(
+            parse_fn, parser_choice, parser_args, log_name, (raw_lines[i] for i in first_rows), buffer_size, workers, stats
+        )
+
+    if codes is None or len(df_first) != len(first_rows):
+        # Χωρίς ομάδες ή ο parser δεν έβγαλε μία γραμμή ανά ομάδα: κανονικό parse όλου του αρχείου
+        if int(workers) > 1 and parser_choice in SHARDABLE_PARSERS:
+            df_structured, df_templates, masking_report, shard_stats = run_sharded(
+                parse_fn, parser_choice, parser_args, log_path, workers, buffer_size, output
+            )
+            stats["shards"] = shard_stats["shards"]
+        else:
+            df_structured, df_templates, masking_report = parse_fn(parser_choice, parser_args, log_name, buffer_size, output)
+        stats["parse_time"] = time.perf_counter() - started
+        return df_structured, df_templates, masking_report, stats
+
+    stats["keys"] = len(first_rows)
+    stats["mined"] = len(first_rows)
+    df_structured = expand_keyed(df_log, codes, df_first)
+    df_templates = count_occurrences(df_templates, df_structured)
+
+    if output != "memory":
+        df_structured, df_templates = csv_roundtrip(df_structured, df_templates, parser_args["outdir"], log_name)
+
+    stats["parse_time"] = time.perf_counter() - started
+    return df_structured, df_templates, masking_report, stats
+
+
+def parse_lines(parse_fn, parser_choice, parser_args, log_name, lines, buffer_size=READ_BUFFER_SIZE, workers=1, stats=None):
+    """Parse μόνο των δοσμένων γραμμών (σε προσωρινό αρχείο με το ίδιο όνομα), με έξοδο στη μνήμη
+
+    Με workers > 1 το προσωρινό αρχείο περνάει από το run_sharded (shards μόνο αν είναι αρκετά μεγάλο)
+    και το πλήθος των shards γράφεται στο stats["shards"].
+    """
+    with tempfile.TemporaryDirectory() as lines_input_dir, tempfile.TemporaryDirectory() as lines_output_dir:
+        lines_path = os.path.join(lines_input_dir, log_name)
+        with open(lines_path, "w") as f:
+            f.writelines(lines)
+        args = dict(parser_args, indir=lines_input_dir, outdir=lines_output_dir)
+        if int(workers) > 1 and parser_choice in SHARDABLE_PARSERS:
+            df_structured, df_templates, masking_report, shard_stats = run_sharded(
+                parse_fn, parser_choice, args, lines_path, workers, buffer_size, "memory"
+            )
+            if stats is not None:
+                stats["shards"] = shard_stats["shards"]
+            return df_structured, df_templates, masking_report
+        return parse_fn(parser_choice, args, log_name, buffer_size, "memory")
+
+
+@timed("CSV write + pd.read_csv", "io", lines=lambda result: len(result[0]))
+def csv_roundtrip(df_structured, df_templates, outdir, log_name):
+    """Ίδια διαδρομή με το parse_log_file για output="csv": γράψιμο στο outdir και ανάγνωση πίσω"""
+    structured_path = os.path.join(outdir, log_name + "_structured.csv")
+    templates_path = os.path.join(outdir, log_name + "_templates.csv")
+    df_structured.to_csv(structured_path, index=False)
+    df_templates.to_csv(templates_path, index=False)
+    return read_parser_csv(structured_path, templates_path)
+
+
+@timed("Expand templates", "mining")
+def expand_keyed(df_log, codes, df_first):
+    """Απλώνει τις στήλες του parser (EventId, EventTemplate, ParameterList) από τη γραμμή κάθε κλειδιού σε όλες τις γραμμές του"""
+    df_structured = df_log.copy()
+    parsed_columns = [column for column in df_first.columns if column not in df_log.columns]
+    for column in parsed_columns:
+        if column != "ParameterList":
+            df_structured[column] = df_first[column].to_numpy()[codes]
+
+    if "ParameterList" in parsed_columns:
+        # Οι παράμετροι εξαρτώνται από το Content: ξαναϋπολογίζονται μόνο όπου διαφέρει από της πρώτης γραμμής
+        params = df_first["ParameterList"].to_numpy(dtype=object)[codes]
+        contents = df_structured["Content"].to_numpy(dtype=object)
+        differs = np.flatnonzero(contents != df_first["Content"].to_numpy(dtype=object)[codes])
+        templates = df_structured["EventTemplate"].to_numpy(dtype=object)
+        computed = {}
+        for i in differs:
+            key = (templates[i], contents[i])
+            if key not in computed:
+                computed[key] = str(parameter_list(str(templates[i]), str(contents[i])))
+            params[i] = computed[key]
+        df_structured["ParameterList"] = params
+    return df_structured
+
+
+def count_occurrences(df_templates, df_structured):
+    """Τα Occurrences του πίνακα templates για όλες τις γραμμές (και όχι μόνο για μία ανά κλειδί)"""
+    if df_templates.empty or "Occurrences" not in df_templates.columns or "EventId" not in df_structured.columns:
+        return df_templates
+    df_templates = df_templates.copy()
+    counts = df_structured["EventId"].value_counts()
+    df_templates["Occurrences"] = df_templates["EventId"].map(counts).fillna(0).astype("int64")
+    return df_templates
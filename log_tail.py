@@ -0,0 +1,158 @@
+import os
+import numpy as np
+import pandas as pd
+from logparser.Drain.Drain import Logcluster, Node
+from log_utils import PARSER_FACTORY
+from log_sharding import template_id, parameter_list
+from log_masking import MaskingEngine
+
+
+# Τύποι log που υποστηρίζουν live tail
+TAIL_LOG_TYPES = ["Linux", "Mac", "Suricata"]
+
+
+class DrainTailer:
+    """Incremental Drain πάνω σε αρχείο που μεγαλώνει: κρατάει το parse tree και διαβάζει μόνο τις νέες γραμμές
+
+    Το prepare (π.χ. schema + timestamps) εφαρμόζεται μόνο στις νέες γραμμές πριν προστεθούν στο df_structured,
+    οπότε κάθε ανανέωση κοστίζει ανάλογα με τις νέες γραμμές και όχι με όλο το frame.
+    """
+
+    def __init__(self, log_path, log_format, regex, depth, threshold, encoding="utf-8", prepare=None):
+        self.log_path = log_path
+        self.encoding = encoding
+        self.prepare = prepare
+        log_dir = os.path.dirname(os.path.abspath(log_path))
+        self.parser = PARSER_FACTORY["Drain"]({
+            "log_format": log_format,
+            "indir": log_dir,
+            "outdir": log_dir,
+            "depth": depth,
+            "threshold": threshold,
+            "rex": regex
+        })
+        self.headers, self.line_regex = self.parser.generate_logformat_regex(log_format)
+        self.masking = MaskingEngine(regex)
+        self.reset()
+
+    def reset(self):
+        """Μηδενίζει την κατάσταση (π.χ. μετά από rotation ή truncate του αρχείου)"""
+        self.offset = 0
+        self.root = Node()
+        self.clusters = []
+        self.cluster_index = {}
+        self.row_clusters = np.empty(0, dtype=np.int64)
+        self.df_structured = pd.DataFrame(columns=["LineId"] + self.headers + ["EventId", "EventTemplate", "ParameterList"])
+
+    def read_new_lines(self):
+        """Διαβάζει τις ολοκληρωμένες γραμμές από το τελευταίο byte offset"""
+        size = os.path.getsize(self.log_path)
+        if size < self.offset:
+            self.reset()
+        if size == self.offset:
+            return []
+
+        with open(self.log_path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+
+        # Η τελευταία γραμμή μπορεί να είναι μισή - την αφήνουμε για την επόμενη ανανέωση
+        end = data.rfind(b"\n")
+        if end < 0:
+            return []
+        self.offset += end + 1
+        return data[:end + 1].decode(self.encoding, errors="replace").splitlines()
+
+    def update(self):
+        """Parse μόνο των νέων γραμμών και ενημέρωση του structured frame. Επιστρέφει πόσες γραμμές προστέθηκαν"""
+        rows = []
+        row_clusters = []
+        changed = set()
+        content_pos = self.headers.index("Content")
+
+        for line in self.read_new_lines():
+            match = self.line_regex.search(line.strip())
+            if match is not None:
+                rows.append([match.group(header) for header in self.headers])
+
+        if not rows:
+            return 0
+
+        masked_contents = self.masking.mask_all(message[content_pos] for message in rows)
+        for masked in masked_contents:
+            tokens = masked.strip().split()
+
+            # Ίδια λογική με το Drain.parse
+            cluster = self.parser.treeSearch(self.root, tokens)
+            if cluster is None:
+                cluster = Logcluster(logTemplate=tokens)
+                self.cluster_index[id(cluster)] = len(self.clusters)
+                self.clusters.append(cluster)
+                self.parser.addSeqToPrefixTree(self.root, cluster)
+            else:
+                new_template = self.parser.getTemplate(tokens, cluster.logTemplate)
+                if new_template != cluster.logTemplate:
+                    cluster.logTemplate = new_template
+                    changed.add(self.cluster_index[id(cluster)])
+
+            row_clusters.append(self.cluster_index[id(cluster)])
+
+        # Ενημέρωση παλιών γραμμών που το template τους γενικεύτηκε
+        templates = [" ".join(cluster.logTemplate) for cluster in self.clusters]
+        event_ids = [template_id(t) for t in templates]
+        if changed and len(self.df_structured):
+            stale = np.isin(self.row_clusters, list(changed))
+            if stale.any():
+                self._assign_templates(self.df_structured, stale, self.row_clusters[stale], templates, event_ids)
+
+        new_df = pd.DataFrame(rows, columns=self.headers)
+        start = len(self.df_structured)
+        new_df.insert(0, "LineId", range(start + 1, start + len(new_df) + 1))
+        new_clusters = np.asarray(row_clusters, dtype=np.int64)
+        self._assign_templates(new_df, slice(None), new_clusters, templates, event_ids)
+        if self.prepare is not None:
+            new_df = self.prepare(new_df)
+
+        if self.df_structured.empty:
+            self.df_structured = new_df
+        else:
+            self.df_structured = _append_rows(self.df_structured, new_df)
+        self.row_clusters = np.concatenate([self.row_clusters, new_clusters])
+        return len(new_df)
+
+    def _assign_templates(self, df, rows, cluster_ids, templates, event_ids):
+        row_templates = [templates[i] for i in cluster_ids]
+        row_event_ids = [event_ids[i] for i in cluster_ids]
+        for column, values in (("EventTemplate", row_templates), ("EventId", row_event_ids)):
+            if column in df.columns and isinstance(df[column].dtype, pd.CategoricalDtype):
+                # Τα γενικευμένα templates είναι νέες κατηγορίες της στήλης
+                missing = pd.Index(values).unique().difference(df[column].cat.categories)
+                if len(missing):
+                    df[column] = df[column].cat.add_categories(missing)
+            df.loc[rows, column] = values
+        df.loc[rows, "ParameterList"] = [
+            str(parameter_list(t, content))
+            for t, content in zip(row_templates, df.loc[rows, "Content"])
+        ]
+
+    def templates(self):
+        """Πίνακας templates στη μορφή του logparser (EventId, EventTemplate, Occurrences)"""
+        occurrences = self.df_structured["EventTemplate"].value_counts()
+        df_templates = pd.DataFrame({"EventTemplate": self.df_structured["EventTemplate"].unique()})
+        df_templates["EventId"] = df_templates["EventTemplate"].map(template_id)
+        df_templates["Occurrences"] = df_templates["EventTemplate"].map(occurrences)
+        return df_templates[["EventId", "EventTemplate", "Occurrences"]]
+
+
+def _append_rows(df, new_df):
+    """Προσθέτει τις νέες γραμμές κρατώντας τις category στήλες ως category (με την ένωση των κατηγοριών)"""
+    new_df = new_df.copy()
+    for column in df.columns.intersection(new_df.columns):
+        old, new = df[column], new_df[column]
+        if not (isinstance(old.dtype, pd.CategoricalDtype) and isinstance(new.dtype, pd.CategoricalDtype)):
+            continue
+        missing = new.cat.categories.difference(old.cat.categories)
+        if len(missing):
+            df[column] = old.cat.add_categories(missing)
+        new_df[column] = new.cat.set_categories(df[column].cat.categories)
+    return pd.concat([df, new_df], ignore_index=True)
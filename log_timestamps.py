@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+from log_perf import timed
+
+
+TIMESTAMP_COLUMN = "datetime"
+
+# Πεδία του log format από τα οποία προκύπτει το timestamp ανά τύπο log
+TIMESTAMP_FIELDS = {
+    "Windows": ["Date", "Time"],                         # 2016-09-27 05:47:51
+    "Linux": ["Month", "Date", "Time"],                  # Jun  9 03:31:48 (syslog, χωρίς έτος)
+    "Mac": ["Month", "Date", "Time"],
+    "Suricata": ["Month", "Date", "Year", "Time"]        # 01/11/2024-17:22:51.804108 (+ Ms)
+}
+SYSLOG_LOG_TYPES = {"Linux", "Mac"}
+DATE_FORMATS = {"Windows": "%Y-%m-%d"}
+TIME_FORMAT = "%H:%M:%S"
+
+# Σταθερά ονόματα μηνών (όχι calendar.month_abbr που εξαρτάται από το locale)
+MONTH_NUMBERS = {
+    name: number for number, name in enumerate(
+        ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], start=1
+    )
+}
+ROLLOVER_MONTHS = 6  # Πτώση μήνα μεγαλύτερη από αυτή σημαίνει αλλαγή έτους (π.χ. Dec -> Jan)
+
+
+@timed("Datetime", "timestamps")
+def normalize_timestamps(df_structured, log_type, reference=None):
+    """Προσθέτει τη στήλη datetime μία φορά κατά την εισαγωγή, με ρητό format ανά τύπο log
+
+    Κάθε πεδίο (ημερομηνία, ώρα, μήνας κλπ) έχει λίγες διαφορετικές τιμές, οπότε γίνεται parse
+    μία φορά ανά μοναδική τιμή. Οι γραμμές με μη έγκυρο timestamp παίρνουν NaT (όπως με errors="coerce").
+    """
+    fields = TIMESTAMP_FIELDS.get(log_type)
+    if fields is None or df_structured is None or df_structured.empty:
+        return df_structured
+    if not set(fields).issubset(df_structured.columns):
+        return df_structured
+
+    times = _parse_distinct(df_structured["Time"], _parse_times, np.timedelta64("NaT", "ns"))
+    if log_type in SYSLOG_LOG_TYPES:
+        months = _parse_distinct(df_structured["Month"], _month_numbers, np.nan)
+        days = _parse_distinct(df_structured["Date"], _numbers, np.nan)
+        dates = dates_from_parts(infer_syslog_years(months, reference), months, days)
+    elif log_type == "Suricata":
+        years = _parse_distinct(df_structured["Year"], _numbers, np.nan)
+        months = _parse_distinct(df_structured["Month"], _numbers, np.nan)
+        days = _parse_distinct(df_structured["Date"], _numbers, np.nan)
+        dates = dates_from_parts(years, months, days)
+        if "Ms" in df_structured.columns:
+            times = times + _microseconds(df_structured["Ms"]).astype("timedelta64[us]")
+    else:
+        date_format = DATE_FORMATS[log_type]
+        dates = _parse_distinct(
+            df_structured["Date"], lambda values: _parse_dates(values, date_format), np.datetime64("NaT", "ns")
+        )
+
+    timestamps = pd.Series(dates + times, index=df_structured.index)
+    return df_structured.assign(**{TIMESTAMP_COLUMN: timestamps})
+
+
+def infer_syslog_years(months, reference=None):
+    """Έτος ανά γραμμή για syslog timestamps χωρίς έτος
+
+    Οι γραμμές είναι με χρονολογική σειρά: κάθε μεγάλη πτώση μήνα (Dec -> Jan) είναι αλλαγή έτους.
+    Οι τελευταίες γραμμές παίρνουν το τρέχον έτος, εκτός αν έτσι θα ήταν στο μέλλον.
+    """
+    reference = pd.Timestamp.now() if reference is None else pd.Timestamp(reference)
+    filled = pd.Series(months, dtype=float).ffill()
+    rollovers = ((filled.shift() - filled) > ROLLOVER_MONTHS).cumsum().to_numpy()
+
+    last_year = reference.year
+    last_month = filled.iloc[-1] if len(filled) else np.nan
+    if not np.isnan(last_month) and last_month > reference.month:
+        last_year -= 1
+    total = rollovers[-1] if len(rollovers) else 0
+    return (last_year - total + rollovers).astype(float)
+
+
+def dates_from_parts(years, months, days):
+    """datetime64 από αριθμητικούς πίνακες έτους/μήνα/ημέρας - NaT για κενές ή μη έγκυρες ημερομηνίες (π.χ. 30 Φεβ)"""
+    years, months, days = (np.asarray(values, dtype=float) for values in (years, months, days))
+    valid = ~(np.isnan(years) | np.isnan(months) | np.isnan(days))
+    valid &= (months >= 1) & (months <= 12) & (days >= 1) & (days <= 31)
+
+    y = np.where(valid, years, 1970).astype(np.int64)
+    m = np.where(valid, months, 1).astype(np.int64)
+    d = np.where(valid, days, 1).astype(np.int64)
+    month_start = (y - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (m - 1).astype("timedelta64[M]")
+    dates = month_start.astype("datetime64[D]") + (d - 1).astype("timedelta64[D]")
+    valid &= dates.astype("datetime64[M]") == month_start  # Η ημέρα δεν "ξεχειλώνει" στον επόμενο μήνα
+
+    dates = dates.astype("datetime64[ns]")
+    dates[~valid] = np.datetime64("NaT")
+    return dates
+
+
+def _parse_distinct(series, parse, missing):
+    """Εφαρμόζει το parse μία φορά ανά μοναδική τιμή και απλώνει το αποτέλεσμα στις γραμμές"""
+    codes, uniques = pd.factorize(series)
+    parsed = np.asarray(parse(pd.Series(uniques).astype(str)))
+    parsed = np.append(parsed, np.array([missing], dtype=parsed.dtype))
+    return parsed[codes]  # Ο κωδικός -1 (κενή τιμή) δείχνει στο τελευταίο στοιχείο
+
+
+def _month_numbers(values):
+    return np.array([MONTH_NUMBERS.get(value.strip().title(), np.nan) for value in values], dtype=float)
+
+
+def _numbers(values):
+    return pd.to_numeric(values, errors="coerce").astype(float).to_numpy()
+
+
+def _parse_times(values):
+    times = pd.to_datetime(values, format=TIME_FORMAT, errors="coerce")
+    return (times - pd.Timestamp("1900-01-01")).to_numpy(dtype="timedelta64[ns]")
+
+
+def _parse_dates(values, date_format):
+    """Ρητό format - μόνο όσες τιμές αποτύχουν περνάνε από την αυτόματη αναγνώριση"""
+    dates = pd.to_datetime(values, format=date_format, errors="coerce")
+    failed = dates.isna()
+    if failed.any():
+        dates[failed] = pd.to_datetime(values[failed], format="mixed", errors="coerce")
+    return dates.to_numpy(dtype="datetime64[ns]")
+
+
+def _microseconds(ms):
+    """Το δεκαδικό μέρος των δευτερολέπτων (π.χ. '804108' ή '8041') σε μικροδευτερόλεπτα - 0 αν λείπει"""
+    if pd.api.types.is_numeric_dtype(ms):
+        # Διαβασμένο ως αριθμός (π.χ. pd.read_csv): τα μηδενικά της αρχής έχουν χαθεί ("008629" -> 8629)
+        ms = ms.astype("Int64").astype(str).str.zfill(6)
+    digits = ms.astype(str).str.strip().str[:6].str.ljust(6, "0")
+    try:
+        return digits.astype("int64").to_numpy()
+    except (TypeError, ValueError):
+        return pd.to_numeric(digits, errors="coerce").fillna(0).astype("int64").to_numpy()
@@ -0,0 +1,15 @@
+import importlib
+
+
+# Το module κάθε τύπου log (LOG_FORMAT, LOG_REGEX, DASHBOARD, KEY_FIELDS κλπ)
+LOG_MODULES = {
+    "Windows": "windows_logs3",
+    "Linux": "linux_logs2",
+    "Mac": "mac_logs4",
+    "Suricata": "suricata_logs4"
+}
+
+
+def log_module(log_type):
+    """Το module ενός τύπου log (εισάγεται όταν ζητηθεί, αφού τα modules εισάγουν το log_utils)"""
+    return importlib.import_module(LOG_MODULES[log_type])
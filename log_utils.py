@@ -1,7 +1,19 @@
 import os
+import re
+import shutil
 import tempfile
+from contextlib import nullcontext
 import pandas as pd
-import streamlit as st
+from log_cache import hash_upload, hash_uploads, make_cache_key, load_cached_result, store_cached_result
+from log_sharding import SHARDABLE_PARSERS, run_sharded
+from log_signatures import run_keyed, run_deduplicated
+from log_library import TemplateLibrary, library_key, run_with_library
+from log_masking import MaskingEngine, PrecomputedPreprocess
+from log_columnar import capture_parser_output, normalize_structured, normalize_templates, read_parser_csv, write_parquet
+from log_jobs import report_progress, track_lines, notify
+from log_perf import stage, timed
+from log_archives import detect_compression, order_segments, merged_log_name, virtual_log, open_log, materialize_log
+from log_sampling import write_sample
 from logparser.Drain import LogParser as DrainParser
 from logparser.Spell import LogParser as SpellParser
 from logparser.LogCluster import LogParser as LogClusterParser
@@ -140,22 +152,235 @@ PARSER_PARAM_TYPES = {
     "MoLFI": {}
 }
 
-def run_parser(uploaded_file, parser_choice, log_format, regex, **kwargs):
+# Μέγεθος buffer για το γράψιμο του upload στο δίσκο και την ανάγνωση γραμμών
+SPOOL_BUFFER_SIZE = 1024 * 1024
+
+# Προεπεξεργασία γραμμής που κάνει ο κάθε parser πριν το split (ίδια με το logparser)
+STREAM_LINE_FILTERS = {
+    "Spell": lambda line: re.sub(r"[^\x00-\x7F]+", "<NASCII>", line)
+}
+
+@timed("Spool upload", "io", lines=None)
+def spool_upload(uploaded_file, dest_path, buffer_size=SPOOL_BUFFER_SIZE):
+    """Γράφει το upload στο δίσκο σε κομμάτια σταθερού μεγέθους"""
+    uploaded_file.seek(0)
+    with open(dest_path, "wb") as f:
+        shutil.copyfileobj(uploaded_file, f, buffer_size)
+    uploaded_file.seek(0)
+
+def make_streaming_loader(buffer_size=SPOOL_BUFFER_SIZE, line_filter=None):
+    """Αντικαθιστά το log_to_dataframe του logparser με ανάγνωση γραμμή-γραμμή αντί για readlines()"""
+    @timed("Read + split", "io")
+    def log_to_dataframe(log_file, regex, headers, logformat):
+        log_messages = []
+        with open_log(log_file, buffer_size) as fin:
+            for line in track_lines(fin, log_file):
+                if line_filter:
+                    line = line_filter(line)
+                match = regex.search(line.strip())
+                if match is None:
+                    print("[Warning] Skip line: " + line)
+                    continue
+                log_messages.append([match.group(header) for header in headers])
+        logdf = pd.DataFrame(log_messages, columns=headers)
+        logdf.insert(0, "LineId", range(1, len(logdf) + 1))
+        report_progress(0, None, "Mining")  # Οι Drain/Spell αναφέρουν από εδώ και πέρα την πρόοδο μέσω του masking
+        return logdf
+    return log_to_dataframe
+
+def enable_streaming_reader(parser, parser_choice, buffer_size=SPOOL_BUFFER_SIZE):
+    """Ενεργοποιεί το streaming reader στους parsers που διαβάζουν μέσω log_to_dataframe"""
+    if hasattr(parser, "log_to_dataframe"):
+        parser.log_to_dataframe = make_streaming_loader(buffer_size, STREAM_LINE_FILTERS.get(parser_choice))
+    return parser
+
+# Parsers που κάνουν masking μέσω parser.preprocess (μπορεί να γίνει από πριν σε batches)
+BATCH_MASKING_PARSERS = {"Drain", "Spell"}
+
+def enable_batch_masking(parser, parser_choice, regex):
+    """Υπολογίζει το masking όλων των γραμμών σε batches αμέσως μετά τη φόρτωση του df_log"""
+    if parser_choice not in BATCH_MASKING_PARSERS or not hasattr(parser, "log_to_dataframe"):
+        return None
+
+    engine = MaskingEngine(regex)
+    load = parser.log_to_dataframe
+
+    def log_to_dataframe(log_file, regex, headers, logformat):
+        logdf = load(log_file, regex, headers, logformat)
+        with stage("Regex masking", "masking", len(logdf)):
+            parser.preprocess = PrecomputedPreprocess(engine, logdf["Content"])
+        return logdf
+
+    parser.log_to_dataframe = log_to_dataframe
+    return engine
+
+# Parsers που δεν επηρεάζονται από επαναλαμβανόμενες γραμμές (οι IPLoM, LogCluster και MoLFI
+# χρησιμοποιούν τις συχνότητες των γραμμών, οπότε η συγχώνευση, ανά Content ή ανά κλειδί, θα άλλαζε τα templates τους)
+DEDUP_PARSERS = {"Drain", "Spell"}
+
+def make_parser_args(log_format, regex, indir, outdir, **params):
+    """Τα args του PARSER_FACTORY για ένα log format και τις παραμέτρους του parser"""
+    parser_args = {
+        "log_format": log_format,
+        "indir": indir,
+        "outdir": outdir,
+        "rex": regex
+    }
+    parser_args.update(params)
+    return parser_args
+
+def parse_log_file(parser_choice, parser_args, log_name, buffer_size=SPOOL_BUFFER_SIZE, output="memory"):
+    """Τρέχει τον parser πάνω σε αρχείο του indir και επιστρέφει τα αποτελέσματα
+
+    Με output="memory" τα frames του parser παραδίδονται απευθείας (χωρίς CSV),
+    με output="csv" γράφονται στο outdir και διαβάζονται πίσω με pd.read_csv.
+    """
+    parser = enable_streaming_reader(PARSER_FACTORY[parser_choice](parser_args), parser_choice, buffer_size)
+    if not hasattr(parser, "log_to_dataframe"):
+        # Ο parser ανοίγει μόνος του το αρχείο (π.χ. MoLFI): τα συμπιεσμένα segments γράφονται ως ένα αρχείο
+        materialize_log(os.path.join(parser_args["indir"], log_name), buffer_size)
+    masking = enable_batch_masking(parser, parser_choice, parser_args.get("rex", []))
+    structured_name = log_name + "_structured.csv"
+    templates_name = log_name + "_templates.csv"
+
+    # Το στάδιο του parser περιλαμβάνει ανάγνωση, masking, mining και (με output="csv") το γράψιμο των CSV
+    if output == "memory":
+        with capture_parser_output(parser_args["outdir"]) as captured, stage(f"Parser ({parser_choice})", "mining"):
+            parser.parse(log_name)
+        df_structured = normalize_structured(captured.get(structured_name, pd.DataFrame()))
+        df_templates = normalize_templates(captured.get(templates_name, pd.DataFrame()))
+    else:
+        with stage(f"Parser ({parser_choice})", "mining"):
+            parser.parse(log_name)
+
+        # Ανάγνωση αποτελεσμάτων
+        structured_path = os.path.join(parser_args["outdir"], structured_name)
+        templates_path = os.path.join(parser_args["outdir"], templates_name)
+
+        with stage("pd.read_csv", "io") as span:
+            df_structured, df_templates = read_parser_csv(structured_path, templates_path)
+            span["lines"] = len(df_structured)
+
+    masking_report = masking.report() if masking is not None else None
+    return df_structured, df_templates, masking_report
+
+def mine_log_file(parser_choice, parser_args, log_path, buffer_size=SPOOL_BUFFER_SIZE, output="memory", workers=1, key_fields=None, deduplicate=False):
+    """Parse ενός αρχείου του indir: ανά κλειδί (key_fields), μόνο των μοναδικών γραμμών (deduplicate),
+    σε shards (workers > 1) ή με ένα process
+
+    Προτεραιότητα: key_fields, μετά deduplicate (και τα δύο μόνο για τους DEDUP_PARSERS) και μετά shards. Το workers
+    ισχύει και στα δύο πρώτα: οι γραμμές που περνάνε από τον parser (μία ανά κλειδί ή ανά μοναδικό Content)
+    χωρίζονται σε shards, όταν είναι αρκετές για το MIN_SHARD_BYTES του log_sharding.
+    Επιστρέφει (structured, templates, masking_report, μηνύματα για το UI).
+    """
+    if key_fields and parser_choice in DEDUP_PARSERS:
+        # Templates ανά κλειδί: από τον parser περνάει μόνο η πρώτη γραμμή κάθε κλειδιού
+        df_structured, df_templates, masking_report, stats = run_keyed(
+            parse_log_file, parser_choice, parser_args, log_path, key_fields, buffer_size, output,
+            STREAM_LINE_FILTERS.get(parser_choice), workers
+        )
+        messages = [] if stats["keys"] is None else [
+            f"⚡ {stats['lines']:,} γραμμές με {stats['keys']:,} διαφορετικά {'/'.join(key_fields)}: "
+            f"μόνο {stats['mined']:,} γραμμές στον {parser_choice}{shards_note(stats)} ({stats['parse_time']:.1f}s)"
+        ]
+    elif deduplicate and parser_choice in DEDUP_PARSERS:
+        # Από τον parser περνάει μόνο η πρώτη από τις γραμμές με ίδιο Content μετά το masking
+        df_structured, df_templates, masking_report, stats = run_deduplicated(
+            parse_log_file, parser_choice, parser_args, log_path, buffer_size, output, STREAM_LINE_FILTERS.get(parser_choice), workers
+        )
+        messages = [] if stats["keys"] is None else [
+            f"🧬 {stats['lines']:,} γραμμές → {stats['keys']:,} μοναδικές μετά το masking{shards_note(stats)} "
+            f"(dedup x{stats['lines'] / max(stats['keys'], 1):.1f}, {stats['parse_time']:.1f}s)"
+        ]
+    elif int(workers) > 1 and parser_choice in SHARDABLE_PARSERS:
+        # Παράλληλο parse σε shards και συγχώνευση των templates (τα shards κόβονται σε byte offsets του αρχείου)
+        materialize_log(log_path, buffer_size)
+        df_structured, df_templates, masking_report, stats = run_sharded(
+            parse_log_file, parser_choice, parser_args, log_path, workers, buffer_size, output
+        )
+        messages = [
+            f"⚡ Parse σε {stats['shards']} shards με {stats['workers']} workers: "
+            f"{stats['wall_time']:.1f}s (παραλληλία x{stats['parallelism']:.1f})"
+        ]
+    else:
+        df_structured, df_templates, masking_report = parse_log_file(
+            parser_choice, parser_args, os.path.basename(log_path), buffer_size, output
+        )
+        messages = []
+    return df_structured, df_templates, masking_report, messages
+
+def shards_note(stats):
+    return f" σε {stats['shards']} shards" if stats.get("shards", 1) > 1 else ""
+
+def mining_cache_params(parser_choice, workers=1, key_fields=None, deduplicate=False):
+    """Οι ρυθμίσεις του mine_log_file που αλλάζουν το αποτέλεσμα, για το κλειδί του cache"""
+    cache_params = {}
+    if key_fields and parser_choice in DEDUP_PARSERS:
+        cache_params["key_fields"] = list(key_fields)
+    elif deduplicate and parser_choice in DEDUP_PARSERS:
+        cache_params["deduplicate"] = True
+    if int(workers) > 1 and parser_choice in SHARDABLE_PARSERS:
+        cache_params["workers"] = int(workers)
+    return cache_params
+
+@timed("Spool segments", "io", lines=None)
+def spool_segments(uploaded_files, segments_dir, buffer_size=SPOOL_BUFFER_SIZE):
+    """Γράφει τα uploads όπως είναι (χωρίς αποσυμπίεση) στο segments_dir με τη σειρά τους"""
+    os.makedirs(segments_dir, exist_ok=True)
+    segment_paths = []
+    for i, uploaded_file in enumerate(uploaded_files):
+        segment_path = os.path.join(segments_dir, f"{i:03d}_{os.path.basename(uploaded_file.name)}")
+        spool_upload(uploaded_file, segment_path, buffer_size)
+        segment_paths.append(segment_path)
+    return segment_paths
+
+def run_parser(uploaded_file, parser_choice, log_format, regex, use_cache=True, spool_buffer_size=SPOOL_BUFFER_SIZE, workers=1, output="memory", parquet_path=None, key_fields=None, use_library=False, deduplicate=True, preview=False, **kwargs):
+    """Parse ενός upload (ή των rotated αρχείων ενός log) και επιστροφή (df_structured, df_templates)
+
+    Με preview=True γίνεται parse μόνο ενός στρωματοποιημένου δείγματος του log (write_sample) και το
+    df_structured.attrs["preview"] κρατάει τα στοιχεία του δείγματος για τις εκτιμήσεις των dashboards.
+    Το αποτέλεσμα της προεπισκόπησης δεν γράφεται σε cache, βιβλιοθήκη templates ή Parquet.
+    """
     try:
+        # Ένα upload ή πολλά (rotated αρχεία, π.χ. syslog.2.gz, syslog.1, syslog) με χρονολογική σειρά
+        uploaded_files = order_segments(uploaded_file) if isinstance(uploaded_file, (list, tuple)) else [uploaded_file]
+        if not uploaded_files:
+            return pd.DataFrame(), pd.DataFrame()
+        single_plain = len(uploaded_files) == 1 and detect_compression(uploaded_files[0]) is None
+
+        # Έλεγχος cache πριν από οποιοδήποτε parse
+        library = None
+        if use_library:
+            library = TemplateLibrary(library_key(parser_choice, log_format, regex, kwargs), parser_choice, log_format)
+
+        cache_key = None
+        if use_cache:
+            cache_params = dict(kwargs, output=output, **mining_cache_params(parser_choice, workers, key_fields, deduplicate))
+            if library is not None:
+                # Το αποτέλεσμα εξαρτάται από τα templates που ήταν στη βιβλιοθήκη πριν από το parse
+                cache_params["library"] = library.fingerprint()
+            content_hash = hash_upload(uploaded_files[0]) if len(uploaded_files) == 1 else hash_uploads(uploaded_files)
+            cache_key = make_cache_key(content_hash, parser_choice, log_format, regex, cache_params)
+            cached = load_cached_result(cache_key)
+            if cached is not None:
+                # Με έτοιμο το πλήρες αποτέλεσμα η προεπισκόπηση δεν χρειάζεται
+                if parquet_path and not preview:
+                    write_parquet(*cached, parquet_path)
+                return cached
+
         with tempfile.TemporaryDirectory() as tmp_input_dir, tempfile.TemporaryDirectory() as tmp_output_dir:
-            # Αποθήκευση αρχείου
-            temp_log_path = os.path.join(tmp_input_dir, uploaded_file.name)
-            with open(temp_log_path, "wb") as f:
-                f.write(uploaded_file.read())
+            # Αποθήκευση αρχείου: τα συμπιεσμένα/rotated αρχεία μένουν ως έχουν και διαβάζονται ως ένα log
+            # με αποσυμπίεση κατά την ανάγνωση (virtual log), χωρίς αποσυμπιεσμένο αντίγραφο στο δίσκο
+            if single_plain:
+                temp_log_path = os.path.join(tmp_input_dir, uploaded_files[0].name)
+                spool_upload(uploaded_files[0], temp_log_path, spool_buffer_size)
+                segment_paths = None
+            else:
+                temp_log_path = os.path.join(tmp_input_dir, merged_log_name(uploaded_files))
+                segment_paths = spool_segments(uploaded_files, os.path.join(tmp_input_dir, "segments"), spool_buffer_size)
 
             # Δημιουργία args
-            parser_args = {
-                "log_format": log_format,
-                "indir": tmp_input_dir,
-                "outdir": tmp_output_dir,
-                "rex": regex
-            }
-            parser_args.update(kwargs)
+            parser_args = make_parser_args(log_format, regex, tmp_input_dir, tmp_output_dir, **kwargs)
 
             # Έλεγχος παραμέτρων
             param_types = PARSER_PARAM_TYPES.get(parser_choice, {})
@@ -164,26 +389,60 @@ def run_parser(uploaded_file, parser_choice, log_format, regex, **kwargs):
                     if key in kwargs:
                         kwargs[key] = expected_type(kwargs[key])
                 except ValueError:
-                    st.error(f"❗ Η παράμετρος '{key}' πρέπει να είναι τύπου {expected_type.__name__}.")
-                    st.stop()
+                    notify("error", f"❗ Η παράμετρος '{key}' πρέπει να είναι τύπου {expected_type.__name__}.")
+                    return pd.DataFrame(), pd.DataFrame()
                     
-            # Απόκτηση parser
-            parser_factory = PARSER_FACTORY.get(parser_choice)
-            if not parser_factory:
-                st.warning("Άγνωστος parser.")
+            # Έλεγχος parser
+            if parser_choice not in PARSER_FACTORY:
+                notify("warning", "Άγνωστος parser.")
                 return pd.DataFrame(), pd.DataFrame()
 
-            parser = parser_factory(parser_args)
-            parser.parse(uploaded_file.name)
+            def mine(args, log_path, out):
+                return mine_log_file(parser_choice, args, log_path, spool_buffer_size, out, workers, key_fields, deduplicate)
+
+            with virtual_log(temp_log_path, segment_paths) if segment_paths else nullcontext():
+                if segment_paths:
+                    notify("info", f"🗜️ {len(segment_paths)} αρχεία ως ένα log `{os.path.basename(temp_log_path)}`: "
+                            + " → ".join(f.name for f in uploaded_files))
+
+                if preview:
+                    # Το δείγμα γράφεται σε ξεχωριστό indir με το ίδιο όνομα log και περνάει από τον parser με ένα process
+                    sample_dir = os.path.join(tmp_input_dir, "preview")
+                    sample_path = os.path.join(sample_dir, os.path.basename(temp_log_path))
+                    info = write_sample(temp_log_path, sample_path)
+                    df_structured, df_templates, masking_report, messages = mine_log_file(
+                        parser_choice, dict(parser_args, indir=sample_dir), sample_path, spool_buffer_size, "memory", 1, key_fields, deduplicate
+                    )
+                    df_structured.attrs["preview"] = info
+                    estimate = f"από ~{info['estimated_lines']:,} γραμμές" if info["estimated_lines"] else "από την αρχή του log"
+                    messages = [f"🔎 Προεπισκόπηση: parse {info['sample_lines']:,} γραμμών δείγματος {estimate}"] + messages
+                elif library is not None:
+                    # Warm start: οι γραμμές με template από προηγούμενα parse δεν περνάνε από τον parser
+                    df_structured, df_templates, masking_report, messages, stats = run_with_library(
+                        mine, parser_args, temp_log_path, library, spool_buffer_size, output, STREAM_LINE_FILTERS.get(parser_choice)
+                    )
+                    messages = [
+                        f"📚 {stats['matched']:,} από {stats['lines']:,} γραμμές με template από τη βιβλιοθήκη, "
+                        f"{stats['mined']:,} στον {parser_choice} ({stats['new_templates']:,} νέα templates, "
+                        f"σύνολο {stats['library_templates']:,})"
+                    ] + messages
+                else:
+                    df_structured, df_templates, masking_report, messages = mine(parser_args, temp_log_path, output)
+
+            for message in messages:
+                notify("info", message)
+
+            if masking_report is not None:
+                notify("masking_report", masking_report)
 
-            # Ανάγνωση αποτελεσμάτων
-            structured_path = os.path.join(tmp_output_dir, uploaded_file.name + "_structured.csv")
-            templates_path = os.path.join(tmp_output_dir, uploaded_file.name + "_templates.csv")
+            if cache_key and not preview and not df_structured.empty:
+                store_cached_result(cache_key, df_structured, df_templates)
 
-            df_structured = pd.read_csv(structured_path) if os.path.exists(structured_path) else pd.DataFrame()
-            df_templates = pd.read_csv(templates_path) if os.path.exists(templates_path) else pd.DataFrame()
+            # Προαιρετική αποθήκευση σε Parquet
+            if parquet_path and not preview and not df_structured.empty:
+                write_parquet(df_structured, df_templates, parquet_path)
 
             return df_structured, df_templates
     except Exception as e:
-        st.error(f"❗ Σφάλμα κατά την εκτέλεση του parser: {e}")
+        notify("error", f"❗ Σφάλμα κατά την εκτέλεση του parser: {e}")
         return pd.DataFrame(), pd.DataFrame()
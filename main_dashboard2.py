@@ -1,10 +1,21 @@
+import os
+import functools
 import streamlit as st
 import importlib
+import suricata_logs4
 from windows_logs3 import process_windows_log as process_windows, show_dashboard as show_dashboard_windows  # Εισαγωγή από windows_logs.py
 from linux_logs2 import process_linux_log as process_linux, show_dashboard as show_dashboard_linux  # Εισαγωγή από linux_logs.py
 from mac_logs4 import process_mac_log as process_mac, show_dashboard as show_dashboard_mac  # Εισαγωγή από mac_logs.py
 from suricata_logs4 import process_suricata_log as process_suricata, show_dashboard as show_dashboard_suricata  # Εισαγωγή από suricata_logs.py
-from log_utils import PARSER_DEFAULTS
+from log_utils import PARSER_DEFAULTS, DEDUP_PARSERS
+from log_types import log_module
+from log_tail import DrainTailer, TAIL_LOG_TYPES
+from log_schema import apply_schema
+from log_columnar import read_parquet
+from log_dataset import ParquetDataset, PREVIEW_ROWS
+from log_timestamps import normalize_timestamps
+from log_jobs import JobQueue, show_notice
+from log_perf import PerfRecorder, recording, run_recorded, stage, perf_json, trace_json, start_memory_tracing, stop_memory_tracing
 
 DASHBOARD_MAP = {
     "Windows": show_dashboard_windows,
@@ -13,6 +24,13 @@ DASHBOARD_MAP = {
     "Suricata": show_dashboard_suricata
 }
 
+PROCESS_MAP = {
+    "Windows": process_windows,
+    "Linux": process_linux,
+    "Mac": process_mac,
+    "Suricata": process_suricata
+}
+
 st.set_page_config(page_title="Log Parser", layout="wide")
 st.title("📄 Log Parser Dashboard")
 
@@ -32,53 +50,240 @@ with st.sidebar:
         parser_params[param_key] = st.text_input(param_key, value=param_val)
         
     st.markdown("---")
+    workers = st.number_input("🧵 Workers (parallel parse)", min_value=1, max_value=os.cpu_count() or 1, value=1, step=1, help="Με συγχώνευση ίδιων γραμμών ή ένα template ανά SID/Revision, σε shards χωρίζονται οι γραμμές που περνάνε από τον parser")
+    use_cache = st.checkbox("♻️ Χρήση cache αποτελεσμάτων", value=True)
+    deduplicate = st.checkbox("🧬 Συγχώνευση ίδιων γραμμών πριν το mining", value=True, help="Μόνο για Drain και Spell: ο parser βλέπει κάθε γραμμή (μετά το masking) μία φορά")
+    use_library = st.checkbox(
+        "📚 Βιβλιοθήκη templates (warm start)", value=False,
+        help="Οι γραμμές με template από προηγούμενα parse δεν περνάνε από τον parser. Τα templates μπορεί να διαφέρουν "
+             "από ένα parse χωρίς βιβλιοθήκη, αφού εξαρτώνται και από όσα logs έχουν ήδη γίνει parse"
+    )
+    use_key_fields = False
+    if log_type == "Suricata" and parser_choice in DEDUP_PARSERS:
+        use_key_fields = st.checkbox("⚡ Ένα template ανά SID/Revision", value=True, help="Μόνο για Drain και Spell: ο parser βλέπει μία γραμμή ανά SID/Revision")
+    parquet_path = st.text_input("💾 Αποθήκευση σε Parquet (προαιρετικό)", value="", placeholder="/data/parsed/syslog")
+    trace_memory = st.checkbox("📈 Μέτρηση μνήμης ανά στάδιο (tracemalloc)", value=False, help="Για το panel ⏱️ Performance - επιβαρύνει αισθητά το parse")
+    preview = st.checkbox("🔎 Προεπισκόπηση από δείγμα", value=False, help="Πρώτα parse ενός δείγματος του log σε λίγα δευτερόλεπτα (dashboards με εκτιμήσεις) και αμέσως μετά το πλήρες parse, που αντικαθιστά την προεπισκόπηση")
     run_parse = st.button("🚀 Parse")
 
+    # Φόρτωση αποτελεσμάτων που έχουν ήδη γίνει parse (π.χ. από το log_cli.py)
+    with st.expander("📂 Φόρτωση parsed Parquet"):
+        load_path = st.text_input("Διαδρομή (χωρίς _structured.parquet)", value="", placeholder="/data/parsed/syslog")
+        run_load = st.button("📂 Φόρτωση")
+
+    # Dataset του log_cli.py --format dataset: τα logs μένουν στο δίσκο και το dashboard κάνει ερωτήματα στο DuckDB
+    with st.expander("🗄️ Out-of-core dataset (DuckDB)"):
+        dataset_path = st.text_input("Φάκελος dataset", value="", placeholder="/data/parsed/dataset")
+        run_open_dataset = st.button("🗄️ Άνοιγμα")
+
+    # Live tail με incremental Drain
+    run_tail = False
+    if log_type in TAIL_LOG_TYPES:
+        with st.expander("📡 Live tail (Drain)"):
+            tail_path = st.text_input("Διαδρομή αρχείου", value="/var/log/syslog" if log_type != "Suricata" else "/var/log/suricata/fast.log")
+            run_tail = st.button("🔄 Ανανέωση")
+
+# Η μέτρηση μνήμης ισχύει για όλο το process (και για τα jobs που τρέχουν στο background)
+if trace_memory:
+    start_memory_tracing()
+else:
+    stop_memory_tracing()
+
 # Upload area
-uploaded_file = st.file_uploader("Ανέβασε το αρχείο log σου", type=["log", "txt"])
+# Χωρίς φίλτρο κατάληξης: τα rotated/συμπιεσμένα αρχεία έχουν ονόματα όπως syslog.1 ή fast.log.2.gz
+uploaded_files = st.file_uploader(
+    "Ανέβασε το αρχείο log σου (ή τα rotated αρχεία του, και συμπιεσμένα .gz/.bz2/.xz/.zst)",
+    accept_multiple_files=True
+)
+uploaded_file = (uploaded_files[0] if len(uploaded_files) == 1 else uploaded_files) if uploaded_files else None
 
 if uploaded_file is not None:
-    st.success(f"✅ Το αρχείο ανέβηκε: `{uploaded_file.name}`")
+    st.success(f"✅ Το αρχείο ανέβηκε: `{', '.join(f.name for f in uploaded_files)}`")
 
 # If parse button is pressed
 if "df_structured" not in st.session_state:
     st.session_state.df_structured = None
 if "df_templates" not in st.session_state:
     st.session_state.df_templates = None
+if "parsed_log_type" not in st.session_state:
+    st.session_state.parsed_log_type = log_type
+if "jobs" not in st.session_state:
+    st.session_state.jobs = JobQueue()
+jobs = st.session_state.jobs
 
 if uploaded_file is not None and run_parse:
-    # Κλήση της συνάρτησης για την ανάλυση του log
-    common_args = {"uploaded_file": uploaded_file, "parser_choice": parser_choice, **parser_params}
-    
-    if log_type == "Windows":
-        df_structured, df_templates = process_windows(**common_args)
-    elif log_type == "Linux":
-        df_structured, df_templates = process_linux(**common_args)
-    elif log_type == "Mac":
-        df_structured, df_templates = process_mac(**common_args)
-    elif log_type == "Suricata":
-        df_structured, df_templates = process_suricata(**common_args)
-    
-    # Αποθήκευση αποτελεσμάτων στο session state
-    st.session_state.df_structured = df_structured
-    st.session_state.df_templates = df_templates
+    # Το parse τρέχει στο background (στην ουρά των jobs) ώστε το UI να μην παγώνει
+    common_args = {"uploaded_file": uploaded_file, "parser_choice": parser_choice, "use_cache": use_cache, "use_library": use_library, "deduplicate": deduplicate, "workers": workers, "parquet_path": parquet_path or None, **parser_params}
+    if log_type == "Suricata":
+        common_args["key_fields"] = suricata_logs4.KEY_FIELDS if use_key_fields else None
+
+    file_names = ", ".join(f.name for f in uploaded_files)
+    label = f"{parser_choice} · {log_type} · {file_names}"
+    if preview:
+        # Τα jobs τρέχουν με τη σειρά: η προεπισκόπηση φορτώνεται πρώτη και το πλήρες parse την αντικαθιστά όταν τελειώσει
+        preview_perf = PerfRecorder(f"Προεπισκόπηση: {label}")
+        jobs.submit(f"🔎 {label}", functools.partial(run_recorded, preview_perf, PROCESS_MAP[log_type]), meta={"log_type": log_type, "perf": preview_perf}, preview=True, **common_args)
+    perf = PerfRecorder(f"Parse: {label}")
+    jobs.submit(label, functools.partial(run_recorded, perf, PROCESS_MAP[log_type]), meta={"log_type": log_type, "perf": perf}, **common_args)
+
+
+def load_job_result(job):
+    """Τα αποτελέσματα ενός ολοκληρωμένου job στο session state"""
+    st.session_state.df_structured, st.session_state.df_templates = job.result
+    st.session_state.parsed_log_type = job.meta["log_type"]
+    st.session_state.parse_perf = job.meta["perf"]
+
+
+# Τα jobs που τελείωσαν από την προηγούμενη εκτέλεση: μηνύματα και αποτελέσματα (του πιο πρόσφατου)
+for job in jobs.jobs:
+    if job.active or job.collected:
+        continue
+    job.collected = True
+    for kind, message in job.notices:
+        show_notice(kind, message)
+    if job.status == "done":
+        load_job_result(job)
+    elif job.status == "failed":
+        st.error(f"❗ Σφάλμα στο job {job.label}: {job.error}")
+
+
+def show_jobs_panel():
+    """Λίστα των parse jobs με πρόοδο, ακύρωση και φόρτωση αποτελεσμάτων"""
+    for job in reversed(jobs.jobs):
+        st.markdown(f"**#{job.id}** {job.label}")
+        if job.status == "running":
+            st.progress(job.fraction() or 0.0, text=job.progress_text())
+        else:
+            st.caption(job.progress_text())
+        if job.active:
+            if st.button("🛑 Ακύρωση", key=f"cancel_job_{job.id}"):
+                job.cancel()
+        elif job.status == "done" and st.button("📥 Εμφάνιση", key=f"show_job_{job.id}"):
+            load_job_result(job)
+            st.rerun()
+    if jobs.jobs and not jobs.active() and st.button("🧹 Καθαρισμός λίστας"):
+        jobs.clear_finished()
+        st.rerun()
+
+    # Όταν τελειώσει ένα job ξανατρέχει όλη η εφαρμογή ώστε να εμφανιστούν τα αποτελέσματα
+    if any(not job.active and not job.collected for job in jobs.jobs):
+        st.rerun()
+
+
+if jobs.jobs:
+    with st.sidebar:
+        st.markdown("---")
+        st.subheader("🗂️ Parse jobs")
+        # Ανανέωση μόνο του panel κάθε δευτερόλεπτο όσο υπάρχουν jobs σε εξέλιξη ή σε αναμονή
+        st.fragment(show_jobs_panel, run_every=1.0 if jobs.active() else None)()
+
+if run_load and load_path:
+    try:
+        perf = PerfRecorder(f"Φόρτωση: {load_path}")
+        with recording(perf):
+            df_structured, df_templates = read_parquet(load_path)
+            st.session_state.df_structured = normalize_timestamps(apply_schema(df_structured, log_type), log_type)
+        st.session_state.df_templates = df_templates
+        st.session_state.parsed_log_type = log_type
+        st.session_state.parse_perf = perf
+    except (OSError, ValueError) as e:
+        st.error(f"❗ Σφάλμα κατά τη φόρτωση του Parquet: {e}")
+
+if run_open_dataset and dataset_path:
+    try:
+        perf = PerfRecorder(f"Dataset: {dataset_path}")
+        with recording(perf):
+            # Στη θέση του DataFrame: τα φίλτρα και τα γραφήματα γίνονται ερωτήματα στα Parquet του dataset
+            st.session_state.df_structured = ParquetDataset(dataset_path, log_type)
+            st.session_state.df_templates = st.session_state.df_structured.templates()
+        st.session_state.parsed_log_type = log_type
+        st.session_state.parse_perf = perf
+    except Exception as e:
+        st.error(f"❗ Σφάλμα κατά το άνοιγμα του dataset: {e}")
+
+if run_tail:
+    # Η κατάσταση του Drain κρατιέται στο session state ανάμεσα στις ανανεώσεις
+    drain_params = PARSER_DEFAULTS["Drain"][log_type]
+    if parser_choice == "Drain":
+        drain_params = {**drain_params, **parser_params}
+    tail_key = (tail_path, log_type, tuple(sorted(drain_params.items())))
+
+    if st.session_state.get("tail_key") != tail_key:
+        module = log_module(log_type)
+        # Schema και timestamps εφαρμόζονται μόνο στις νέες γραμμές κάθε ανανέωσης
+        prepare = lambda df: normalize_timestamps(apply_schema(df, log_type), log_type)
+        st.session_state.tailer = DrainTailer(
+            tail_path, module.LOG_FORMAT, module.LOG_REGEX, prepare=prepare, **drain_params
+        )
+        st.session_state.tail_key = tail_key
+
+    try:
+        new_lines = st.session_state.tailer.update()
+        st.sidebar.caption(f"📡 +{new_lines} νέες γραμμές (σύνολο {len(st.session_state.tailer.df_structured)})")
+        st.session_state.df_structured = st.session_state.tailer.df_structured
+        st.session_state.df_templates = st.session_state.tailer.templates()
+        st.session_state.parsed_log_type = log_type
+    except OSError as e:
+        st.error(f"❗ Σφάλμα κατά την ανάγνωση του αρχείου: {e}")
         
  
+@st.fragment
+def show_dashboard_fragment(log_type):
+    """Το dashboard ως fragment: μια αλλαγή φίλτρου ξανατρέχει μόνο αυτό και όχι όλη την εφαρμογή"""
+    # Νέος recorder σε κάθε εκτέλεση του fragment (το panel Performance δείχνει την τελευταία)
+    dashboard_perf = PerfRecorder("Dashboard")
+    st.session_state.dashboard_perf = dashboard_perf
+    with recording(dashboard_perf), stage(f"{log_type} dashboard (σύνολο)", "dashboard"):
+        DASHBOARD_MAP[log_type](st.session_state.df_structured)
+
+
+# Χρόνοι των πινάκων σε αυτή την εκτέλεση του script
+tables_perf = PerfRecorder("Πίνακες")
+
 if st.session_state.df_structured is not None and not st.session_state.df_structured.empty:
-    tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "📋 Structured Logs", "🔧 Log Templates"])
+    # Με on_change="rerun" τρέχει μόνο το περιεχόμενο της επιλεγμένης καρτέλας (tab.open)
+    tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "📋 Structured Logs", "🔧 Log Templates"], key="main_tabs", on_change="rerun")
     
-    with tab1:
-        st.subheader("📊 Dashboard")
-        dashboard_fn = DASHBOARD_MAP.get(log_type)
-        if dashboard_fn:
-            dashboard_fn(st.session_state.df_structured)
-        else:
-            st.warning("Δεν υπάρχει dashboard για αυτόν τον τύπο log.")
+    if tab1.open:
+        with tab1:
+            st.subheader("📊 Dashboard")
+            if st.session_state.parsed_log_type in DASHBOARD_MAP:
+                show_dashboard_fragment(st.session_state.parsed_log_type)
+            else:
+                st.warning("Δεν υπάρχει dashboard για αυτόν τον τύπο log.")
     
-    with tab2:
-        st.subheader("📋 Structured Log Data")
-        st.dataframe(st.session_state.df_structured)
+    if tab2.open:
+        with tab2, recording(tables_perf):
+            st.subheader("📋 Structured Log Data")
+            with stage("Structured Logs (πίνακας)", "dashboard", len(st.session_state.df_structured)):
+                if isinstance(st.session_state.df_structured, ParquetDataset):
+                    st.caption(f"Οι πρώτες {PREVIEW_ROWS:,} από {len(st.session_state.df_structured):,} γραμμές (τα logs μένουν στο δίσκο)")
+                    st.dataframe(st.session_state.df_structured.head(PREVIEW_ROWS))
+                else:
+                    st.dataframe(st.session_state.df_structured)
     
-    with tab3:
-        st.subheader("🔧 Log Templates")
-        st.dataframe(st.session_state.df_templates, use_container_width=True)
+    if tab3.open:
+        with tab3, recording(tables_perf):
+            st.subheader("🔧 Log Templates")
+            with stage("Log Templates (πίνακας)", "dashboard", len(st.session_state.df_templates)):
+                st.dataframe(st.session_state.df_templates, use_container_width=True)
+
+# Panel "Performance": τα στάδια του τελευταίου parse, του dashboard και των πινάκων, με export για trace viewer
+perf_recorders = [
+    recorder for recorder in (st.session_state.get("parse_perf"), st.session_state.get("dashboard_perf"), tables_perf)
+    if recorder is not None and len(recorder)
+]
+if perf_recorders:
+    with st.expander("⏱️ Performance"):
+        for recorder in perf_recorders:
+            st.markdown(f"**{recorder.name}**")
+            st.dataframe(recorder.to_frame(), use_container_width=True, hide_index=True)
+        if not trace_memory:
+            st.caption("Η στήλη Peak mem συμπληρώνεται με ενεργή τη 📈 Μέτρηση μνήμης ανά στάδιο (πριν το parse).")
+        else:
+            st.caption("Το tracemalloc μετράει όλο το process: τα στάδια που έτρεξαν ταυτόχρονα με άλλο job ή session μένουν χωρίς Peak mem.")
+        col_json, col_trace = st.columns(2)
+        with col_json:
+            st.download_button("⬇️ JSON", data=perf_json(perf_recorders), file_name="log_parser_perf.json", mime="application/json")
+        with col_trace:
+            st.download_button("⬇️ Trace events (Perfetto / chrome://tracing)", data=trace_json(perf_recorders), file_name="log_parser_trace.json", mime="application/json")
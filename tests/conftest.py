@@ -0,0 +1,43 @@
+import io
+import os
+import sys
+import tempfile
+import pytest
+
+# Τα modules του repo είναι στο root (χωρίς πακέτο)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Cache και βιβλιοθήκη templates σε προσωρινό φάκελο και όχι στο ~/.cache του χρήστη
+os.environ.setdefault("LOG_PARSER_CACHE_DIR", tempfile.mkdtemp(prefix="log-parser-tests-"))
+
+
+class Upload(io.BytesIO):
+    """Αρχείο με το interface του UploadedFile του Streamlit (name, size, read/seek)"""
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+@pytest.fixture
+def make_upload():
+    return Upload
+
+
+@pytest.fixture
+def mine(tmp_path):
+    """mine_log_file πάνω σε γραμμές log γραμμένες σε προσωρινό indir: (structured, templates, report, μηνύματα)"""
+    from log_types import log_module
+    from log_utils import PARSER_DEFAULTS, make_parser_args, mine_log_file
+
+    def run(log_type, parser_choice, lines, name="test.log", **kwargs):
+        module = log_module(log_type)
+        indir, outdir = tmp_path / "in", tmp_path / "out"
+        indir.mkdir(exist_ok=True)
+        outdir.mkdir(exist_ok=True)
+        (indir / name).write_text("".join(line + "\n" for line in lines))
+        params = PARSER_DEFAULTS.get(parser_choice, {}).get(log_type, {})
+        parser_args = make_parser_args(module.LOG_FORMAT, module.LOG_REGEX, str(indir), str(outdir), **params)
+        return mine_log_file(parser_choice, parser_args, str(indir / name), **kwargs)
+
+    return run
@@ -0,0 +1,108 @@
+import bz2
+import gzip
+import io
+import lzma
+import threading
+import pytest
+from log_archives import (
+    SegmentReader, detect_compression, is_virtual_log, materialize_log, merged_log_name, open_log,
+    order_segments, virtual_log
+)
+
+COMPRESSORS = {"gzip": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSORS) + ["zstd"])
+def test_detect_compression_and_read(tmp_path, compression):
+    data = b"line one\nline two\n"
+    if compression == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        compressed = zstandard.ZstdCompressor().compress(data)
+    else:
+        compressed = COMPRESSORS[compression](data)
+    assert detect_compression(io.BytesIO(compressed)) == compression
+    path = tmp_path / "syslog.1.gz"
+    path.write_bytes(compressed)
+    assert list(SegmentReader([str(path)])) == ["line one\n", "line two\n"]
+
+
+def test_plain_text_has_no_compression():
+    assert detect_compression(io.BytesIO(b"Jun 14 15:16:01 combo")) is None
+
+
+def test_rotated_segments_are_ordered_oldest_first():
+    names = ["syslog", "syslog.1", "syslog.3.gz", "syslog.2.gz"]
+    assert order_segments(names) == ["syslog.3.gz", "syslog.2.gz", "syslog.1", "syslog"]
+    assert order_segments(["syslog-20240102.gz", "syslog", "syslog-20240101.gz"])[0] == "syslog-20240101.gz"
+    assert merged_log_name(names) == "syslog"
+
+
+def test_segments_without_trailing_newline_are_not_joined(tmp_path):
+    first, second = tmp_path / "a.1.gz", tmp_path / "a"
+    first.write_bytes(gzip.compress(b"one\ntwo"))
+    second.write_bytes(b"three\n")
+    assert list(SegmentReader([str(first), str(second)])) == ["one\n", "two\n", "three\n"]
+
+
+def test_virtual_log_is_removed_after_the_block(tmp_path):
+    segment = tmp_path / "syslog.1.gz"
+    segment.write_bytes(gzip.compress(b"one\n"))
+    path = str(tmp_path / "syslog")
+    with pytest.raises(RuntimeError):
+        with virtual_log(path, [str(segment)]):
+            with open_log(path) as f:
+                assert list(f) == ["one\n"]
+            raise RuntimeError
+    assert not is_virtual_log(path)
+
+
+def test_virtual_log_is_local_to_its_thread(tmp_path):
+    path = str(tmp_path / "syslog")
+    seen = []
+    with virtual_log(path, []):
+        thread = threading.Thread(target=lambda: seen.append(is_virtual_log(path)))
+        thread.start()
+        thread.join()
+        assert is_virtual_log(path)
+    assert seen == [False]
+
+
+def test_nested_virtual_log_restores_the_outer_segments(tmp_path):
+    path = str(tmp_path / "syslog")
+    with virtual_log(path, ["a"]):
+        with virtual_log(path, ["b"]):
+            assert open_log(path).segments == ["b"]
+        assert open_log(path).segments == ["a"]
+    assert not is_virtual_log(path)
+
+
+def test_materialize_log_writes_the_file_and_unregisters(tmp_path):
+    segments = [tmp_path / "syslog.2.gz", tmp_path / "syslog.1"]
+    segments[0].write_bytes(gzip.compress(b"one\n"))
+    segments[1].write_bytes(b"two\n")
+    path = str(tmp_path / "syslog")
+    with virtual_log(path, [str(s) for s in segments]):
+        assert materialize_log(path)
+        assert not is_virtual_log(path)
+        assert not materialize_log(path)
+    assert (tmp_path / "syslog").read_text() == "one\ntwo\n"
+
+
+def test_rotated_uploads_parse_like_the_concatenated_log(make_upload):
+    import pandas as pd
+    import linux_logs2
+    from log_benchmark import generate_lines
+    from log_utils import PARSER_DEFAULTS, run_parser
+
+    data = "".join(line + "\n" for line in generate_lines("Linux", 300, n_templates=8)).encode()
+    cut = data.index(b"\n", len(data) // 2) + 1
+    uploads = [make_upload("syslog", data[cut:]), make_upload("syslog.1.gz", gzip.compress(data[:cut]))]
+
+    def parse(upload):
+        return run_parser(
+            upload, "Drain", linux_logs2.LOG_FORMAT, linux_logs2.LOG_REGEX, use_cache=False, **PARSER_DEFAULTS["Drain"]["Linux"]
+        )
+
+    rotated, whole = parse(uploads), parse(make_upload("syslog", data))
+    pd.testing.assert_frame_equal(rotated[0], whole[0])
+    pd.testing.assert_frame_equal(rotated[1], whole[1])
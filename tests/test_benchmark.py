@@ -0,0 +1,34 @@
+import pytest
+from log_benchmark import LOG_TYPES, compare_to_baseline, generate_lines, run_case
+from log_types import log_module
+from log_utils import DrainParser
+
+
+@pytest.mark.parametrize("log_type", LOG_TYPES)
+def test_generated_lines_match_the_log_format(log_type, tmp_path):
+    log_format = log_module(log_type).LOG_FORMAT
+    headers, regex = DrainParser(log_format=log_format, indir=str(tmp_path), outdir=str(tmp_path)).generate_logformat_regex(log_format)
+    lines = generate_lines(log_type, 500, n_templates=20, seed=7)
+    assert lines == generate_lines(log_type, 500, n_templates=20, seed=7)
+    assert lines != generate_lines(log_type, 500, n_templates=20, seed=8)
+    assert all(regex.search(line.strip()) for line in lines)
+
+
+def test_run_case_reports_every_stage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = run_case("Linux", "Drain", 300, 10, 1)
+    assert result["parsed_rows"] == 300
+    assert 0 < result["templates_found"] <= 300
+    assert {"generate", "parse", "schema", "timestamps", "rollups", "filter_index"} <= set(result["stages"])
+    assert result["lines_per_sec"] > 0
+
+
+def test_compare_to_baseline_flags_slowdowns_and_failures():
+    def case(parser, speed, status="ok"):
+        return {"log_type": "Linux", "parser": parser, "lines": 1000, "templates": 50, "status": status, "lines_per_sec": speed}
+
+    baseline = {"results": [case("Drain", 1000), case("Spell", 1000), case("IPLoM", 1000), case("MoLFI", None, "timeout")]}
+    current = [case("Drain", 850), case("Spell", 700), case("IPLoM", None, "error"), case("MoLFI", 10), case("LogCluster", 5)]
+    regressions = compare_to_baseline(current, baseline, max_regression=0.2)
+    assert [(r["case"], r["current"]) for r in regressions] == [("Linux/Spell/1000/50", 700), ("Linux/IPLoM/1000/50", None)]
+    assert regressions[0]["change"] == -0.3
@@ -0,0 +1,75 @@
+import io
+import os
+import time
+import pandas as pd
+import linux_logs2
+import log_utils
+from log_benchmark import generate_lines
+from log_cache import clear_cache, evict_cache, hash_upload, hash_uploads, load_cached_result, make_cache_key, store_cached_result
+from log_utils import PARSER_DEFAULTS, run_parser
+
+
+def frames(n=3):
+    return pd.DataFrame({"LineId": range(1, n + 1)}), pd.DataFrame({"EventId": ["e"], "Occurrences": [n]})
+
+
+def test_hash_is_independent_of_chunk_size_and_rewinds():
+    upload = io.BytesIO(b"x" * 10000)
+    upload.seek(123)
+    assert hash_upload(upload, chunk_size=7) == hash_upload(upload)
+    assert upload.tell() == 0
+    # Η σειρά των rotated αρχείων αλλάζει το log, άρα και το hash
+    a, b = io.BytesIO(b"a"), io.BytesIO(b"b")
+    assert hash_uploads([a, b]) != hash_uploads([b, a])
+
+
+def test_cache_key_depends_on_every_input():
+    base = make_cache_key("h", "Drain", "<Content>", [r"\d+"], {"depth": 4})
+    assert base == make_cache_key("h", "Drain", "<Content>", [r"\d+"], {"depth": "4"})
+    assert base != make_cache_key("h2", "Drain", "<Content>", [r"\d+"], {"depth": 4})
+    assert base != make_cache_key("h", "Spell", "<Content>", [r"\d+"], {"depth": 4})
+    assert base != make_cache_key("h", "Drain", "<Content>", [], {"depth": 4})
+    assert base != make_cache_key("h", "Drain", "<Content>", [r"\d+"], {"depth": 5})
+
+
+def test_store_load_and_corrupted_entries(tmp_path):
+    df_structured, df_templates = frames()
+    store_cached_result("k", df_structured, df_templates, cache_dir=str(tmp_path))
+    loaded = load_cached_result("k", cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(loaded[0], df_structured)
+    assert load_cached_result("missing", cache_dir=str(tmp_path)) is None
+
+    (tmp_path / "bad.pkl").write_bytes(b"not a pickle")
+    assert load_cached_result("bad", cache_dir=str(tmp_path)) is None
+    assert not (tmp_path / "bad.pkl").exists()
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache_dir = str(tmp_path)
+    for i, key in enumerate(["old", "used", "new"]):
+        store_cached_result(key, *frames(100), cache_dir=cache_dir)
+        os.utime(os.path.join(cache_dir, key + ".pkl"), (time.time() - 100 + i, time.time() - 100 + i))
+    load_cached_result("old", cache_dir=cache_dir)  # Πρόσβαση: γίνεται η πιο πρόσφατη
+    size = os.path.getsize(os.path.join(cache_dir, "new.pkl"))
+    evict_cache(cache_dir, max_bytes=2 * size)
+    assert sorted(os.listdir(cache_dir)) == ["new.pkl", "old.pkl"]
+    clear_cache(cache_dir)
+    assert os.listdir(cache_dir) == []
+
+
+def test_run_parser_serves_repeated_uploads_from_the_cache(make_upload, monkeypatch):
+    calls = []
+    mine = log_utils.mine_log_file
+    monkeypatch.setattr(log_utils, "mine_log_file", lambda *args, **kwargs: calls.append(1) or mine(*args, **kwargs))
+    data = "".join(line + "\n" for line in generate_lines("Linux", 200, n_templates=5, seed=11)).encode()
+
+    def parse(**kwargs):
+        return run_parser(make_upload("syslog", data), "Drain", linux_logs2.LOG_FORMAT, linux_logs2.LOG_REGEX, **kwargs)
+
+    first = parse(**PARSER_DEFAULTS["Drain"]["Linux"])
+    second = parse(**PARSER_DEFAULTS["Drain"]["Linux"])
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first[0], second[0])
+    # Άλλες παράμετροι: νέο parse
+    parse(depth="5", threshold="0.39")
+    assert len(calls) == 2
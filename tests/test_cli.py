@@ -0,0 +1,74 @@
+import os
+import pandas as pd
+import pytest
+import log_cli
+from log_benchmark import generate_lines
+from log_library import TemplateLibrary, clear_library, library_key
+from log_types import LOG_MODULES, log_module
+from log_utils import PARSER_DEFAULTS
+
+
+@pytest.fixture
+def syslog(tmp_path):
+    path = tmp_path / "logs" / "syslog.log"
+    path.parent.mkdir()
+    path.write_text("".join(line + "\n" for line in generate_lines("Linux", 300, n_templates=8)))
+    return str(path)
+
+
+@pytest.fixture
+def linux_library():
+    module = log_module("Linux")
+    params = PARSER_DEFAULTS["Drain"]["Linux"]
+    key = library_key("Drain", module.LOG_FORMAT, module.LOG_REGEX, params)
+    clear_library(key)
+    yield lambda: TemplateLibrary(key, "Drain", module.LOG_FORMAT)
+    clear_library(key)
+
+
+def test_log_modules_are_shared():
+    assert log_cli.LOG_MODULES is LOG_MODULES
+    for log_type in LOG_MODULES:
+        assert log_module(log_type).LOG_FORMAT
+
+
+def test_parse_params_checks_types():
+    assert log_cli.parse_params("Drain", "Linux", ["depth=5"])["depth"] == "5"
+    with pytest.raises(ValueError):
+        log_cli.parse_params("Drain", "Linux", ["depth=deep"])
+    with pytest.raises(ValueError):
+        log_cli.parse_params("Drain", "Linux", ["depth"])
+
+
+def test_find_log_files_matches_pattern(syslog, tmp_path):
+    (tmp_path / "logs" / "notes.txt").write_text("x")
+    assert log_cli.find_log_files([str(tmp_path / "logs")]) == [(syslog, "syslog.log")]
+
+
+def test_cache_key_follows_library_state(syslog, linux_library):
+    params = PARSER_DEFAULTS["Drain"]["Linux"]
+    empty = log_cli.cache_key_for(syslog, "Linux", "Drain", params, 1, use_library=True)
+    plain = log_cli.cache_key_for(syslog, "Linux", "Drain", params, 1)
+    assert empty != plain
+
+    log_cli.parse_file(syslog, "Linux", "Drain", params, use_library=True)
+    assert len(linux_library()) > 0
+    assert log_cli.cache_key_for(syslog, "Linux", "Drain", params, 1, use_library=True) != empty
+    assert log_cli.cache_key_for(syslog, "Linux", "Drain", params, 1) == plain
+
+
+def test_fingerprint_ignores_occurrences(linux_library):
+    library = linux_library()
+    templates = pd.DataFrame({"EventId": ["a1"], "EventTemplate": ["session opened for user <*>"], "Occurrences": [3]})
+    library.update(templates, ["EventId", "EventTemplate"])
+    before = library.fingerprint()
+    library.update(templates, ["EventId", "EventTemplate"])
+    assert linux_library().fingerprint() == before
+
+
+def test_main_writes_csv(syslog, tmp_path, capsys):
+    output_dir = tmp_path / "parsed"
+    assert log_cli.main(["--log-type", "Linux", "--format", "csv", "--output-dir", str(output_dir), syslog]) == 0
+    df_structured = pd.read_csv(output_dir / "syslog_structured.csv")
+    assert len(df_structured) == 300
+    assert os.path.exists(output_dir / "syslog_templates.csv")
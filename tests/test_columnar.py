@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+from log_benchmark import generate_lines
+from log_columnar import capture_parser_output, normalize_structured, read_parquet, write_parquet
+
+
+def test_capture_keeps_outdir_frames_and_restores_to_csv(tmp_path):
+    original = pd.DataFrame.to_csv
+    outdir, other = tmp_path / "out", tmp_path / "other"
+    outdir.mkdir()
+    other.mkdir()
+    df = pd.DataFrame({"a": [1, 2]})
+
+    with capture_parser_output(str(outdir)) as captured:
+        df.to_csv(str(outdir / "x_structured.csv"), index=False)
+        df.to_csv(str(other / "y.csv"), index=False)
+
+    assert pd.DataFrame.to_csv is original
+    assert list(captured) == ["x_structured.csv"]
+    assert not (outdir / "x_structured.csv").exists()
+    assert (other / "y.csv").exists()
+
+
+def test_nested_captures_restore_only_after_the_last(tmp_path):
+    original = pd.DataFrame.to_csv
+    with capture_parser_output(str(tmp_path / "a")):
+        with capture_parser_output(str(tmp_path / "b")):
+            pass
+        assert pd.DataFrame.to_csv is not original
+    assert pd.DataFrame.to_csv is original
+
+
+@pytest.mark.parametrize("log_type", ["Suricata", "Linux"])
+def test_memory_and_csv_output_have_the_same_types(mine, log_type):
+    lines = generate_lines(log_type, 200, n_templates=10)
+    memory = mine(log_type, "Drain", lines)
+    csv = mine(log_type, "Drain", lines, output="csv")
+    pd.testing.assert_frame_equal(memory[0], csv[0])
+    pd.testing.assert_frame_equal(memory[1], csv[1])
+    assert memory[0]["LineId"].dtype == "int64"
+    assert memory[1]["Occurrences"].dtype == "int64"
+    if log_type == "Suricata":
+        # Τα μηδενικά στην αρχή των μικροδευτερολέπτων δεν χάνονται στο CSV
+        assert (csv[0]["Ms"].str.len() == 6).all()
+
+
+def test_normalize_structured_stringifies_parameter_lists():
+    df = normalize_structured(pd.DataFrame({"LineId": [1], "Content": ["a 1"], "ParameterList": [["1"]]}))
+    assert df.loc[0, "ParameterList"] == "['1']"
+    assert df["Content"].dtype == "str"
+
+
+def test_parquet_roundtrip(tmp_path, mine):
+    df_structured, df_templates, _, _ = mine("Linux", "Drain", generate_lines("Linux", 100, n_templates=5))
+    write_parquet(df_structured, df_templates, str(tmp_path / "run.parquet"))
+    structured, templates = read_parquet(str(tmp_path / "run_structured.parquet"))
+    pd.testing.assert_frame_equal(structured, df_structured)
+    pd.testing.assert_frame_equal(templates, df_templates)
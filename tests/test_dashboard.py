@@ -0,0 +1,62 @@
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+import linux_logs2
+from log_dashboard import DashboardData, dashboard_data_class, format_time_range, summary_dimensions
+from log_schema import drop_unused_categories
+
+
+@pytest.fixture(scope="module")
+def linux_df():
+    rng = np.random.default_rng(4)
+    n = 5000
+    return pd.DataFrame({
+        "datetime": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 3 * 86400, n)), unit="s"),
+        "Level": pd.Categorical(rng.choice(["combo", "other"], n)),
+        "Component": pd.Categorical(rng.choice(["sshd", "su", "kernel", "ftpd"], n, p=[0.5, 0.3, 0.15, 0.05])),
+        "PID": pd.Categorical(rng.integers(1, 200, n).astype(str)),
+        "EventTemplate": pd.Categorical(rng.choice([f"template {i} <*>" for i in range(30)], n)),
+    })
+
+
+def filtered(df, selections, date_range):
+    days = df["datetime"].dt.date
+    mask = (days >= date_range[0]) & (days <= date_range[1])
+    for column, values in selections.items():
+        mask &= df[column].isin(values)
+    return drop_unused_categories(df[mask])
+
+
+def test_summary_dimensions_cover_metrics_and_count_charts():
+    assert summary_dimensions(linux_logs2.DASHBOARD) == ["EventTemplate", "Component", "PID", "Level"]
+
+
+@pytest.mark.parametrize("selections", [
+    {"Level": ["combo", "other"], "Component": ["sshd", "su", "kernel", "ftpd"]},
+    {"Level": ["other"], "Component": ["su", "ftpd"]},
+])
+def test_widgets_match_direct_pandas(linux_df, selections):
+    date_range = (datetime.date(2024, 1, 1), datetime.date(2024, 1, 2))
+    expected = filtered(linux_df, selections, date_range)
+    data = DashboardData(linux_df, linux_logs2.DASHBOARD, selections, date_range)
+
+    assert data.metric({"value": "count"}) == len(expected)
+    assert data.metric({"nunique": "EventTemplate"}) == expected["EventTemplate"].nunique()
+    assert data.metric({"nunique": "PID"}) == expected["PID"].nunique()
+    assert data.metric({"value": "time_range"}) == format_time_range(expected["datetime"].min(), expected["datetime"].max())
+    assert data.breakdown("Level") == list(expected["Level"].value_counts(sort=False)[expected["Level"].unique()].items())
+
+    top = data.top("EventTemplate")
+    assert top["Count"].tolist() == expected["EventTemplate"].value_counts().nlargest(10).tolist()
+    counts = data.counts(("Component", "Level")).set_index(["Component", "Level"])["Count"]
+    pd.testing.assert_series_equal(counts, expected.groupby(["Component", "Level"], observed=True).size(), check_names=False)
+    upper = data.counts(("Level",), upper=("Level",))
+    assert upper["Level"].tolist() == sorted(expected["Level"].astype(str).str.upper().unique())
+    assert upper["Count"].sum() == len(expected)
+
+
+def test_unknown_backend_is_rejected(linux_df):
+    with pytest.raises(ValueError):
+        dashboard_data_class(linux_df, "spark")
+    assert dashboard_data_class(linux_df, "pandas") is DashboardData
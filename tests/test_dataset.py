@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+from log_benchmark import generate_lines
+from log_dataset import ParquetDataset, write_dataset
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(scope="module")
+def linux_parse(tmp_path_factory):
+    from log_schema import apply_schema
+    from log_timestamps import normalize_timestamps
+    from log_utils import PARSER_DEFAULTS, make_parser_args, mine_log_file
+    import linux_logs2
+
+    indir = tmp_path_factory.mktemp("in")
+    (indir / "syslog").write_text("".join(line + "\n" for line in generate_lines("Linux", 3000, n_templates=15)))
+    parser_args = make_parser_args(linux_logs2.LOG_FORMAT, linux_logs2.LOG_REGEX, str(indir), str(indir), **PARSER_DEFAULTS["Drain"]["Linux"])
+    df_structured, df_templates, _, _ = mine_log_file("Drain", parser_args, str(indir / "syslog"))
+    return normalize_timestamps(apply_schema(df_structured, "Linux"), "Linux", reference="2024-06-01"), df_templates
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory, linux_parse):
+    root = str(tmp_path_factory.mktemp("dataset"))
+    df_structured, df_templates = linux_parse
+    half = len(df_structured) // 2
+    # Δύο εγγραφές στο ίδιο dataset (π.χ. δύο αρχεία του ίδιου μήνα)
+    write_dataset(df_structured.iloc[:half], df_templates, root, "Linux")
+    write_dataset(df_structured.iloc[half:], df_templates, root, "Linux")
+    return ParquetDataset(root, "Linux")
+
+
+def test_dataset_keeps_every_row_in_order(dataset, linux_parse):
+    df_structured, _ = linux_parse
+    assert len(dataset) == len(df_structured)
+    assert dataset.head(50)["LineId"].tolist() == df_structured["LineId"].iloc[:50].tolist()
+
+
+def test_templates_are_merged_across_writes(dataset, linux_parse):
+    _, df_templates = linux_parse
+    assert dataset.templates()["Occurrences"].sum() == 2 * df_templates["Occurrences"].sum()
+
+
+def test_where_without_date_range(dataset):
+    assert dataset.where({}, None) == ("TRUE", [])
+    where, params = dataset.where({"Component": ["sshd"]}, None)
+    assert "day" not in where and params == [["sshd"]]
+    assert dataset.summarize({}, None, [])["rows"] == len(dataset)
+
+
+def test_summarize_matches_pandas(dataset, linux_parse):
+    df_structured, _ = linux_parse
+    components = df_structured["Component"].dropna().unique()[:2].tolist()
+    days = df_structured["datetime"].dt.date
+    date_range = (days.min(), days.min())
+    summary = dataset.summarize({"Component": components}, date_range, ["Component"])
+
+    expected = df_structured[df_structured["Component"].isin(components) & (days == days.min())]
+    counts = expected["Component"].astype(str).value_counts()
+    assert summary["rows"] == len(expected)
+    assert dict(zip(summary["cube"]["Component"], summary["cube"]["Count"])) == counts.to_dict()
+    assert summary["start"] == expected["datetime"].min()
+
+
+def test_rollups_match_floor(dataset, linux_parse):
+    df_structured, _ = linux_parse
+    result = dataset.rollups().query("1h", {}, None)
+    expected = df_structured["datetime"].dropna().dt.floor("1h").value_counts().sort_index()
+    assert result["Count"].tolist() == expected.tolist()
+    assert list(result["bucket"]) == list(expected.index)
@@ -0,0 +1,20 @@
+import pytest
+from log_benchmark import generate_lines
+
+
+@pytest.mark.parametrize("parser_choice", ["Drain", "Spell"])
+@pytest.mark.parametrize("log_type", ["Linux", "Windows"])
+def test_deduplicated_parse_matches_the_plain_parse(mine, parser_choice, log_type):
+    lines = generate_lines(log_type, 400, n_templates=15, seed=3)
+    plain = mine(log_type, parser_choice, lines)
+    deduplicated = mine(log_type, parser_choice, lines, deduplicate=True)
+
+    assert deduplicated[3] and "dedup x" in deduplicated[3][0]
+    assert deduplicated[0]["EventTemplate"].tolist() == plain[0]["EventTemplate"].tolist()
+    assert deduplicated[0]["LineId"].tolist() == plain[0]["LineId"].tolist()
+    assert sorted(deduplicated[1]["Occurrences"]) == sorted(plain[1]["Occurrences"])
+
+
+def test_frequency_sensitive_parsers_are_not_deduplicated(mine):
+    lines = generate_lines("Linux", 200, n_templates=10, seed=3)
+    assert mine("Linux", "IPLoM", lines, deduplicate=True)[3] == []
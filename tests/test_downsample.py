@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from log_downsample import bin_points, describe_reduction, downsample_series, lttb
+
+
+def make_events(n=20000, n_pids=300, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "datetime": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 3 * 86400, n), unit="s"),
+        "PID": rng.zipf(1.5, n) % n_pids,
+        "Level": rng.choice(["info", "error"], n),
+    })
+
+
+def test_bin_points_stays_in_budget_and_keeps_the_total():
+    df = make_events()
+    points, info = bin_points(df, "datetime", "PID", color="Level", budget=1000, max_categories=50)
+    assert len(points) <= 1000 and info["points"] == len(points)
+    assert info["bin"] is not None
+    assert info["categories_dropped"] == df["PID"].nunique() - 50
+    # Τα σημεία είναι κελιά του binning: τα Count αθροίζουν στις γραμμές των 50 πιο συχνών PIDs
+    top = df["PID"].value_counts().nlargest(50).index
+    assert info["cells_dropped"] == 0
+    assert points["Count"].sum() == df["PID"].isin(top).sum()
+    assert set(points["PID"]) <= set(top)
+
+
+def test_bin_points_without_reduction_keeps_every_row():
+    df = make_events(n=200, n_pids=5)
+    points, info = bin_points(df, "datetime", "PID", budget=1000)
+    assert info["bin"] is None and points["Count"].sum() == len(df)
+    assert describe_reduction(info, "PIDs") is None
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[417] = 50
+    picked = lttb(x, y, 20)
+    assert len(picked) == 20 and picked[0] == 0 and picked[-1] == 999
+    assert 417 in picked
+    assert (np.diff(picked) > 0).all()
+    assert len(lttb(x, y, 5000)) == 1000
+
+
+def test_downsample_series_splits_the_budget_per_series():
+    df = pd.DataFrame({
+        "datetime": list(pd.date_range("2024-01-01", periods=3000, freq="min")) * 2,
+        "Count": np.arange(6000),
+        "Level": ["info"] * 3000 + ["error"] * 3000,
+    })
+    reduced = downsample_series(df, "datetime", "Count", by="Level", budget=400)
+    assert len(reduced) <= 400
+    assert reduced.groupby("Level")["datetime"].agg(["min", "max"]).eq(
+        [df["datetime"].min(), df["datetime"].max()]).all().all()
+    small = df.head(100)
+    assert downsample_series(small, "datetime", "Count", by="Level") is small
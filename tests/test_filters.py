@@ -0,0 +1,97 @@
+import datetime
+import numpy as np
+import pandas as pd
+import log_filters
+from log_filters import DashboardViews, cached_for_dataset, get_filter_index, selection_key
+
+
+def make_frame(n=500, seed=3):
+    rng = np.random.default_rng(seed)
+    levels = pd.Series(rng.choice(["info", "warn", "error"], n))
+    levels[rng.random(n) < 0.05] = None
+    return pd.DataFrame({
+        "Level": levels.astype("category"),
+        "Component": rng.choice(["kernel", "sshd", "cron", "su"], n),
+        "datetime": pd.Timestamp("2024-03-01") + pd.to_timedelta(rng.integers(0, 20 * 86400, n), unit="s"),
+    })
+
+
+def reference_mask(df, selections, date_range):
+    """Η σημασιολογία των αρχικών dashboards: .isin() σε κάθε στήλη και κλειστό διάστημα ημερών"""
+    days = df["datetime"].dt.date
+    mask = (days >= date_range[0]) & (days <= date_range[1])
+    for column, values in selections.items():
+        mask &= df[column].isin(values)
+    return mask.to_numpy()
+
+
+def test_index_mask_matches_isin_and_date_filter():
+    df = make_frame()
+    df.loc[7, "datetime"] = pd.NaT
+    index = get_filter_index(df, ["Level", "Component"], df["datetime"])
+    cases = [
+        ({"Level": ["info", "warn", "error"], "Component": ["kernel", "sshd", "cron", "su"]}, (datetime.date(2024, 3, 1), datetime.date(2024, 3, 31))),
+        ({"Level": ["error"], "Component": ["sshd", "su", "missing"]}, (datetime.date(2024, 3, 5), datetime.date(2024, 3, 5))),
+        ({"Level": [], "Component": ["cron"]}, (datetime.date(2024, 3, 1), datetime.date(2024, 3, 10))),
+    ]
+    for selections, date_range in cases:
+        assert (index.mask(selections, date_range) == reference_mask(df, selections, date_range)).all()
+
+
+def test_index_is_built_once_per_dataset():
+    df = make_frame()
+    builds = []
+    first = get_filter_index(df, ["Level"], lambda: builds.append(1) or df["datetime"])
+    assert get_filter_index(df, ["Level"], lambda: builds.append(1) or df["datetime"]) is first
+    assert len(builds) == 1
+    # Άλλες στήλες ή άλλο frame: νέο index
+    assert get_filter_index(df, ["Component"], df["datetime"]) is not first
+    assert get_filter_index(df.copy(), ["Level"], df["datetime"]) is not first
+
+
+def test_cached_for_dataset_rebuilds_when_rows_change():
+    df = pd.DataFrame({"a": [1, 2]})
+    assert cached_for_dataset(df, "n", None, lambda: len(df)) == 2
+    df.loc[2] = [3]
+    assert cached_for_dataset(df, "n", None, lambda: len(df)) == 3
+
+
+def test_selection_key_ignores_value_order():
+    date_range = (datetime.date(2024, 3, 1), datetime.date(2024, 3, 2))
+    assert selection_key({"Level": ["a", "b"]}, date_range) == selection_key({"Level": ["b", "a"]}, date_range)
+    assert selection_key({"Level": ["a"]}, date_range) != selection_key({"Level": ["a", "b"]}, date_range)
+    assert hash(selection_key({"Level": ["a"]}, date_range)) is not None
+
+
+def test_views_are_computed_once_per_filter_state(monkeypatch):
+    monkeypatch.setattr(log_filters, "VIEW_CACHE_SIZE", 2)
+    df = make_frame()
+    march = (datetime.date(2024, 3, 1), datetime.date(2024, 3, 31))
+    builds = []
+
+    def count_rows(views):
+        builds.append(views.key)
+        return len(views.filtered())
+
+    def render(levels):
+        views = DashboardViews(df, {"Level": levels}, march)
+        return views.view("rows", count_rows), views
+
+    rows, views = render(["info"])
+    assert rows == reference_mask(df, {"Level": ["info"]}, march).sum()
+    # Ίδια φίλτρα (με άλλη σειρά): από το cache, χωρίς να χτιστεί το φιλτραρισμένο frame
+    rows_again, views = render(["info"])
+    assert rows_again == rows and len(builds) == 1 and views._filtered is None
+    render(["warn", "error"])
+    render(["error", "warn"])
+    assert len(builds) == 2
+    # LRU δύο θέσεων: το ["info"] βγαίνει όταν μπει τρίτος συνδυασμός
+    render(["warn"])
+    render(["info"])
+    assert len(builds) == 4
+
+
+def test_filtered_frame_drops_unused_categories():
+    df = make_frame()
+    views = DashboardViews(df, {"Level": ["warn"]}, (datetime.date(2024, 3, 1), datetime.date(2024, 3, 31)))
+    assert list(views.filtered()["Level"].cat.categories) == ["warn"]
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import linux_logs2
+from log_benchmark import generate_lines
+from log_jobs import JobQueue, notify, report_progress, track_lines
+from log_utils import PARSER_DEFAULTS, run_parser
+
+
+def wait(job, timeout=60):
+    deadline = time.time() + timeout
+    while job.active and time.time() < deadline:
+        time.sleep(0.01)
+    return job.status
+
+
+def test_parse_modules_do_not_import_streamlit():
+    # Τα jobs (και το log_cli) τρέχουν το log_utils χωρίς Streamlit
+    code = "import sys, log_utils, log_cli; print('streamlit' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_jobs_run_in_order_and_keep_notices():
+    jobs = JobQueue()
+    order = []
+
+    def work(name):
+        notify("info", f"μήνυμα {name}")
+        order.append(name)
+        return name
+
+    first, second = jobs.submit("a", work, name="a"), jobs.submit("b", work, name="b")
+    assert wait(second) == "done" and first.status == "done"
+    assert order == ["a", "b"] and second.result == "b"
+    assert first.notices == [("info", "μήνυμα a")]
+    assert not jobs.active()
+
+
+def test_failed_job_keeps_the_error():
+    job = JobQueue().submit("fail", lambda: 1 / 0)
+    assert wait(job) == "failed"
+    assert job.error.startswith("ZeroDivisionError")
+
+
+def test_cancel_stops_at_the_next_progress_report():
+    started = threading.Event()
+
+    def work():
+        started.set()
+        for line in track_lines(iter(["x\n"] * 10 ** 7), every=100):
+            time.sleep(0)
+        return "finished"
+
+    jobs = JobQueue()
+    job = jobs.submit("long", work)
+    queued = jobs.submit("queued", lambda: "never")
+    started.wait(10)
+    queued.cancel()
+    job.cancel()
+    assert wait(job) == "cancelled", job.error
+    assert job.result is None
+    assert wait(queued) == "cancelled" and queued.started is None
+
+
+def test_progress_outside_a_job_is_a_no_op():
+    report_progress(10, 100, "Ανάγνωση")
+    lines = ["a"]
+    assert track_lines(lines) is lines
+
+
+def test_parse_job_reports_progress(tmp_path, make_upload):
+    data = "".join(line + "\n" for line in generate_lines("Linux", 12000, n_templates=5)).encode()
+    job = JobQueue().submit(
+        "parse", run_parser, uploaded_file=make_upload("syslog", data), parser_choice="Drain",
+        log_format=linux_logs2.LOG_FORMAT, regex=linux_logs2.LOG_REGEX, use_cache=False, **PARSER_DEFAULTS["Drain"]["Linux"]
+    )
+    assert wait(job) == "done"
+    df_structured, _ = job.result
+    assert len(df_structured) == 12000
+    assert job.stage
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+import linux_logs2
+import log_utils
+from log_benchmark import generate_lines
+from log_library import TemplateLibrary, clear_library, library_key, run_with_library
+from log_utils import PARSER_DEFAULTS, run_parser
+
+PARAMS = PARSER_DEFAULTS["Drain"]["Linux"]
+KEY = library_key("Drain", linux_logs2.LOG_FORMAT, linux_logs2.LOG_REGEX, PARAMS)
+
+
+@pytest.fixture
+def library():
+    clear_library(KEY)
+    yield lambda: TemplateLibrary(KEY, "Drain", linux_logs2.LOG_FORMAT)
+    clear_library(KEY)
+
+
+@pytest.fixture
+def data():
+    return "".join(line + "\n" for line in generate_lines("Linux", 400, n_templates=8, seed=3)).encode()
+
+
+def parse(upload, **kwargs):
+    return run_parser(upload, "Drain", linux_logs2.LOG_FORMAT, linux_logs2.LOG_REGEX, **kwargs, **PARAMS)
+
+
+def test_warm_start_matches_known_templates(library, data, make_upload):
+    cold, cold_templates = parse(make_upload("syslog", data), use_cache=False, use_library=True)
+    assert len(library()) == len(cold_templates)
+
+    warm, warm_templates = parse(make_upload("syslog", data), use_cache=False, use_library=True)
+    assert len(warm) == len(cold)
+    assert warm["EventTemplate"].notna().all()
+    assert set(warm["EventTemplate"]) <= set(library().event_ids)
+    assert warm_templates["Occurrences"].sum() == len(warm)
+
+
+def test_library_match_returns_parameters(library):
+    lib = library()
+    lib.update(pd.DataFrame({"EventId": ["e1"], "EventTemplate": ["session opened for user <*>"], "Occurrences": [1]}), ["EventId", "EventTemplate", "ParameterList"])
+    templates, params = lib.match(["session opened for user root", "something else"])
+    assert templates.tolist() == ["session opened for user <*>", None]
+    assert params[0] == "['root']"
+
+
+def test_cache_key_includes_library_state(library, data, make_upload, monkeypatch):
+    calls = []
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return run_with_library(*args, **kwargs)
+
+    monkeypatch.setattr(log_utils, "run_with_library", counting)
+    cache_kwargs = dict(use_cache=True, use_library=True, workers=1, deduplicate=False)
+    parse(make_upload("syslog", data), **cache_kwargs)
+    # Η βιβλιοθήκη απέκτησε templates: το ίδιο αρχείο ξαναπερνάει από το parse
+    parse(make_upload("syslog", data), **cache_kwargs)
+    assert len(calls) == 2
+    # Καμία αλλαγή στη βιβλιοθήκη: το αποτέλεσμα έρχεται από το cache
+    parse(make_upload("syslog", data), **cache_kwargs)
+    assert len(calls) == 2
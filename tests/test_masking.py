@@ -0,0 +1,59 @@
+import pytest
+from log_masking import MaskingEngine, line_safe_pattern
+from log_utils import REGEX_PATTERNS
+
+
+LINES = [
+    "abc",
+    "123 x",
+    "session 4f1c2a9e-1b2c-4d5e-8f90-123456789abc opened for user root from 10.0.0.7 port 5022",
+    "Jun 14 15:16:01 combo sshd(pam_unix)[19939]: check pass; user unknown",
+    "Loaded C:\\Windows\\system32\\kernel32.dll at @0x7ffd12 v6.1.7601.17514",
+    "mount /var/log/syslog failed after 30 retries on Mon Jul 25",
+    "",
+    "trailing space 42 ",
+    "ip.10.0.0.7.x and 192.168.1.1",
+]
+
+PATTERN_SETS = [
+    [r"^\d+"],
+    [r"\d+$"],
+    [r"(?<![\w.-])\d{1,3}(?:\.\d{1,3}){3}(?![\w.-])"],
+    [r"\s\d+"],
+    [r"[^a-z]+"],
+    [r"x*"],
+] + list(REGEX_PATTERNS.values())
+
+
+def per_line(engine, lines):
+    return [engine.mask_line(line) for line in lines]
+
+
+@pytest.mark.parametrize("patterns", PATTERN_SETS)
+def test_batch_matches_per_line(patterns):
+    assert MaskingEngine(patterns).mask_batch(LINES) == per_line(MaskingEngine(patterns), LINES)
+
+
+def test_anchored_pattern_is_not_skipped_by_combined_check():
+    assert MaskingEngine([r"^\d+"]).mask_batch(["abc", "123 x"]) == ["abc", "<*> x"]
+
+
+@pytest.mark.parametrize("patterns", PATTERN_SETS)
+def test_batch_without_matches_is_unchanged(patterns):
+    lines = ["", "", ""] if patterns != [r"x*"] else []
+    assert MaskingEngine(patterns).mask_batch(lines) == per_line(MaskingEngine(patterns), lines)
+
+
+def test_line_safe_pattern_never_crosses_newlines():
+    assert line_safe_pattern(r"^\d+") is None
+    assert line_safe_pattern(r"a*") is None
+    assert line_safe_pattern(r"a\sb").search("a\nb") is None
+    assert line_safe_pattern(r"[^x]+").findall("ab\ncd") == ["ab", "cd"]
+
+
+def test_report_counts_hits_per_pattern():
+    engine = MaskingEngine([r"\d+", r"root"])
+    engine.mask_all(LINES, batch_size=3)
+    report = engine.report().set_index("Pattern")
+    assert report.loc["root", "Hits"] == 1
+    assert engine.lines == len(LINES)
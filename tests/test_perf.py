@@ -0,0 +1,72 @@
+import json
+import threading
+import pytest
+from log_perf import PERF_COLUMNS, PerfRecorder, recording, stage, timed, trace_json, start_memory_tracing, stop_memory_tracing
+
+
+@pytest.fixture
+def memory_tracing():
+    start_memory_tracing()
+    yield
+    stop_memory_tracing()
+
+
+@timed("Build list", "test")
+def build(n):
+    return list(range(n))
+
+
+def test_nested_stages_and_timed_lines():
+    perf = PerfRecorder("test")
+    with recording(perf):
+        with stage("outer", "total"):
+            build(1000)
+    spans = {span["name"]: span for span in perf.spans}
+    assert spans["Build list"]["lines"] == 1000 and spans["Build list"]["depth"] == 1
+    assert spans["outer"]["depth"] == 0
+    assert list(perf.to_frame().columns) == PERF_COLUMNS
+
+
+def test_stage_without_recorder_is_a_no_op():
+    with stage("nothing") as span:
+        assert span == {}
+
+
+def test_peak_memory_of_a_single_recording(memory_tracing):
+    perf = PerfRecorder("test")
+    with recording(perf), stage("alloc"):
+        data = bytearray(8 * 1024 * 1024)
+        del data
+    assert perf.spans[0]["peak_mb"] >= 7.9
+
+
+def test_peak_memory_is_skipped_while_another_thread_records(memory_tracing):
+    started, release = threading.Event(), threading.Event()
+
+    def other_job():
+        with recording(PerfRecorder("other")):
+            started.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=other_job)
+    thread.start()
+    started.wait(5)
+    perf = PerfRecorder("test")
+    with recording(perf), stage("alloc"):
+        bytearray(1024)
+    release.set()
+    thread.join()
+
+    assert "peak_mb" not in perf.spans[0] and perf.spans[0]["peak_shared"]
+    with recording(perf), stage("alone"):
+        bytearray(1024)
+    assert "peak_mb" in perf.spans[1]
+
+
+def test_trace_json_has_one_process_per_recorder():
+    recorders = [PerfRecorder("a"), PerfRecorder("b")]
+    for recorder in recorders:
+        with recording(recorder), stage("work"):
+            pass
+    events = json.loads(trace_json(recorders))["traceEvents"]
+    assert sorted({event["pid"] for event in events if event["ph"] == "X"}) == [1, 2]
@@ -0,0 +1,20 @@
+import pytest
+from log_benchmark import run_dashboard_case
+from log_downsample import TIME_BIN_LADDER
+
+pytest.importorskip("polars")
+
+
+def test_polars_duration_covers_the_bin_ladder():
+    from log_polars import polars_duration
+    assert polars_duration("5min") == "5m"
+    assert polars_duration("1D") == "1d"
+    for freq in TIME_BIN_LADDER:
+        if freq:
+            polars_duration(freq)
+
+
+@pytest.mark.parametrize("log_type", ["Windows", "Linux", "Mac", "Suricata"])
+def test_polars_backend_matches_pandas(log_type):
+    result = run_dashboard_case(log_type, 1500, 10, seed=7, backends=("pandas", "polars"), repeats=1)
+    assert result["identical"], result["differences"]
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+import linux_logs2
+from log_dashboard import CHART_BUCKETS, DashboardData
+from log_rollups import TimeRollups, ROLLUP_DIMENSIONS, ROLLUP_FREQS, BUCKET_FREQS, pick_bucket
+
+
+@pytest.fixture(scope="module")
+def linux_df():
+    rng = np.random.default_rng(0)
+    n = 20000
+    times = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 2 * 86400, n)), unit="s")
+    return pd.DataFrame({
+        "datetime": times,
+        "Level": pd.Categorical(rng.choice(["combo", "other"], n)),
+        "Component": pd.Categorical(rng.choice(["sshd", "su", "kernel", "ftpd"], n)),
+        "PID": pd.Categorical(rng.integers(1, 3000, n).astype(str)),
+        "EventTemplate": rng.choice(["a <*>", "b <*>"], n)
+    })
+
+
+def direct_counts(df, freq, selections, date_range, by=()):
+    days = df["datetime"].dt.normalize()
+    mask = (days >= pd.Timestamp(date_range[0])) & (days <= pd.Timestamp(date_range[1]))
+    for column, values in selections.items():
+        mask &= df[column].isin(values)
+    return df[mask].groupby([df.loc[mask, "datetime"].dt.floor(freq).rename("bucket")] + list(by), observed=True).size()
+
+
+def test_cubes_are_much_smaller_than_the_log(linux_df):
+    rollups = TimeRollups(linux_df, linux_df["datetime"], ROLLUP_DIMENSIONS["Linux"])
+    with_pid = TimeRollups(linux_df, linux_df["datetime"], ROLLUP_DIMENSIONS["Linux"] + ["PID"])
+    assert "PID" not in rollups.dimensions
+    # Με το PID σχεδόν κάθε γραμμή θα ήταν ξεχωριστό κελί
+    assert len(with_pid.cubes["5min"]) > 0.9 * len(linux_df)
+    assert len(rollups.cubes["5min"]) < len(linux_df) / 3
+    assert len(rollups.cubes["1h"]) < len(linux_df) / 50
+
+
+@pytest.mark.parametrize("freq", BUCKET_FREQS)
+def test_query_matches_groupby_on_the_log(linux_df, freq):
+    rollups = TimeRollups(linux_df, linux_df["datetime"], ROLLUP_DIMENSIONS["Linux"])
+    selections = {"Component": ["sshd", "su"]}
+    date_range = (pd.Timestamp("2024-01-01").date(), pd.Timestamp("2024-01-02").date())
+    result = rollups.query(freq, selections, date_range, by=["Level"]).set_index(["bucket", "Level"])["Count"]
+    expected = direct_counts(linux_df, freq, selections, date_range, ["Level"])
+    pd.testing.assert_series_equal(result, expected, check_names=False, check_index_type=False)
+
+
+def test_source_freq_rejects_freqs_not_built_from_cubes(linux_df):
+    rollups = TimeRollups(linux_df, linux_df["datetime"], ["Level"])
+    assert rollups.source_freq("15min") == "5min"
+    with pytest.raises(ValueError):
+        rollups.source_freq("90s")
+
+
+def test_filters_outside_the_cubes_go_through_the_filter_index(linux_df):
+    pids = linux_df["PID"].iloc[:50].unique().tolist()
+    selections = {"PID": pids, "Level": ["combo"]}
+    date_range = (linux_df["datetime"].min().date(), linux_df["datetime"].max().date())
+    data = DashboardData(linux_df, linux_logs2.DASHBOARD, selections, date_range)
+
+    result = data.rollups().query("1h", selections, date_range, by=["Component"]).set_index(["bucket", "Component"])["Count"]
+    expected = direct_counts(linux_df, "1h", selections, date_range, ["Component"])
+    pd.testing.assert_series_equal(result, expected, check_names=False, check_index_type=False)
+
+
+def test_pick_bucket_fits_the_span():
+    start = pd.Timestamp("2024-01-01")
+    assert pick_bucket(start, start + pd.Timedelta(hours=2)) == "1min"
+    assert pick_bucket(start, start + pd.Timedelta(days=30)) == "30min"
+    assert pick_bucket(pd.NaT, start) == BUCKET_FREQS[0]
+    assert pick_bucket(start, start + pd.Timedelta(days=3650)) == BUCKET_FREQS[-1]
+
+
+def test_pick_bucket_reproduces_the_stacked_bar_ladder():
+    start = pd.Timestamp("2024-01-01")
+    target = CHART_BUCKETS["top_timeline"]
+    assert pick_bucket(start, start + pd.Timedelta(hours=1), target) == "1min"
+    assert pick_bucket(start, start + pd.Timedelta(days=1), target) == "15min"
+    assert pick_bucket(start, start + pd.Timedelta(days=30), target) == "3h"
+    assert pick_bucket(start, start + pd.Timedelta(days=365), target) == "7D"
+
+
+def test_every_bucket_comes_from_a_cube(linux_df):
+    rollups = TimeRollups(linux_df, linux_df["datetime"], ["Level"])
+    for freq in BUCKET_FREQS:
+        assert rollups.source_freq(freq) in ROLLUP_FREQS
+
+
+def test_narrower_dates_give_finer_buckets(linux_df):
+    chart = {"kind": "timeline"}
+    everything = (linux_df["datetime"].min().date(), linux_df["datetime"].max().date())
+    one_day = (everything[0], everything[0])
+    wide = DashboardData(linux_df, linux_logs2.DASHBOARD, {}, everything)
+    narrow = DashboardData(linux_df, linux_logs2.DASHBOARD, {}, one_day)
+    assert (narrow.bucket(chart), wide.bucket(chart)) == ("1min", "5min")
+    assert narrow.bucket({"kind": "timeline", "buckets": 24}) == "1h"
+    assert wide.bucket({"kind": "timeline", "buckets": 24}) == "3h"
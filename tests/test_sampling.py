@@ -0,0 +1,54 @@
+import gzip
+import pytest
+from log_archives import virtual_log
+from log_benchmark import generate_lines
+from log_sampling import line_stratum, stratified_pick, write_sample
+
+
+def test_pick_never_exceeds_quota_with_many_strata():
+    # 300 στρώματα (διαφορετικά μήκη/αρχές) και quota 50: δεν χωράει μία γραμμή ανά στρώμα
+    lines = [f"{chr(65 + i % 26)}{chr(65 + i // 26)} ".encode() + b"x" * (i % 5 * 50) + b"\n" for i in range(300)] * 4
+    assert len({line_stratum(line) for line in lines}) > 50
+    picked = stratified_pick(lines, 50)
+    assert len(picked) <= 50
+
+
+def test_pick_keeps_proportions_and_file_order():
+    lines = [b"short %d\n" % i if i % 4 else (b"a much longer line with many words %d " % i) * 3 + b"\n" for i in range(4000)]
+    picked = stratified_pick(lines, 400)
+    assert 390 <= len(picked) <= 400
+    long_share = sum(len(line) > 80 for line in picked) / len(picked)
+    assert long_share == pytest.approx(0.25, abs=0.01)
+    assert picked == sorted(picked, key=lines.index)
+
+
+def test_pick_returns_everything_under_quota():
+    lines = [b"a\n", b"b\n"]
+    assert stratified_pick(lines, 10) == lines
+
+
+@pytest.fixture
+def syslog_lines():
+    return [line + "\n" for line in generate_lines("Linux", 20000, n_templates=20)]
+
+
+def test_sample_size_and_line_estimate(tmp_path, syslog_lines):
+    log_path = tmp_path / "syslog"
+    log_path.write_text("".join(syslog_lines))
+    info = write_sample(str(log_path), str(tmp_path / "preview" / "syslog"), n_lines=1000, n_windows=8)
+
+    assert info["method"] == "stratified"
+    assert 900 <= info["sample_lines"] <= 1000
+    assert info["estimated_lines"] == pytest.approx(len(syslog_lines), rel=0.05)
+    assert info["scale"] == pytest.approx(info["estimated_lines"] / info["sample_lines"])
+    sample = (tmp_path / "preview" / "syslog").read_text().splitlines(keepends=True)
+    assert len(sample) == info["sample_lines"] and set(sample) <= set(syslog_lines)
+
+
+def test_compressed_logs_are_sampled_from_the_head(tmp_path, syslog_lines):
+    segment = tmp_path / "syslog.1.gz"
+    segment.write_bytes(gzip.compress("".join(syslog_lines).encode()))
+    with virtual_log(str(tmp_path / "syslog"), [str(segment)]) as path:
+        info = write_sample(path, str(tmp_path / "preview" / "syslog"), n_lines=500)
+    assert info["method"] == "head" and info["estimated_lines"] is None and info["scale"] is None
+    assert info["sample_lines"] <= 500
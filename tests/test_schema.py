@@ -0,0 +1,37 @@
+import pandas as pd
+from log_schema import apply_schema, drop_unused_categories, memory_usage
+
+
+def test_apply_schema_types_known_columns():
+    df = pd.DataFrame({
+        "Month": ["Jun", "Jun", "Jul"],
+        "Date": ["9", "10", "1"],
+        "PID": ["1234", "", "77"],
+        "Level": ["combo", "combo", "kernel"],
+        "Content": ["a", "b", "c"],
+        "EventId": ["e1", "e1", "e2"],
+    })
+    typed = apply_schema(df, "Linux")
+    assert typed["Month"].dtype == "category"
+    assert typed["Date"].dtype == "UInt8" and typed["Date"].tolist() == [9, 10, 1]
+    assert typed["EventId"].dtype == "category"
+    assert typed["Content"].dtype == df["Content"].dtype
+    assert df["Date"].tolist() == ["9", "10", "1"]  # Το αρχικό frame δεν αλλάζει
+    # Το κενό PID δεν είναι αριθμός, άρα η στήλη μένει ως κείμενο αντί να χαθεί η τιμή
+    assert typed["PID"].tolist() == ["1234", "", "77"]
+
+
+def test_apply_schema_keeps_columns_that_do_not_fit():
+    df = pd.DataFrame({"Date": ["9", "x"], "Year": ["2024", "99999"]})
+    typed = apply_schema(df, "Suricata")
+    assert typed["Date"].tolist() == ["9", "x"]  # Μη αριθμητική τιμή
+    assert typed["Year"].tolist() == ["2024", "99999"]  # Εκτός εύρους UInt16
+    assert apply_schema(df, "Unknown") is df
+
+
+def test_drop_unused_categories_after_filtering():
+    df = apply_schema(pd.DataFrame({"Level": ["a", "b", "c"], "EventId": ["e1", "e2", "e3"]}), "Windows")
+    filtered = drop_unused_categories(df[df["Level"] == "a"])
+    assert list(filtered["Level"].cat.categories) == ["a"]
+    assert list(filtered["EventId"].value_counts().index) == ["e1"]
+    assert memory_usage(df) > 0
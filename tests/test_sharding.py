@@ -0,0 +1,88 @@
+import random
+import pytest
+import linux_logs2
+import log_sharding
+from log_utils import PARSER_DEFAULTS, run_parser
+from log_perf import PerfRecorder, recording
+
+
+def unique_linux_lines(n_lines, seed=1):
+    """Γραμμές Linux syslog με διαφορετικό Content και μετά το masking (λέξεις χωρίς ψηφία)"""
+    rng = random.Random(seed)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(500)]
+    return "".join(
+        f"Jun 14 15:16:01 combo sshd(pam_unix)[19939]: {' '.join(rng.choice(words) for _ in range(rng.randint(4, 12)))}\n"
+        for _ in range(n_lines)
+    ).encode()
+
+
+@pytest.fixture
+def small_shards(monkeypatch):
+    # Shards από λίγα KB, ώστε λίγες εκατοντάδες γραμμές να μοιράζονται στους workers
+    monkeypatch.setattr(log_sharding, "MIN_SHARD_BYTES", 4096)
+
+
+def parse_recorded(upload, **kwargs):
+    perf = PerfRecorder("test")
+    with recording(perf):
+        df_structured, df_templates = run_parser(
+            upload, "Drain", linux_logs2.LOG_FORMAT, linux_logs2.LOG_REGEX, use_cache=False, **kwargs, **PARSER_DEFAULTS["Drain"]["Linux"]
+        )
+    return df_structured, df_templates, [span["name"] for span in perf.spans]
+
+
+def test_plan_shards_respects_min_shard_bytes(tmp_path, small_shards):
+    path = tmp_path / "syslog"
+    path.write_bytes(unique_linux_lines(300))
+    ranges = log_sharding.plan_shards(str(path), 4)
+    assert len(ranges) == 4
+    assert ranges[0][0] == 0 and ranges[-1][1] == path.stat().st_size
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+
+def test_workers_shard_with_default_deduplication(make_upload, small_shards):
+    data = unique_linux_lines(300)
+    df_structured, df_templates, stages = parse_recorded(make_upload("syslog", data), workers=2)
+
+    assert "Regex masking (dedup)" in stages
+    assert "Parse shards (Drain)" in stages
+    assert len(df_structured) == data.count(b"\n")
+    assert df_structured["EventId"].notna().all()
+    assert set(df_structured["EventId"]) == set(df_templates["EventId"])
+
+
+def test_single_worker_does_not_shard(make_upload, small_shards):
+    _, _, stages = parse_recorded(make_upload("syslog", unique_linux_lines(300)), workers=1)
+    assert "Regex masking (dedup)" in stages
+    assert "Parse shards (Drain)" not in stages
+
+
+def test_cache_params_include_workers_with_deduplication():
+    from log_utils import mining_cache_params
+    assert mining_cache_params("Drain", 2, None, True) == {"deduplicate": True, "workers": 2}
+    assert mining_cache_params("Drain", 1, None, True) == {"deduplicate": True}
+    assert mining_cache_params("LogCluster", 4, None, True) == {}
+
+
+def test_run_sharded_merges_shards_in_order(tmp_path, small_shards):
+    from log_utils import parse_log_file, make_parser_args
+    data = unique_linux_lines(300)
+    (tmp_path / "in").mkdir()
+    (tmp_path / "out").mkdir()
+    log_path = tmp_path / "in" / "syslog"
+    log_path.write_bytes(data)
+    parser_args = make_parser_args(linux_logs2.LOG_FORMAT, linux_logs2.LOG_REGEX, str(tmp_path / "in"), str(tmp_path / "out"), **PARSER_DEFAULTS["Drain"]["Linux"])
+
+    df_structured, df_templates, _, stats = log_sharding.run_sharded(parse_log_file, "Drain", parser_args, str(log_path), 2)
+
+    assert stats["shards"] == 2 and stats["workers"] == 2
+    assert "parallelism" in stats and "speedup" not in stats
+    assert df_structured["LineId"].tolist() == list(range(1, 301))
+    assert df_structured["Content"].tolist() == [line.split(": ", 1)[1] for line in data.decode().splitlines()]
+    assert (df_structured["EventId"] == df_structured["EventTemplate"].map(log_sharding.template_id)).all()
+    assert df_templates["Occurrences"].sum() == 300
+
+
+def test_merge_templates_maps_to_most_general():
+    mapping = log_sharding.merge_templates(["user <*> logged in", "user bob logged in", "disk full"])
+    assert mapping == {"user <*> logged in": "user <*> logged in", "user bob logged in": "user <*> logged in", "disk full": "disk full"}
@@ -0,0 +1,33 @@
+import pytest
+from log_benchmark import generate_lines
+from suricata_logs4 import KEY_FIELDS
+
+
+@pytest.fixture(scope="module")
+def suricata_lines():
+    return generate_lines("Suricata", 400, n_templates=20)
+
+
+def test_keyed_parse_collapses_lines_per_key(mine, suricata_lines):
+    df_structured, df_templates, _, messages = mine("Suricata", "Drain", suricata_lines, key_fields=KEY_FIELDS)
+
+    assert len(df_structured) == len(suricata_lines)
+    assert messages and messages[0].startswith("⚡")
+    # Όλες οι γραμμές ενός κλειδιού με το ίδιο Content παίρνουν το template της πρώτης
+    per_key = df_structured.groupby(KEY_FIELDS + ["Content"])["EventId"].nunique()
+    assert (per_key == 1).all()
+    assert df_templates["Occurrences"].sum() == len(suricata_lines)
+
+
+def test_keyed_parse_is_skipped_for_frequency_sensitive_parsers(mine, suricata_lines):
+    keyed = mine("Suricata", "IPLoM", suricata_lines, key_fields=KEY_FIELDS)
+    plain = mine("Suricata", "IPLoM", suricata_lines)
+
+    assert keyed[3] == []
+    assert keyed[0]["EventTemplate"].tolist() == plain[0]["EventTemplate"].tolist()
+
+
+def test_cache_params_ignore_key_fields_for_frequency_sensitive_parsers():
+    from log_utils import mining_cache_params
+    assert mining_cache_params("Drain", 1, KEY_FIELDS) == {"key_fields": KEY_FIELDS}
+    assert mining_cache_params("IPLoM", 1, KEY_FIELDS) == {}
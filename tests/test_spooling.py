@@ -0,0 +1,46 @@
+import linux_logs2
+from log_benchmark import generate_lines
+from log_utils import DrainParser, SpellParser, enable_streaming_reader, spool_upload
+
+
+class ChunkedUpload:
+    """Upload που καταγράφει τα μεγέθη των read() (το spool δεν πρέπει να διαβάζει όλο το αρχείο μονομιάς)"""
+
+    def __init__(self, make_upload, data):
+        self.upload = make_upload("syslog", data)
+        self.reads = []
+
+    def read(self, size=-1):
+        self.reads.append(size)
+        return self.upload.read(size)
+
+    def seek(self, offset, whence=0):
+        return self.upload.seek(offset, whence)
+
+
+def test_spool_copies_in_chunks_and_rewinds(make_upload, tmp_path):
+    data = b"0123456789\n" * 1000
+    upload = ChunkedUpload(make_upload, data)
+    dest = tmp_path / "syslog"
+    spool_upload(upload, str(dest), buffer_size=512)
+    assert dest.read_bytes() == data
+    assert upload.reads and all(0 < size <= 512 for size in upload.reads)
+    assert upload.upload.tell() == 0
+
+
+def test_streaming_reader_matches_the_logparser_loader(tmp_path):
+    lines = generate_lines("Linux", 300, n_templates=8, seed=5)
+    lines[10] = "not a syslog line"
+    lines[20] = lines[20] + " café"
+    log_path = tmp_path / "syslog"
+    log_path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+    # Το Spell αντικαθιστά τους μη-ASCII χαρακτήρες πριν το split, ο streaming reader πρέπει να κάνει το ίδιο
+    for parser_class, parser_choice in [(DrainParser, "Drain"), (SpellParser, "Spell")]:
+        parser = parser_class(log_format=linux_logs2.LOG_FORMAT, indir=str(tmp_path), outdir=str(tmp_path))
+        headers, regex = parser.generate_logformat_regex(linux_logs2.LOG_FORMAT)
+        expected = parser.log_to_dataframe(str(log_path), regex, headers, linux_logs2.LOG_FORMAT)
+        streamed = enable_streaming_reader(parser, parser_choice, buffer_size=256).log_to_dataframe(
+            str(log_path), regex, headers, linux_logs2.LOG_FORMAT)
+        assert len(streamed) == len(lines) - 1
+        assert streamed.values.tolist() == expected.values.tolist()
@@ -0,0 +1,60 @@
+import pandas as pd
+import linux_logs2
+from log_tail import DrainTailer
+from log_schema import apply_schema
+from log_timestamps import normalize_timestamps
+from log_utils import PARSER_DEFAULTS
+
+
+def prepare(df):
+    return normalize_timestamps(apply_schema(df, "Linux"), "Linux", reference="2024-12-31")
+
+
+def make_tailer(path, prepare=None):
+    return DrainTailer(
+        str(path), linux_logs2.LOG_FORMAT, linux_logs2.LOG_REGEX, prepare=prepare, **PARSER_DEFAULTS["Drain"]["Linux"]
+    )
+
+
+FIRST = [
+    "Jun 14 15:16:01 combo sshd(pam_unix)[19939]: authentication failure for user alice",
+    "Jun 14 15:16:02 combo sshd(pam_unix)[19937]: check pass; user unknown",
+    "Jun 15 02:04:59 combo ftpd[20882]: connection from 222.33.90.199 () at Wed Jun 15 02:04:59 2005",
+]
+SECOND = [
+    # Γενικεύει το template της πρώτης γραμμής (alice -> <*>)
+    "Jun 15 04:06:18 combo sshd(pam_unix)[19940]: authentication failure for user bob",
+    "Jun 16 04:06:19 combo su(pam_unix)[21416]: session opened for user news by (uid=0)",
+    "Jul 1 09:00:00 combo kernel: Linux version 2.6.5-1.358",
+]
+
+
+def test_incremental_prepare_matches_full_normalization(tmp_path):
+    path = tmp_path / "syslog"
+    path.write_text("".join(line + "\n" for line in FIRST))
+    tailer = make_tailer(path, prepare)
+    assert tailer.update() == len(FIRST)
+    assert str(tailer.df_structured["EventTemplate"].dtype) == "category"
+
+    with open(path, "a") as f:
+        f.writelines(line + "\n" for line in SECOND)
+    assert tailer.update() == len(SECOND)
+
+    raw = make_tailer(path)
+    raw.update()
+    expected = prepare(raw.df_structured)
+    pd.testing.assert_frame_equal(tailer.df_structured, expected, check_categorical=False)
+    assert tailer.df_structured.loc[0, "EventTemplate"] == "authentication failure for user <*>"
+    assert str(tailer.df_structured["EventTemplate"].dtype) == "category"
+    assert str(tailer.df_structured["PID"].dtype) == "UInt32"
+
+
+def test_partial_line_waits_for_next_update(tmp_path):
+    path = tmp_path / "syslog"
+    path.write_text(FIRST[0] + "\n" + FIRST[1])
+    tailer = make_tailer(path, prepare)
+    assert tailer.update() == 1
+    with open(path, "a") as f:
+        f.write("\n")
+    assert tailer.update() == 1
+    assert tailer.df_structured["LineId"].tolist() == [1, 2]
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from log_benchmark import generate_lines
+from log_schema import apply_schema
+from log_timestamps import _microseconds, dates_from_parts, infer_syslog_years, normalize_timestamps
+
+
+def test_microseconds_from_strings_and_integers():
+    assert _microseconds(pd.Series(["008629", "8041", " 804108", ""])).tolist() == [8629, 804100, 804108, 0]
+    # Ίδιες τιμές όταν το Ms διαβάστηκε ως ακέραιος (τα μηδενικά της αρχής χάθηκαν)
+    assert _microseconds(pd.Series([8629, 804108])).tolist() == [8629, 804108]
+    assert _microseconds(pd.Series([8629, np.nan])).tolist() == [8629, 0]
+
+
+def test_csv_and_memory_output_give_the_same_datetimes(mine, tmp_path):
+    lines = generate_lines("Suricata", 300, n_templates=10)
+    df_memory = mine("Suricata", "Drain", lines)[0]
+    path = tmp_path / "fast_structured.csv"
+    df_memory.to_csv(path, index=False)
+    # Όπως ένα CSV του log_cli που διαβάζεται πίσω χωρίς dtypes
+    df_csv = pd.read_csv(path)
+    assert pd.api.types.is_integer_dtype(df_csv["Ms"])
+
+    expected = normalize_timestamps(apply_schema(df_memory, "Suricata"), "Suricata")["datetime"]
+    actual = normalize_timestamps(apply_schema(df_csv, "Suricata"), "Suricata")["datetime"]
+    pd.testing.assert_series_equal(actual, expected)
+    assert expected.notna().all()
+
+
+def test_syslog_years_follow_rollovers():
+    years = infer_syslog_years([11, 12, 12, 1, 2], reference="2024-03-01")
+    assert years.tolist() == [2023, 2023, 2023, 2024, 2024]
+    # Οι τελευταίες γραμμές δεν μπορεί να είναι στο μέλλον
+    assert infer_syslog_years([11, 12], reference="2024-03-01").tolist() == [2023, 2023]
+
+
+def test_invalid_dates_become_nat():
+    dates = dates_from_parts([2024, 2024, np.nan], [2, 2, 1], [29, 30, 1])
+    assert pd.Timestamp(dates[0]) == pd.Timestamp("2024-02-29")
+    assert np.isnat(dates[1]) and np.isnat(dates[2])
+
+
+@pytest.mark.parametrize("log_type", ["Windows", "Linux", "Mac", "Suricata"])
+def test_every_parsed_line_gets_a_timestamp(mine, log_type):
+    df = mine(log_type, "Drain", generate_lines(log_type, 200, n_templates=5))[0]
+    timestamps = normalize_timestamps(apply_schema(df, log_type), log_type)["datetime"]
+    assert timestamps.notna().all()
+    assert timestamps.is_monotonic_increasing